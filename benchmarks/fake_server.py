@@ -0,0 +1,221 @@
+"""
+Local stand-in for LLM servers
+------------------------------
+Implements just enough of the Ollama and OpenAI HTTP APIs for PromptShell
+to talk to it, with a configurable time to first token and token rate:
+
+    POST /api/generate, /api/chat            (Ollama, streaming or not)
+    GET  /api/tags                           (Ollama model list)
+    POST /chat/completions, /v1/chat/completions  (OpenAI, SSE streaming or not)
+
+    with FakeLLMServer(latency=0.2, tokens_per_second=50) as server:
+        config["OLLAMA_HOST"] = server.url
+        config["OPENAI_BASE_URL"] = server.url + "/v1"
+
+To exercise retries, server.failures lists HTTP statuses returned (in order)
+to the next completion requests instead of a response.
+"""
+
+import json
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSE = "echo promptshell-benchmark"
+
+def split_tokens(text: str) -> list:
+    """Splits a response into token-sized pieces (words with their leading spaces)."""
+
+    return re.findall(r"\s*\S+|\s+", text) or [""]
+
+def count_tokens(text: str) -> int:
+    """Rough token count used for the usage fields (~4 characters per token)."""
+
+    return max(len(text) // 4, 1)
+
+class FakeLLMServer:
+    def __init__(self, response=DEFAULT_RESPONSE, latency: float = 0.0, tokens_per_second: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """HTTP server answering every completion request with a fixed response.
+
+        Args:
+            response: Response text, or a callable mapping the prompt to a response
+            latency: Seconds before the first token is sent
+            tokens_per_second: Generation speed after the first token (0 = instant)
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+
+        self.response = response
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.requests = []
+        self.failures = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def response_for(self, prompt: str) -> str:
+        return self.response(prompt) if callable(self.response) else self.response
+
+    def generate(self, prompt: str):
+        """Yields the response token by token, paced like a real model.
+
+        Args:
+            prompt: Prompt text received by the server
+
+        Yields:
+            Response tokens
+        """
+
+        if self.latency:
+            time.sleep(self.latency)
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        for i, token in enumerate(split_tokens(self.response_for(prompt))):
+            if delay and i:
+                time.sleep(delay)
+            yield token
+
+    def _record(self, path: str, body: dict):
+        """Logs a request and returns the error status to answer it with, if one is queued."""
+
+        with self._lock:
+            self.requests.append((path, body))
+            return self.failures.pop(0) if self.failures else None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let Nagle delay them
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _start_chunked(self, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def _end_chunked(self):
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": "fake-model"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": "invalid JSON"})
+                    return
+                failure = server._record(self.path, body)
+                try:
+                    if failure:
+                        self._send_json(failure, {"error": {"message": f"injected failure {failure}"}})
+                    elif self.path == "/api/generate":
+                        self._ollama_generate(body, body.get("prompt", ""), chat=False)
+                    elif self.path == "/api/chat":
+                        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+                        self._ollama_generate(body, prompt, chat=True)
+                    elif self.path in ("/chat/completions", "/v1/chat/completions"):
+                        self._openai_chat(body)
+                    else:
+                        self._send_json(404, {"error": "not found"})
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # Client gave up (e.g. a cancelled hedged request)
+
+            def _ollama_generate(self, body: dict, prompt: str, chat: bool):
+                def content(text):
+                    return {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+
+                model = body.get("model", "fake-model")
+                created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                # Like Ollama, an empty prompt only loads the model
+                tokens = server.generate(prompt) if prompt else iter(())
+                final = {"model": model, "created_at": created_at, "done": True,
+                         "prompt_eval_count": count_tokens(prompt)}
+                if body.get("stream", True):
+                    self._start_chunked("application/x-ndjson")
+                    count = 0
+                    for token in tokens:
+                        count += 1
+                        line = {"model": model, "created_at": created_at, **content(token), "done": False}
+                        self._chunk(json.dumps(line).encode() + b"\n")
+                    self._chunk(json.dumps({**final, **content(""), "eval_count": count}).encode() + b"\n")
+                    self._end_chunked()
+                else:
+                    text = "".join(tokens)
+                    self._send_json(200, {**final, **content(text), "eval_count": count_tokens(text)})
+
+            def _openai_chat(self, body: dict):
+                prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+                model = body.get("model", "fake-model")
+                base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": model}
+                tokens = server.generate(prompt)
+                if body.get("stream"):
+                    self._start_chunked("text/event-stream")
+                    for token in tokens:
+                        chunk = {**base, "object": "chat.completion.chunk",
+                                 "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                        self._chunk(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+                    done = {**base, "object": "chat.completion.chunk",
+                            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                    self._chunk(b"data: " + json.dumps(done).encode() + b"\n\n")
+                    self._chunk(b"data: [DONE]\n\n")
+                    self._end_chunked()
+                else:
+                    text = "".join(tokens)
+                    usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(text)}
+                    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                    self._send_json(200, {
+                        **base,
+                        "object": "chat.completion",
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                        "usage": usage,
+                    })
+
+        return Handler
@@ -0,0 +1,351 @@
+"""
+PromptShell benchmark suite
+---------------------------
+Runs PromptShell against a local fake LLM server (see fake_server.py) and
+measures:
+
+    startup          cold `python -m promptshell --version` and `import promptshell.main`
+    node_call        Node.__call__ round trip vs. a raw HTTP request (overhead)
+    execute_command  end-to-end natural language -> command -> execution,
+                     with the confirmation prompt stubbed out
+    completion       Tab completion latency for command and path prefixes
+    memory           Python heap used by an assistant session
+
+Usage:
+    python -m benchmarks.run [--provider ollama|openai] [--latency 0.05]
+                             [--token-rate 100] [--iterations 20]
+                             [--compare BASELINE.json]
+
+Every run is saved to benchmarks/results/<timestamp>-<commit>.json and, unless
+--no-compare is given, compared with the previous result (or --compare).
+Everything runs with a throw-away home directory, so the real configuration
+and caches are never touched.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from types import SimpleNamespace
+from unittest import mock
+
+from .fake_server import FakeLLMServer
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative change beyond which a timing is flagged when comparing runs
+REGRESSION_THRESHOLD = 0.10
+
+def summarize(samples: list) -> dict:
+    """Reduces timing samples (seconds) to milliseconds statistics.
+
+    Args:
+        samples: Durations in seconds
+
+    Returns:
+        Dictionary with median, p95, min and run count
+    """
+
+    ordered = sorted(samples)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "runs": len(ordered),
+    }
+
+def timed(func, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def isolate_home(workdir: str):
+    """Points the configuration directory at a temporary home.
+
+    Must run before promptshell is imported, because CONFIG_DIR is resolved
+    at import time.
+    """
+
+    os.environ["HOME"] = workdir
+    os.environ["USERPROFILE"] = workdir
+    os.environ["APPDATA"] = workdir
+
+def write_config(provider: str, server_url: str):
+    """Writes a configuration pointing the chosen provider at the fake server."""
+
+    from promptshell.setup import CONFIG_FILE
+
+    if provider == "ollama":
+        lines = ["MODE=local", f"OLLAMA_HOST={server_url}", "LOCAL_MODEL=fake-model"]
+    else:
+        lines = [
+            "MODE=api", "ACTIVE_API_PROVIDER=openai", "API_MODEL=fake-model",
+            "OPENAI_API_KEY=benchmark", f"OPENAI_BASE_URL={server_url}/v1",
+        ]
+    # Every request should reach the server, so nothing is served from the cache, the local templates
+    # or past requests, benchmark runs stay out of the command history,
+    # and no background warm-up requests run alongside the timed ones
+    lines += ["TRANSLATION_CACHE=off", "LOCAL_INTENTS=off", "HISTORY=off", "WARM_UP=off"]
+    with open(CONFIG_FILE, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+def bench_startup(runs: int) -> dict:
+    """Times cold interpreter starts, the way a user launches PromptShell."""
+
+    commands = {
+        "version": [sys.executable, "-m", "promptshell", "--version"],
+        "import_main": [sys.executable, "-c", "import promptshell.main"],
+    }
+    results = {}
+    for name, command in commands.items():
+        def run():
+            subprocess.run(command, cwd=REPO_ROOT, capture_output=True, check=True)
+        run()  # Warm the filesystem cache and build the executable index
+        results[name] = summarize(timed(run, runs))
+    return results
+
+def bench_node_call(server: FakeLLMServer, config: dict, provider: str, iterations: int) -> dict:
+    """Compares Node.__call__ with a bare HTTP request to the same server.
+
+    The server answers instantly here, so the difference is PromptShell's own
+    per-call cost (prompt building, context bookkeeping, SDK, spinner).
+    """
+
+    import requests
+    from promptshell.node import Node
+
+    node = Node("fake-model", "Benchmark", config=config)
+    node.definition = "You are a benchmark."
+    if provider == "ollama":
+        url, payload = f"{server.url}/api/chat", {"model": "fake-model", "messages": [{"role": "user", "content": "ping"}], "stream": False}
+    else:
+        url, payload = f"{server.url}/v1/chat/completions", {"model": "fake-model", "messages": [{"role": "user", "content": "ping"}]}
+
+    session = requests.Session()
+    raw = lambda: session.post(url, json=payload).raise_for_status()
+    call = lambda: node("list files")
+    latency, rate = server.latency, server.tokens_per_second
+    server.latency, server.tokens_per_second = 0.0, 0.0
+    try:
+        raw()
+        call()
+        raw_stats = summarize(timed(raw, iterations))
+        call_stats = summarize(timed(call, iterations))
+    finally:
+        server.latency, server.tokens_per_second = latency, rate
+    return {
+        "raw_request": raw_stats,
+        "node_call": call_stats,
+        "overhead_ms": round(call_stats["median_ms"] - raw_stats["median_ms"], 3),
+    }
+
+def confirm_everything():
+    """Patches the confirmation prompts so commands run without user input."""
+
+    return mock.patch(
+        "promptshell.ai_terminal_assistant.questionary.confirm",
+        return_value=SimpleNamespace(ask=lambda: True),
+    )
+
+def make_assistant(config: dict):
+    from promptshell.ai_terminal_assistant import AITerminalAssistant
+    return AITerminalAssistant("fake-model", config=config)
+
+def bench_execute_command(config: dict, iterations: int) -> dict:
+    """Times natural language -> translated command -> executed command."""
+
+    assistant = make_assistant(config)
+    with confirm_everything(), contextlib.redirect_stdout(io.StringIO()):
+        assistant.execute_command("print a greeting")
+        return summarize(timed(lambda: assistant.execute_command("print a greeting"), iterations))
+
+def bench_completion(config: dict, iterations: int) -> dict:
+    """Times one full Tab completion cycle for typical prefixes."""
+
+    from promptshell.readline_setup import Completer
+
+    assistant = make_assistant(config)
+    completer = Completer(None, [
+        lambda: assistant.alias_manager.aliases,
+        lambda: assistant.executable_index.commands(),
+    ])
+
+    def complete_all(text):
+        state = 0
+        while completer.complete(text, state) is not None:
+            state += 1
+
+    prefixes = {
+        "command_g": "g",
+        "command_py": "py",
+        "relative_path": "./",
+        "absolute_path": os.path.join(REPO_ROOT, "promptshell", ""),
+    }
+    results = {}
+    for name, prefix in prefixes.items():
+        complete_all(prefix)
+        results[name] = summarize(timed(lambda: complete_all(prefix), iterations * 10))
+    return results
+
+def bench_memory(config: dict, iterations: int) -> dict:
+    """Measures the Python heap used by an assistant session."""
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        assistant = make_assistant(config)
+        after_init = tracemalloc.get_traced_memory()[0]
+        with confirm_everything(), contextlib.redirect_stdout(io.StringIO()):
+            assistant.execute_command("print a greeting")
+            after_first = tracemalloc.get_traced_memory()[0]
+            for _ in range(iterations):
+                assistant.execute_command("print a greeting")
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    results = {
+        "assistant_kb": round((after_init - baseline) / 1024, 1),
+        "session_kb": round((current - baseline) / 1024, 1),
+        "peak_kb": round((peak - baseline) / 1024, 1),
+        "growth_per_request_kb": round((current - after_first) / 1024 / max(iterations, 1), 2),
+    }
+    try:
+        import resource
+        scale = 1024 if sys.platform == "darwin" else 1  # ru_maxrss is in bytes on macOS
+        results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    except ImportError:
+        pass
+    return results
+
+def git_revision() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def save_results(results: dict, output_dir: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(output_dir, f"{stamp}-{results['meta']['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """Flattens nested results into dotted metric names, skipping metadata."""
+
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if key == "meta":
+            continue
+        if isinstance(value, dict):
+            metrics.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not name.endswith(".runs"):
+            metrics[name] = value
+    return metrics
+
+def compare(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """Compares two result sets.
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative increase reported as a regression
+
+    Returns:
+        List of (metric, baseline, current, relative change, regressed) tuples
+    """
+
+    old, new = flatten(baseline), flatten(current)
+    rows = []
+    for name in sorted(new):
+        if name not in old:
+            continue
+        change = (new[name] - old[name]) / old[name] if old[name] else 0.0
+        rows.append((name, old[name], new[name], change, change > threshold))
+    return rows
+
+def previous_result(output_dir: str, exclude: str):
+    paths = sorted(p for p in glob.glob(os.path.join(output_dir, "*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+def print_comparison(rows: list, baseline_path: str):
+    print(f"\nCompared with {os.path.basename(baseline_path)}:")
+    print(f"{'metric':<45} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, old, new, change, regressed in rows:
+        flag = "  <-- slower/larger" if regressed else ""
+        print(f"{name:<45} {old:>12} {new:>12} {change:>+8.1%}{flag}")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark PromptShell against a fake LLM server.")
+    parser.add_argument("--provider", choices=["ollama", "openai"], default="ollama")
+    parser.add_argument("--latency", type=float, default=0.05, help="server time to first token, in seconds")
+    parser.add_argument("--token-rate", type=float, default=100.0, help="server tokens per second (0 = instant)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--output", default=RESULTS_DIR, help="directory for result files")
+    parser.add_argument("--compare", metavar="BASELINE", help="result file to compare with (default: previous run)")
+    parser.add_argument("--no-compare", action="store_true")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="promptshell-bench-")
+    isolate_home(workdir)
+
+    from promptshell.setup import load_config
+
+    with FakeLLMServer(latency=args.latency, tokens_per_second=args.token_rate) as server:
+        write_config(args.provider, server.url)
+        config = load_config()
+        results = {
+            "meta": {
+                "commit": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "provider": args.provider,
+                "latency_s": args.latency,
+                "token_rate": args.token_rate,
+                "iterations": args.iterations,
+            },
+            "startup": bench_startup(args.startup_runs),
+            "node_call": bench_node_call(server, config, args.provider, args.iterations),
+            "execute_command": bench_execute_command(config, args.iterations),
+            "completion": bench_completion(config, args.iterations),
+            "memory": bench_memory(config, args.iterations),
+        }
+
+    path = save_results(results, args.output)
+    print(json.dumps(results, indent=2))
+    print(f"\nSaved to {path}")
+
+    baseline_path = args.compare or (None if args.no_compare else previous_result(args.output, path))
+    if baseline_path:
+        with open(baseline_path) as f:
+            rows = compare(json.load(f), results)
+        print_comparison(rows, baseline_path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
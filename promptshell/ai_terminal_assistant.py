@@ -1,58 +1,155 @@
+import asyncio
 import os
 import subprocess
 import shlex
 import getpass
 import sys
 import platform
+import threading
+import time
 import questionary
 
 from typing import Tuple
 
 from .node import Node
+from .providers import get_backend
 from .data_gatherer import DataGatherer
 from .format_utils import text_theme, reset_format, get_current_os, get_os_specific_examples
-from .system_info import get_system_info
+from .system_info import get_cached_system_info
+from .executable_index import get_executable_index
+from .output_stream import run_with_live_output
+from .file_context import gather_file_contexts
 from .alias_manager import AliasManager
+from .spinner_progress_utils import render_stream, read_first_line
+from .tracing import span
+from .resilience import ProviderError
+from .translation_cache import TranslationCache
+from .intent_matcher import IntentMatcher
+from .history_store import HistoryStore, format_history_entry
+from .similarity_index import SimilarityIndex
+from .setup import config_flag, config_number, get_provider
 
 class AITerminalAssistant:
-    def __init__(self, model_name: str, max_tokens: int = 8000, config: dict = None):
+    def __init__(self, model_name: str, max_tokens: int = 8000, config: dict = None, stream_output: bool = False):
         """Initializes the AI Terminal Assistant.
         
         Args:
             model_name: Name of the AI model to use
             max_tokens: Maximum tokens for AI responses (default: 8000)
             config: Configuration dictionary (default: None)
+            stream_output: Render AI responses token by token (default: False)
         """
 
         self.username = getpass.getuser()
         self.home_folder = os.path.expanduser("~")
         self.current_directory = os.getcwd()
         self.config = config or {}
+        self.stream_output = stream_output
         self.alias_manager = AliasManager()
-        self.command_executor = Node(model_name, "Command Executor", max_tokens=max_tokens, config=self.config)
-        self.error_handler = Node(model_name, "Error Handler", max_tokens=max_tokens, config=self.config)
-        self.debugger = Node(model_name, "Debugger Expert", max_tokens=max_tokens, config=self.config)
-        self.question_answerer = Node(model_name, "Question Answerer", max_tokens=max_tokens, config=self.config)
+        self.command_executor = Node(model_name, "Command Executor", max_tokens=max_tokens, config=self.config, context_tokens=1500)
+        self.error_handler = Node(model_name, "Error Handler", max_tokens=max_tokens, config=self.config, context_tokens=1000)
+        self.debugger = Node(model_name, "Debugger Expert", max_tokens=max_tokens, config=self.config, context_tokens=2000)
+        self.question_answerer = Node(model_name, "Question Answerer", max_tokens=max_tokens, config=self.config, context_tokens=3000)
         self.data_gatherer = DataGatherer()
         self.command_history = []
+        self.executable_index = get_executable_index()
+        self.translation_cache = self.history = self.similarity_index = self.intent_matcher = None
+        self.initialize_stores()
 
         self.initialize_system_context()
+        self.warm_up_thread = self.start_warm_up()
+
+    def initialize_stores(self):
+        """Opens the translation cache and history and sets up local lookups as configured.
+
+        Stores left open by a previous configuration are closed first.
+        """
+
+        self.close()
+        if config_flag(self.config, "TRANSLATION_CACHE", default=True):
+            self.translation_cache = TranslationCache(
+                max_entries=config_number(self.config, "TRANSLATION_CACHE_SIZE", 1000),
+                ttl_seconds=config_number(self.config, "TRANSLATION_CACHE_TTL_DAYS", 30.0) * 86400
+            )
+        if config_flag(self.config, "HISTORY", default=True):
+            self.history = HistoryStore(max_entries=int(config_number(self.config, "HISTORY_SIZE", 200000)))
+        if self.history is not None and config_flag(self.config, "SIMILAR_MATCHES", default=True):
+            self.similarity_index = SimilarityIndex(self.history.successful_translations)
+        if not config_flag(self.config, "LOCAL_INTENTS", default=True):
+            self.intent_matcher = None
+        elif self.intent_matcher is None:
+            self.intent_matcher = IntentMatcher(get_current_os())
+
+    def reload_config(self, config: dict, model_name: str):
+        """Applies a changed configuration to the running assistant.
+
+        The AI roles keep their definitions and conversation context, and the
+        aliases stay loaded; the stores are reopened with the new settings.
+        The provider is warmed up again if the model or provider changed.
+
+        Args:
+            config: New configuration dictionary
+            model_name: Active model name for the new configuration
+        """
+
+        previous = (self.command_executor.model_name, self.command_executor.provider)
+        self.config = config or {}
+        for node in (self.command_executor, self.error_handler, self.debugger, self.question_answerer):
+            node.model_name = model_name
+            node.config = self.config
+            node.provider = get_provider()
+        self.initialize_stores()
+        if (model_name, self.command_executor.provider) != previous:
+            self.warm_up_thread = self.start_warm_up()
+
+    def close(self):
+        """Closes the translation cache and history databases."""
+
+        if self.translation_cache is not None:
+            self.translation_cache.close()
+        if self.history is not None:
+            self.history.close()
+        self.translation_cache = self.history = self.similarity_index = None
+
+    def start_warm_up(self):
+        """Warms up the provider in the background while the user types.
+        
+        For Ollama this loads the model and primes the prompt cache with the
+        role definitions, so the first request does not wait for either.
+        
+        Returns:
+            Warm-up thread, or None if disabled
+        """
+
+        if not config_flag(self.config, "WARM_UP", default=True):
+            return None
+        nodes = [self.command_executor, self.error_handler, self.debugger, self.question_answerer]
+
+        def warm_up():
+            # The backend is imported here so startup does not wait for it
+            backend = get_backend(self.command_executor.provider)
+            hook = getattr(backend, "warm_up", None)
+            if hook is not None:
+                hook(nodes)
+
+        thread = threading.Thread(target=warm_up, name="promptshell-warm-up", daemon=True)
+        thread.start()
+        return thread
 
     def initialize_system_context(self):
-        """Sets up the initial context and definitions for AI roles."""
+        """Sets up the initial context and definitions for AI roles.
+        
+        Definitions are sent as the leading system message of every call, where
+        providers cache them, so they hold only what stays the same for the
+        whole session. Per-call details (current directory, recent commands,
+        OS examples, installed tools relevant to the request) are part of each
+        request's prompt instead.
+        """
 
         path_dirs = os.environ.get('PATH', '').split(os.pathsep)
-        installed_commands = []
-        for dir in path_dirs:
-            if os.path.isdir(dir):
-                try:
-                    installed_commands.extend([f for f in os.listdir(dir) if os.access(os.path.join(dir, f), os.X_OK)])
-                except PermissionError:
-                    continue
-        installed_commands = list(set(installed_commands))
         
         try:
-            system_info = get_system_info()
+            system_info = get_cached_system_info()
         except Exception:
             system_info = "Unable to retrieve system information"
 
@@ -67,8 +164,6 @@ class AITerminalAssistant:
         CPU: {system_info.get('cpu', 'Unknown')}
         Architecture: {system_info.get('machine', 'Unknown')}
         Platform: {system_info.get('platform', 'Unknown')}
-        Path: {self.current_directory}
-        Installations: {', '.join(installed_commands[:75])}
         
         [GUIDELINES]
         1. Output ONLY valid shell commands - no explanations
@@ -83,6 +178,7 @@ class AITerminalAssistant:
         Unix: Use 'ls', 'which', 'ps'
         5. Handle spaces in paths with proper quoting
         6. For multi-step operations, use && or ;
+        7. When the request lists relevant installed tools, prefer them (e.g. rg over grep, fd over find)
         
         [SAFETY PROTOCOLS]
         - Never suggest commands that could damage system
@@ -155,8 +251,7 @@ class AITerminalAssistant:
         5. Add safety considerations
         
         [CONTEXT AWARENESS]
-        - Current directory: {self.current_directory}
-        - Recent commands: {self.command_history[-3:]}
+        - Use the current directory and recent commands given with each question
         - System resources: {system_info.get('memory', 'Unknown')}
         
         [EXAMPLE]
@@ -173,7 +268,7 @@ class AITerminalAssistant:
             command: Shell command to execute
             
         Returns:
-            Tuple containing stdout, stderr, and exit code
+            Tuple containing the tails of stdout and stderr, and exit code
         """
 
         interactive_commands = [
@@ -186,23 +281,18 @@ class AITerminalAssistant:
         if is_interactive:
             return self.execute_interactive_command(command)
 
-        try:
-            if platform.system().lower() == "windows":
-                result = subprocess.run(command, shell=True, text=True, capture_output=True)
-                print(result.stdout)
-                if result.stderr:
-                    print(text_theme('error') + "Error: " + result.stderr + reset_format())
-                return result.stdout, result.stderr, result.returncode
-            else:
-                args = shlex.split(command)
-                result = subprocess.run(args, text=True, capture_output=True)
-                print(result.stdout)
-                if result.stderr:
-                    print(text_theme('error') + "Error: " + result.stderr + reset_format())
-                return result.stdout, result.stderr, result.returncode
-        except Exception as e:
-            print(text_theme('error') + f"Execution error: {e}" + reset_format())
-            return "", str(e), 1
+        with span("execute") as execute_span:
+            try:
+                # Output is forwarded as it is produced; only the tail of each stream is kept
+                if platform.system().lower() == "windows":
+                    result = run_with_live_output(command, shell=True)
+                else:
+                    result = run_with_live_output(shlex.split(command))
+            except Exception as e:
+                print(text_theme('error') + f"Execution error: {e}" + reset_format())
+                result = "", str(e), 1
+            execute_span.set(exit_code=result[2])
+            return result
 
     def execute_interactive_command(self, command: str) -> Tuple[str, str, int]:
         """Handles execution of interactive commands.
@@ -241,6 +331,7 @@ class AITerminalAssistant:
             Execution result or error message
         """
         
+        command = ""
         try:
             self.current_directory = os.getcwd()
             if user_input.strip() == "":
@@ -259,55 +350,276 @@ class AITerminalAssistant:
                 if expanded != user_input[1:]:
                     print(f"Expanded to: {expanded}")
                 return self.run_direct_command(expanded)
-            additional_data = self.gather_additional_data(user_input)
-            command = self.command_executor(f"""
-            User Input: {user_input}
-            Current OS: {get_current_os()}
-            Current OS specific examples: {get_os_specific_examples()}
-            Current Directory: {self.current_directory}
-            Translate the user input into a SINGLE shell command according to the operating system.
-            Return ONLY the command, nothing else.
-            If the input is already a valid shell command, return it as is.
-            Do not provide any explanations or comments.
-            Use the actual filenames and content provided in the additional data.
-            """, additional_data=additional_data).strip()
+            cache_key = cached_command = similar = None
+            local_command = self.local_command(user_input)
+            if local_command is None:
+                with span("gather_context"):
+                    additional_data = self.gather_additional_data(user_input)
+                with span("cache_lookup") as cache_span:
+                    cache_key = self.translation_cache_key(user_input, additional_data)
+                    cached_command = self.translation_cache.get(cache_key) if cache_key else None
+                    cache_span.set(hit=cached_command is not None)
+                if cached_command is None and not additional_data:
+                    similar = self.similar_translation(user_input)
 
-            choice = questionary.confirm(f"Do you want to run the command '{command}'?").ask()
+            choice = None
+            if similar is not None:
+                command = similar.command
+                with span("confirm"):
+                    choice = questionary.confirm(f"Do you want to run the command '{command}'?{self.similar_note(similar)}").ask()
+                if not choice:
+                    choice = similar = None  # Rejected: ask the model instead
+            if choice is None:
+                command = local_command or cached_command or self.translate_command(user_input, additional_data)
+                note = " (local)" if local_command else " (cached)" if cached_command else ""
+                with span("confirm"):
+                    choice = questionary.confirm(f"Do you want to run the command '{command}'?{note}").ask()
             if choice:
+                # Near-matches were written for another request, so only model translations are cached
+                if cache_key and not cached_command and similar is None and self.is_cacheable(command):
+                    self.translation_cache.put(cache_key, command)
+                translated = command
                 if command.startswith("CONFIRM:"):
-                    confirmation = questionary.confirm(f"Warning: This command may be destructive. Are you sure you want to run '{command[9:]}'?").ask()
-                    if not confirmation:
-                        return text_theme('info') + "Command execution aborted." + reset_format()
-                    
-                    # Add second-layer verification for dangerous commands
-                    if not self.verify_dangerous_command(command[9:]):
-                        return text_theme('dangerous_confirm') + "Command verification failed. Execution aborted." + reset_format()
+                    with span("confirm_dangerous"):
+                        confirmation = questionary.confirm(f"Warning: This command may be destructive. Are you sure you want to run '{command[9:]}'?").ask()
+                        if not confirmation:
+                            return text_theme('info') + "Command execution aborted." + reset_format()
+                        
+                        # Add second-layer verification for dangerous commands
+                        if not self.verify_dangerous_command(command[9:]):
+                            return text_theme('dangerous_confirm') + "Command verification failed. Execution aborted." + reset_format()
                     
                     command = command[9:]
                 formatted_command = text_theme('info') + f"Command: {command}" + reset_format()
                 print(formatted_command)
-                self.command_history.append(command)
-                if len(self.command_history) > 10:
-                    self.command_history.pop(0)
+                self.remember_command(command)
+                start = time.perf_counter()
                 if command.startswith("cd "):
-                    path = command.split(" ", 1)[1]
-                    os.chdir(os.path.expanduser(path))
-                    result = f"Changed directory to {os.getcwd()}"
+                    result = self.change_directory(command)
                     exit_code = 0
+                    self.record_history(user_input, translated, exit_code, start)
                 else:
                     _, stderr, exit_code = self.execute_command_with_live_output(command)
+                    self.record_history(user_input, translated, exit_code, start)
                     result = ""
                     if exit_code != 0:
-                        debug_suggestion = self.debug_error(command, stderr, exit_code)
-                        result += text_theme('tip') + f"\n\nDebugging Suggestion:\n{debug_suggestion}" + reset_format()
+                        if cache_key:
+                            self.translation_cache.invalidate(cache_key)
+                        result += self.suggest_fix(command, stderr, exit_code)
                 return result.strip()
             else:
                 print(text_theme('info') + "Command cancelled!" + reset_format())
                 return ""
+        except ProviderError as e:
+            # The AI could not be reached: report it, there is nothing to run or correct
+            return self.format_provider_error(e)
         except Exception as e:
             print(text_theme('error') + "Error in execute command" + reset_format())
             return self.handle_error(str(e), user_input, command)
 
+    def translation_cache_key(self, user_input: str, additional_data: dict = None):
+        """Gets the translation cache key for a request.
+        
+        Args:
+            user_input: User's natural language request
+            additional_data: Supplementary context gathered for the request
+            
+        Returns:
+            Cache key, or None if the request must not be served from cache
+        """
+
+        # Clipboard and file contents change between runs, so such requests are never cached
+        if self.translation_cache is None or additional_data:
+            return None
+        return TranslationCache.make_key(
+            user_input,
+            get_current_os(),
+            self.command_executor.model_name,
+            self.command_executor.provider,
+            self.current_directory
+        )
+
+    @staticmethod
+    def is_cacheable(command: str) -> bool:
+        """Checks that a translation is a real command rather than an error message.
+        
+        Args:
+            command: Translated command
+            
+        Returns:
+            True if the command may be cached
+        """
+
+        return bool(command) and not command.startswith(("Error", "SafetyError"))
+
+    def similar_translation(self, user_input: str):
+        """Finds a past request that succeeded and closely resembles this one.
+        
+        Args:
+            user_input: User's natural language request
+            
+        Returns:
+            SimilarMatch (input, command, score), or None if nothing is similar enough
+        """
+
+        if self.similarity_index is None:
+            return None
+        with span("similar_lookup") as similar_span:
+            threshold = config_number(self.config, "SIMILAR_MATCH_THRESHOLD", 0.8)
+            similar = self.similarity_index.match(user_input, threshold)
+            similar_span.set(hit=similar is not None)
+        return similar
+
+    @staticmethod
+    def similar_note(similar) -> str:
+        """Describes where a near-match command comes from, for the confirmation prompt."""
+
+        return f" (worked for '{similar.input}', {similar.score:.0%} similar; answer no to ask the AI)"
+
+    def local_command(self, user_input: str):
+        """Translates a common request without the AI, if local intents are enabled.
+        
+        Args:
+            user_input: User's natural language request
+            
+        Returns:
+            Shell command, or None if the request needs the Command Executor
+        """
+
+        if self.intent_matcher is None:
+            return None
+        with span("local_intent") as intent_span:
+            command = self.intent_matcher.match(user_input)
+            intent_span.set(hit=command is not None)
+        return command
+
+    @staticmethod
+    def format_provider_error(error: ProviderError) -> str:
+        """Formats a failed AI request for display.
+        
+        Args:
+            error: Provider failure
+            
+        Returns:
+            Formatted error message
+        """
+
+        return text_theme('error') + f"AI request failed: {error}" + reset_format()
+
+    def translate_command(self, user_input: str, additional_data: dict = None) -> str:
+        """Translates natural language into a single shell command.
+        
+        Args:
+            user_input: User's natural language request
+            additional_data: Supplementary context (optional)
+            
+        Returns:
+            Translated command string
+        """
+
+        with span("translate"):
+            prompt = self.translation_prompt(user_input)
+            if self.stream_output:
+                # The command is a single line, so stop streaming as soon as it is complete
+                command, _ = read_first_line(
+                    self.command_executor(prompt, additional_data=additional_data, stream=True),
+                    spinner_type="random", message=" [magenta]Waiting for API response..."
+                )
+                return command
+            return self.command_executor(prompt, additional_data=additional_data).strip()
+
+    def translation_prompt(self, user_input: str) -> str:
+        """Builds the Command Executor prompt for a request.
+        
+        Args:
+            user_input: User's natural language request
+            
+        Returns:
+            Prompt string
+        """
+
+        relevant_tools = ', '.join(self.executable_index.relevant_commands(user_input))
+        past_requests = ""
+        if self.history is not None:
+            entries = self.history.relevant(user_input, limit=3, successful_only=True)
+            if entries:
+                past_requests = "Similar past requests that worked: " + "; ".join(
+                    format_history_entry(entry, details=False) for entry in entries
+                )
+        return f"""
+            User Input: {user_input}
+            Current OS: {get_current_os()}
+            Current OS specific examples: {get_os_specific_examples()}
+            Current Directory: {self.current_directory}
+            Relevant installed tools: {relevant_tools or 'none detected'}
+            {past_requests}
+            Translate the user input into a SINGLE shell command according to the operating system.
+            Return ONLY the command, nothing else.
+            If the input is already a valid shell command, return it as is.
+            Do not provide any explanations or comments.
+            Use the actual filenames and content provided in the additional data.
+            """
+
+    def remember_command(self, command: str):
+        """Adds a command to the short in-memory history.
+        
+        Args:
+            command: Executed command
+        """
+
+        self.command_history.append(command)
+        if len(self.command_history) > 10:
+            self.command_history.pop(0)
+
+    def record_history(self, user_input: str, command: str, exit_code: int, start: float):
+        """Adds an executed command to the persistent history.
+        
+        Args:
+            user_input: What the user typed
+            command: Command as translated, keeping its 'CONFIRM:' prefix if it had one
+            exit_code: Exit status of the command
+            start: time.perf_counter() value taken when the command started
+        """
+
+        if self.history is not None:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.history.add(user_input, command, self.current_directory, exit_code, duration_ms)
+        if self.similarity_index is not None and exit_code == 0 and user_input != command and not user_input.startswith("!"):
+            self.similarity_index.add(user_input, command)
+
+    def history_context(self, query: str, limit: int = 5) -> str:
+        """Formats the past commands most relevant to a request for a prompt.
+        
+        Falls back to the most recent commands when nothing in the history
+        relates to the request.
+        
+        Args:
+            query: Request, question or command the prompt is about
+            limit: Maximum number of commands
+            
+        Returns:
+            One command per line
+        """
+
+        if self.history is None:
+            return ', '.join(self.command_history)
+        entries = self.history.relevant(query, limit) or self.history.recent(limit)
+        return "\n        ".join(format_history_entry(entry, details=False) for entry in entries)
+
+    def change_directory(self, command: str) -> str:
+        """Handles a 'cd' command in-process.
+        
+        Args:
+            command: cd command
+            
+        Returns:
+            Result message
+        """
+
+        path = command.split(" ", 1)[1]
+        os.chdir(os.path.expanduser(path))
+        return f"Changed directory to {os.getcwd()}"
+
     def run_direct_command(self, command: str) -> str:
         """Executes direct shell commands bypassing AI interpretation.
         
@@ -321,13 +633,12 @@ class AITerminalAssistant:
         try:
             formatted_command = text_theme('info') + f"Direct Command: {command}" + reset_format()
             print(formatted_command)
-            self.command_history.append(command)
-            if len(self.command_history) > 10:
-                self.command_history.pop(0)
+            self.remember_command(command)
+            start = time.perf_counter()
             if command.startswith("cd "):
-                path = command.split(" ", 1)[1]
-                os.chdir(os.path.expanduser(path))
-                return f"Changed directory to {os.getcwd()}"
+                result = self.change_directory(command)
+                self.record_history(f"!{command}", command, 0, start)
+                return result
             if command.lower().strip() == 'clear' or command.lower().strip() == 'cls':
                 if get_current_os() == 'windows':
                     os.system('cls')
@@ -336,10 +647,10 @@ class AITerminalAssistant:
                 return ""
             else:
                 _, stderr, exit_code = self.execute_command_with_live_output(command)
+                self.record_history(f"!{command}", command, exit_code, start)
                 result = ""
                 if exit_code != 0:
-                    debug_suggestion = self.debug_error(command, stderr, exit_code)
-                    result += text_theme('tip') + f"\n\nDebugging Suggestion:\n{debug_suggestion}" + reset_format()
+                    result += self.suggest_fix(command, stderr, exit_code)
                 return result.strip()
         except Exception as e:
             return self.handle_error(str(e), command, command)
@@ -354,18 +665,34 @@ class AITerminalAssistant:
             Formatted answer string
         """
 
+        with span("answer"):
+            prompt = self.question_prompt(question)
+            if self.stream_output:
+                return self.stream_response(self.question_answerer, prompt, "Answer:", 'success')
+            answer = self.question_answerer(prompt)
+        return text_theme('success') + "Answer:\n" + answer + reset_format()
+
+    def question_prompt(self, question: str) -> str:
+        """Builds the Question Answerer prompt.
+        
+        Args:
+            question: Question to answer
+            
+        Returns:
+            Prompt string
+        """
+
         context = f"""
-        Command History (last 10 commands):
-        {', '.join(self.command_history)}
+        Related Command History:
+        {self.history_context(question)}
         Current Directory: {self.current_directory}
         """
-        answer = self.question_answerer(f"""
+        return f"""
         Question: {question.strip('?')}
         Context:
         {context}
         Please provide a clear and concise answer to the question, taking into account the given context.
-        """)
-        return text_theme('success') + "Answer:\n" + answer + reset_format()
+        """
 
     def gather_additional_data(self, user_input: str) -> dict:
         """Collects supplementary data based on user input.
@@ -383,14 +710,17 @@ class AITerminalAssistant:
             additional_data["clipboard_content"] = clipboard_content
         file_keywords = ["file", "content", "read", "merge"]
         if any(keyword in user_input.lower() for keyword in file_keywords):
-            words = user_input.split()
-            for word in words:
-                if os.path.isfile(word):
-                    with open(word, 'r') as file:
-                        file_content = file.read()
-                    additional_data["file_content"] = file_content
-                    additional_data["target_file"] = word
-                    break
+            words = [word.strip("'\"`,;:()") for word in user_input.split()]
+            paths = [word for word in words if word and os.path.isfile(word)]
+            # Large files are sampled and binaries skipped, all within one token budget
+            contents = gather_file_contexts(paths, user_input)
+            if len(contents) == 1:
+                additional_data["file_content"] = contents[paths[0]]
+                additional_data["target_file"] = paths[0]
+            elif contents:
+                additional_data["target_files"] = ", ".join(contents)
+                for path, content in contents.items():
+                    additional_data[f"file_content ({path})"] = content
         return additional_data
 
     def debug_error(self, command: str, error_output: str, exit_code: int) -> str:
@@ -405,21 +735,89 @@ class AITerminalAssistant:
             Debugging suggestion string
         """
 
+        return self.debugger(self.debug_prompt(command, error_output, exit_code))
+
+    def debug_prompt(self, command: str, error_output: str, exit_code: int) -> str:
+        """Builds the Debugger Expert prompt for a failed command.
+        
+        Args:
+            command: Failed command
+            error_output: Error message from command execution
+            exit_code: Exit status of failed command
+            
+        Returns:
+            Prompt string
+        """
+
         context = f"""
-        Command History (last 10 commands):
-        {', '.join(self.command_history)}
+        Related Command History:
+        {self.history_context(command)}
         Current Directory: {self.current_directory}
         Last Command: {command}
         Error Output: {error_output}
         Exit Code: {exit_code}
         """
-        debug_input = f"""
+        return f"""
         Analyze the following command and its error output.
         Provide a brief explanation of what went wrong and suggest a solution or alternative approach.
         Keep your response concise and focused on solving the immediate issue.
         {context}
         """
-        return self.debugger(debug_input)
+
+    def suggest_fix(self, command: str, error_output: str, exit_code: int) -> str:
+        """Produces the debugging suggestion shown after a failed command.
+        
+        Args:
+            command: Failed command
+            error_output: Error message from command execution
+            exit_code: Exit status of failed command
+            
+        Returns:
+            Formatted suggestion to append to the result (already printed when streaming)
+        """
+
+        with span("debug"):
+            try:
+                if self.stream_output:
+                    print()
+                    return self.stream_response(self.debugger, self.debug_prompt(command, error_output, exit_code), "Debugging Suggestion:", 'tip')
+                return self.format_debug_suggestion(self.debug_error(command, error_output, exit_code))
+            except ProviderError as e:
+                # The command already ran; only the suggestion is missing
+                return "\n" + self.format_provider_error(e)
+
+    @staticmethod
+    def format_debug_suggestion(debug_suggestion: str) -> str:
+        """Formats a debugging suggestion for display.
+        
+        Args:
+            debug_suggestion: Debugger Expert response
+            
+        Returns:
+            Formatted suggestion string
+        """
+
+        return text_theme('tip') + f"\n\nDebugging Suggestion:\n{debug_suggestion}" + reset_format()
+
+    def stream_response(self, node, prompt: str, title: str, theme_key: str) -> str:
+        """Renders a node response incrementally as it is generated.
+        
+        Args:
+            node: Node to query
+            prompt: Input prompt
+            title: Heading printed above the response
+            theme_key: Theme color for the response
+            
+        Returns:
+            Time-to-first-token note for display
+        """
+
+        print(text_theme(theme_key) + title)
+        _, ttft = render_stream(node(prompt, stream=True), spinner_type="random", message=" [magenta]Waiting for API response...")
+        print(reset_format(), end="")
+        if ttft is None:
+            return ""
+        return text_theme('info') + f"(first token after {ttft:.2f}s)" + reset_format()
 
     def handle_error(self, error: str, user_input: str, command: str) -> str:
         """Handles execution errors and suggests corrections.
@@ -433,18 +831,24 @@ class AITerminalAssistant:
             Error handling result message
         """
         
-        error_analysis = self.error_handler(f"""
+        error_msg = text_theme('error') + f"Error occurred: {error}" + reset_format()
+        try:
+            with span("handle_error"):
+                error_analysis = self.error_handler(f"""
         Error: {error}
         User Input: {user_input}
         Interpreted Command: {command}
         Current Directory: {self.current_directory}
         Provide ONLY a single, simple corrected command. No explanations.
         """)
-        error_msg = text_theme('error') + f"Error occurred: {error}" + reset_format()
+        except ProviderError as e:
+            print(error_msg)
+            return self.format_provider_error(e)
         suggestion_msg = text_theme('tip') + f"Suggested command: {error_analysis}" + reset_format()
         print(error_msg)
         print(suggestion_msg)
-        confirmation = questionary.confirm("Would you like to execute the suggested command?").ask()
+        with span("confirm"):
+            confirmation = questionary.confirm("Would you like to execute the suggested command?").ask()
         if confirmation:
             return self.execute_command(error_analysis)
         return text_theme('info') + "Command execution aborted." + reset_format()
@@ -460,4 +864,132 @@ class AITerminalAssistant:
         """
         print(text_theme('warning', bold=True) + "\nFor safety, please re-type or paste the exact command to proceed:" + reset_format())
         user_input = input("> ").strip()
-        return user_input == command
\ No newline at end of file
+        return user_input == command
+
+    async def atranslate_command(self, user_input: str, additional_data: dict = None, remember: bool = True) -> str:
+        """Async variant of translate_command.
+        
+        Args:
+            user_input: User's natural language request
+            additional_data: Supplementary context (optional)
+            remember: Keep the exchange in the Command Executor context (default: True)
+            
+        Returns:
+            Translated command string
+        """
+
+        command = await self.command_executor.acall(
+            self.translation_prompt(user_input), additional_data=additional_data, remember=remember
+        )
+        return command.strip()
+
+    async def aanswer_question(self, question: str) -> str:
+        """Async variant of answer_question.
+        
+        Args:
+            question: Question to answer
+            
+        Returns:
+            Formatted answer string
+        """
+
+        answer = await self.question_answerer.acall(self.question_prompt(question))
+        return text_theme('success') + "Answer:\n" + answer + reset_format()
+
+    async def adebug_error(self, command: str, error_output: str, exit_code: int) -> str:
+        """Async variant of debug_error.
+        
+        Args:
+            command: Failed command
+            error_output: Error message from command execution
+            exit_code: Exit status of failed command
+            
+        Returns:
+            Debugging suggestion string
+        """
+
+        return await self.debugger.acall(self.debug_prompt(command, error_output, exit_code))
+
+    async def aexecute_command(self, user_input: str) -> str:
+        """Async variant of execute_command.
+        
+        LLM calls go through the providers' async clients and confirmations use
+        questionary's async prompts; the shell command itself runs in a worker
+        thread so the event loop stays responsive.
+        
+        Args:
+            user_input: User's natural language or direct command
+            
+        Returns:
+            Execution result or error message
+        """
+
+        self.current_directory = os.getcwd()
+        stripped = user_input.strip()
+        if stripped.startswith('?') or stripped.endswith('?'):
+            return await self.aanswer_question(user_input)
+        if not stripped or stripped.startswith('!') or stripped.lower() in ('clear', 'cls'):
+            # No translation involved, so the synchronous path is reused off-loop
+            return await asyncio.to_thread(self.execute_command, user_input)
+
+        command = ""
+        try:
+            cache_key = cached_command = similar = None
+            command = self.local_command(user_input)
+            choice = None
+            if command is None:
+                additional_data = await asyncio.to_thread(self.gather_additional_data, user_input)
+                cache_key = self.translation_cache_key(user_input, additional_data)
+                cached_command = self.translation_cache.get(cache_key) if cache_key else None
+                if cached_command is None and not additional_data:
+                    similar = self.similar_translation(user_input)
+                if similar is not None:
+                    command = similar.command
+                    choice = await questionary.confirm(f"Do you want to run the command '{command}'?{self.similar_note(similar)}").ask_async()
+                if not choice:
+                    # Nothing similar enough, or the user rejected it
+                    choice = similar = None
+                    command = cached_command or await self.atranslate_command(user_input, additional_data)
+                note = " (cached)" if cached_command else ""
+            else:
+                note = " (local)"
+
+            if choice is None:
+                choice = await questionary.confirm(f"Do you want to run the command '{command}'?{note}").ask_async()
+            if not choice:
+                print(text_theme('info') + "Command cancelled!" + reset_format())
+                return ""
+            if cache_key and not cached_command and similar is None and self.is_cacheable(command):
+                self.translation_cache.put(cache_key, command)
+            translated = command
+            if command.startswith("CONFIRM:"):
+                confirmation = await questionary.confirm(f"Warning: This command may be destructive. Are you sure you want to run '{command[9:]}'?").ask_async()
+                if not confirmation:
+                    return text_theme('info') + "Command execution aborted." + reset_format()
+                if not await asyncio.to_thread(self.verify_dangerous_command, command[9:]):
+                    return text_theme('dangerous_confirm') + "Command verification failed. Execution aborted." + reset_format()
+                command = command[9:]
+            print(text_theme('info') + f"Command: {command}" + reset_format())
+            self.remember_command(command)
+            start = time.perf_counter()
+            if command.startswith("cd "):
+                result = self.change_directory(command)
+                self.record_history(user_input, translated, 0, start)
+                return result
+
+            _, stderr, exit_code = await asyncio.to_thread(self.execute_command_with_live_output, command)
+            self.record_history(user_input, translated, exit_code, start)
+            if exit_code == 0:
+                return ""
+            if cache_key:
+                self.translation_cache.invalidate(cache_key)
+            try:
+                debug_suggestion = await self.adebug_error(command, stderr, exit_code)
+            except ProviderError as e:
+                return self.format_provider_error(e)
+            return self.format_debug_suggestion(debug_suggestion).strip()
+        except ProviderError as e:
+            return self.format_provider_error(e)
+        except Exception as e:
+            print(text_theme('error') + "Error in execute command" + reset_format())
+            return await asyncio.to_thread(self.handle_error, str(e), user_input, command)
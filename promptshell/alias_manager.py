@@ -1,8 +1,11 @@
+import atexit
+import contextlib
 import json
 import os
 import re
 import questionary
 import shlex
+import threading
 
 from datetime import datetime
 from pathlib import Path
@@ -12,30 +15,187 @@ from .format_utils import text_theme, reset_format
 
 ALIAS_FILE = os.path.join(CONFIG_DIR, "aliases.json")
 
+# Changes made within this many seconds of each other are written in one save
+SAVE_DELAY = 0.5
+
+ALIAS_NAME_PATTERN = re.compile(r'^[a-zA-Z_]\w*$')
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Holds an exclusive lock shared by all processes using the same file.
+
+    The lock is taken on a separate '<path>.lock' file, so the data file
+    itself can be replaced while the lock is held.
+
+    Args:
+        path: File to lock
+    """
+
+    with open(f"{path}.lock", 'a+') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after 10 seconds; keep waiting
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def write_json_atomic(path: str, data: dict, **dump_options):
+    """Writes JSON to a temporary file and renames it over the target.
+
+    Readers see either the old or the new file, never a partial one.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        dump_options: Extra arguments for json.dump (e.g. indent)
+    """
+
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, **dump_options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_file)
+        raise
+
+def file_stamp(path: str):
+    """Gets (mtime, size) of a file, or None if it does not exist."""
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_aliases(path: str) -> dict:
+    """Reads the aliases stored in a file ({} if it is missing or unreadable)."""
+
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('aliases', {})
+    except (json.JSONDecodeError, OSError, AttributeError):
+        return {}
+
 class AliasManager:
-    def __init__(self):
-        """Manages shell command aliases."""
+    def __init__(self, save_delay: float = SAVE_DELAY):
+        """Manages shell command aliases.
+
+        Changes are saved in the background, batching those made within
+        save_delay seconds into one write, and any pending changes are written
+        at exit. Each save happens under a lock shared by all PromptShell
+        processes. It re-reads the file, applies this manager's changes on top
+        and atomically replaces the file, so concurrent shells neither corrupt
+        the file nor lose each other's aliases.
+
+        Args:
+            save_delay: Seconds to wait for further changes before saving (0 saves immediately)
+        """
 
         self.aliases = {}
         self.blacklist = ["rm -rf /", "chmod -R 777 /", ":(){:|:&};:", "mkfs", "dd if=/dev/random"]
+        self.alias_file = ALIAS_FILE
+        self.save_delay = save_delay
+        self._pending = {}      # name -> alias data, or None for a removal
+        self._cleared = False
+        self._stamp = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
         self.load_aliases()
+        atexit.register(self.flush)
     
     def load_aliases(self):
-        """Loads aliases from persistent storage."""
+        """Loads aliases from persistent storage.
+
+        The file is only parsed again when it changed since the last load
+        (e.g. another shell saved). Unsaved changes of this manager are kept.
+        """
+
+        stamp = file_stamp(self.alias_file)
+        if stamp is None or stamp == self._stamp:
+            return
+        aliases = read_aliases(self.alias_file)
+        with self._lock:
+            self.aliases = self._apply_pending(aliases)
+            self._stamp = stamp
+
+    def _apply_pending(self, aliases: dict) -> dict:
+        if self._cleared:
+            aliases = {}
+        for name, data in self._pending.items():
+            if data is None:
+                aliases.pop(name, None)
+            else:
+                aliases[name] = data
+        return aliases
+
+    def _changed(self, changes: dict):
+        """Applies changes (name -> alias data, or None to remove) and schedules their save."""
+
+        with self._lock:
+            self._pending.update(changes)
+            for name, data in changes.items():
+                if data is None:
+                    self.aliases.pop(name, None)
+                else:
+                    self.aliases[name] = data
+            if self.save_delay <= 0:
+                save_now = True
+            else:
+                save_now = False
+                if self._timer is None:
+                    self._timer = threading.Timer(self.save_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if save_now:
+            self.save_aliases()
 
-        if os.path.exists(ALIAS_FILE):
-            try:
-                with open(ALIAS_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.aliases = data.get('aliases', {})
-            except (json.JSONDecodeError, IOError):
-                self.aliases = {}
-    
     def save_aliases(self):
-        """Saves aliases to persistent storage."""
+        """Saves pending alias changes to persistent storage now."""
+
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending and not self._cleared:
+                    return
+                os.makedirs(os.path.dirname(self.alias_file) or ".", exist_ok=True)
+                with file_lock(self.alias_file):
+                    # Start from what is on disk, so aliases saved by other shells are kept
+                    aliases = self._apply_pending(read_aliases(self.alias_file))
+                    write_json_atomic(self.alias_file, {'aliases': aliases}, separators=(',', ':'))
+                    self._stamp = file_stamp(self.alias_file)
+                self._pending = {}
+                self._cleared = False
+                self.aliases = aliases
 
-        with open(ALIAS_FILE, 'w') as f:
-            json.dump({'aliases': self.aliases}, f, indent=2)
+    def flush(self):
+        """Writes any pending changes, ignoring I/O errors (used by the save timer and at exit)."""
+
+        try:
+            self.save_aliases()
+        except OSError:
+            pass
     
     def validate_alias_name(self, name):
         """Validates alias name format.
@@ -47,7 +207,7 @@ class AliasManager:
             True if valid, False otherwise
         """
 
-        return re.match(r'^[a-zA-Z_]\w*$', name) is not None
+        return ALIAS_NAME_PATTERN.match(name) is not None
     
     def validate_command(self, command):
         """Checks for dangerous commands.
@@ -85,13 +245,12 @@ class AliasManager:
         if name in self.aliases:
             return False, f"{text_theme('error')}Duplicate alias name: Alias already exists{reset_format()}"
         
-        self.aliases[name] = {
+        self._changed({name: {
             'command': command,
             'description': description,
             'created_at': datetime.now().isoformat(),
             'updated_at': datetime.now().isoformat()
-        }
-        self.save_aliases()
+        }})
         return True, f"Alias '{name}' added"
     
     def remove_alias(self, name):
@@ -107,8 +266,7 @@ class AliasManager:
         if name not in self.aliases:
             return False, f"{text_theme('error')}Alias not found{reset_format()}"
         
-        del self.aliases[name]
-        self.save_aliases()
+        self._changed({name: None})
         return True, f"Alias '{name}' removed"
     
     def list_aliases(self, name=None):
@@ -145,12 +303,17 @@ class AliasManager:
 
         try:
             with open(path_obj, 'r') as f:
-                data = json.load(f)
-                for name, alias_data in data.get('aliases', {}).items():
-                    if self.validate_alias_name(name) and self.validate_command(alias_data.get('command', '')):
-                        self.aliases[name] = alias_data
+                entries = json.load(f).get('aliases', {})
+            # Everything is validated first, then stored and written in one go
+            valid = {
+                name: alias_data for name, alias_data in entries.items()
+                if isinstance(alias_data, dict) and isinstance(alias_data.get('command'), str)
+                and self.validate_alias_name(name) and self.validate_command(alias_data['command'])
+            }
+            self._changed(valid)
             self.save_aliases()
-            return True, "Aliases imported successfully"
+            skipped = len(entries) - len(valid)
+            return True, f"Aliases imported successfully ({len(valid)} imported, {skipped} skipped)"
         except json.JSONDecodeError:
             return False, f"{text_theme('error')}Invalid JSON: Incorrect JSON format in alias file{reset_format()}."
         except Exception as e:
@@ -169,8 +332,7 @@ class AliasManager:
         """
 
         try:
-            with open(file_path, 'w') as f:
-                json.dump({'aliases': self.aliases}, f, indent=2)
+            write_json_atomic(os.path.expanduser(file_path), {'aliases': self.aliases}, indent=2)
             return True, "Aliases exported successfully"
         except Exception as e:
             return False, f"{text_theme('error')}Export failed: {str(e)}{reset_format()}"
@@ -188,6 +350,7 @@ class AliasManager:
         parts = input_command.strip().split(maxsplit=1)
         if not parts:
             return input_command
+        self.load_aliases()  # Picks up aliases saved by other shells; a stat() when nothing changed
         
         alias_name = parts[0]
         args = parts[1] if len(parts) > 1 else ""
@@ -203,15 +366,17 @@ class AliasManager:
         if not confirm:
             return False, "Alias clear operation cancelled."
         
-        self.aliases = {}
+        with self._lock:
+            self.aliases = {}
+            self._pending = {}
+            self._cleared = True
         
         # file existence check
-        if not os.path.exists(ALIAS_FILE):
+        if not os.path.exists(self.alias_file):
+            self._cleared = False
             return False, "Alias file not found."
         
-        with open(ALIAS_FILE, 'w') as f:
-            json.dump({'aliases': self.aliases}, f, indent=2)
-        
+        self.save_aliases()
         return True,"All aliases cleared."
         
         
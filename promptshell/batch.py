@@ -0,0 +1,206 @@
+"""
+Batch mode for PromptShell
+--------------------------
+Translates many natural-language requests concurrently in one warm process
+and writes one JSON object per request:
+
+    promptshell --batch requests.txt --workers 8
+    cat requests.txt | promptshell --batch --execute
+
+Each line of output looks like:
+    {"input": "...", "command": "...", "latency_ms": 412.5, "cached": false, "local": false}
+
+"local" requests were answered from the built-in templates without the AI.
+
+By default commands are only translated (dry run). With --execute they are
+also run, one at a time in input order, and exit_code is added.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import shlex
+import sys
+import time
+
+from .output_stream import run_with_live_output
+from .providers import aclose_clients
+from .tracing import span
+
+# Characters of command output included in each JSON line with --execute
+OUTPUT_EXCERPT_CHARS = 2000
+
+def parse_batch_args(argv: list) -> argparse.Namespace:
+    """Parses the batch mode command line.
+
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(prog="promptshell --batch", description="Translate requests in bulk and emit JSON lines.")
+    parser.add_argument("--batch", metavar="FILE", nargs="?", const="-", required=True,
+                        help="file with one request per line ('-' or omitted for stdin)")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent translations (default: 4)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", action="store_true", help="only translate (default)")
+    mode.add_argument("--execute", action="store_true", help="run each translated command in input order")
+    return parser.parse_args(argv)
+
+def read_requests(source: str) -> list:
+    """Reads requests, one per line, skipping blank lines and # comments.
+
+    Args:
+        source: File path, or '-' for stdin
+
+    Returns:
+        List of request strings
+    """
+
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(os.path.expanduser(source), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+def execute_batch_command(command: str) -> tuple:
+    """Runs a translated command without forwarding its output to the terminal.
+
+    Args:
+        command: Shell command
+
+    Returns:
+        Tuple containing stdout tail, stderr tail, and exit code
+    """
+
+    if os.name == "nt":
+        return run_with_live_output(command, shell=True, max_chars=OUTPUT_EXCERPT_CHARS, forward=False)
+    return run_with_live_output(shlex.split(command), max_chars=OUTPUT_EXCERPT_CHARS, forward=False)
+
+async def translate_one(assistant, user_input: str, semaphore: asyncio.Semaphore) -> dict:
+    """Translates one request, serving it from the local templates or the translation cache when possible.
+
+    Args:
+        assistant: AITerminalAssistant instance
+        user_input: Natural language request
+        semaphore: Limits the number of concurrent translations
+
+    Returns:
+        Result record
+    """
+
+    async with semaphore:
+        with span("batch_request", input=user_input):
+            start = time.perf_counter()
+            record = {"input": user_input, "command": None, "latency_ms": 0.0, "cached": False, "local": False}
+            try:
+                cache_key = None
+                command = assistant.local_command(user_input)
+                record["local"] = command is not None
+                if command is None:
+                    additional_data = await asyncio.to_thread(assistant.gather_additional_data, user_input)
+                    cache_key = assistant.translation_cache_key(user_input, additional_data)
+                    command = assistant.translation_cache.get(cache_key) if cache_key else None
+                    record["cached"] = command is not None
+                if command is None:
+                    # Requests are independent, so they are kept out of the shared conversation context
+                    command = await assistant.atranslate_command(user_input, additional_data, remember=False)
+                if assistant.is_cacheable(command):
+                    record["command"] = command
+                else:
+                    record["error"] = command
+                record["_cache_key"] = cache_key
+            except Exception as e:
+                record["error"] = str(e)
+            record["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return record
+
+def execute_record(assistant, record: dict):
+    """Runs the command of a translated record and adds the outcome to it.
+
+    Args:
+        assistant: AITerminalAssistant instance
+        record: Result record from translate_one
+    """
+
+    command = record.get("command")
+    if not command:
+        return
+    if command.startswith("CONFIRM:"):
+        record["skipped"] = "command needs interactive confirmation"
+        return
+    try:
+        stdout, stderr, exit_code = execute_batch_command(command)
+    except Exception as e:
+        # Unknown programs and unbalanced quotes fail this record, not the whole batch
+        record["error"] = str(e)
+        return
+    record["exit_code"] = exit_code
+    record["stdout"] = stdout
+    record["stderr"] = stderr
+    cache_key = record.get("_cache_key")
+    if cache_key and not record["cached"] and exit_code == 0:
+        assistant.translation_cache.put(cache_key, command)
+
+async def run_batch(assistant, requests: list, workers: int = 4, execute: bool = False, out=None) -> int:
+    """Translates requests concurrently and writes JSON lines in input order.
+
+    Args:
+        assistant: AITerminalAssistant instance
+        requests: Natural language requests
+        workers: Maximum concurrent translations
+        execute: Run each translated command (default: False)
+        out: Output stream for JSON lines (default: sys.stdout)
+
+    Returns:
+        Number of requests that failed
+    """
+
+    out = out or sys.stdout
+    semaphore = asyncio.Semaphore(max(workers, 1))
+    tasks = [asyncio.create_task(translate_one(assistant, user_input, semaphore)) for user_input in requests]
+    failures = 0
+    try:
+        for task in tasks:
+            record = await task
+            if execute:
+                await asyncio.to_thread(execute_record, assistant, record)
+            record.pop("_cache_key", None)
+            if "error" in record or record.get("exit_code", 0) != 0:
+                failures += 1
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        # The provider clients of this event loop cannot be used once it ends
+        await aclose_clients()
+    return failures
+
+def batch_main(argv: list) -> int:
+    """Entry point for `promptshell --batch`.
+
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Process exit code
+    """
+
+    from .ai_terminal_assistant import AITerminalAssistant
+    from .setup import load_config, get_active_model
+    from . import tracing
+
+    args = parse_batch_args(argv)
+    out = sys.stdout
+    # Anything else printed along the way goes to stderr so stdout stays valid JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        requests = read_requests(args.batch)
+        config = load_config()
+        tracing.configure(trace_file=config.get("TRACE_FILE"))
+        assistant = AITerminalAssistant(config=config, model_name=get_active_model())
+        failures = asyncio.run(run_batch(assistant, requests, args.workers, args.execute, out))
+    return 1 if failures else 0
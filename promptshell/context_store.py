@@ -0,0 +1,109 @@
+import hashlib
+
+from collections import deque
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimates the token count of a text (~4 characters per token).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+
+    return len(text) // 4 + 1
+
+def attachment_ref(content: str) -> str:
+    """Gets the short content hash that stands for a large value in the history.
+
+    Args:
+        content: Attachment text
+
+    Returns:
+        First 12 hex digits of the SHA-1 of the text
+    """
+
+    return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()[:12]
+
+class ContextStore:
+    def __init__(self, token_budget: int = 2000, attachment_threshold: int = 1000):
+        """Bounded conversation history for a Node.
+
+        Turns are kept until the token budget is exceeded, then the oldest
+        ones are evicted. The rendered history is maintained incrementally, so
+        building a prompt never re-serializes the whole conversation.
+
+        Args:
+            token_budget: Maximum estimated tokens kept in the history
+            attachment_threshold: Size in characters above which additional
+                data is kept as a short content hash instead of inline
+        """
+
+        self.token_budget = token_budget
+        self.attachment_threshold = attachment_threshold
+        self.tokens = 0
+        self._turns = deque()  # (role, content, rendered line, tokens)
+        self._rendered = ""
+
+    def __len__(self):
+        return len(self._turns)
+
+    def __iter__(self):
+        for role, content, _, _ in self._turns:
+            yield {"role": role, "content": content}
+
+    def __getitem__(self, index):
+        role, content, _, _ = self._turns[index]
+        return {"role": role, "content": content}
+
+    def append(self, role: str, content: str, additional_data: dict = None):
+        """Adds a turn and evicts the oldest ones if the budget is exceeded.
+
+        Large additional data values (file contents, command output) were
+        sent in full with the request itself; the history only keeps a content
+        hash, so later prompts can tell the same data was seen before without
+        carrying it again.
+
+        Args:
+            role: Message role (user/assistant)
+            content: Message text
+            additional_data: Supplementary context sent with the message (optional)
+        """
+
+        for key, value in (additional_data or {}).items():
+            value = str(value)
+            if len(value) > self.attachment_threshold:
+                content += f"\n[{key}: attachment {attachment_ref(value)}]"
+            else:
+                content += f"\n{key}: {value}"
+
+        max_chars = self.token_budget * 4
+        if len(content) > max_chars:
+            content = content[:max_chars] + " [truncated]"
+
+        line = f"{role} {content}\n"
+        tokens = estimate_tokens(line)
+        self._turns.append((role, content, line, tokens))
+        self._rendered += line
+        self.tokens += tokens
+
+        while self.tokens > self.token_budget and len(self._turns) > 1:
+            self._evict_oldest()
+
+    def render(self) -> str:
+        """Returns the history as prompt text, one "role content" line per turn."""
+
+        return self._rendered
+
+    def clear(self):
+        """Removes all turns."""
+
+        self._turns.clear()
+        self._rendered = ""
+        self.tokens = 0
+
+    def _evict_oldest(self):
+        _, _, line, tokens = self._turns.popleft()
+        self._rendered = self._rendered[len(line):]
+        self.tokens -= tokens
@@ -1,6 +1,8 @@
 import pyperclip
 import subprocess
 
+from .file_context import read_file_context
+
 class DataGatherer:
     @staticmethod
     def get_clipboard_content():
@@ -17,7 +19,7 @@ class DataGatherer:
 
     @staticmethod
     def get_file_content(file_path):
-        """Reads file contents.
+        """Reads file contents, sampling large files and skipping binaries.
         
         Args:
             file_path: Path to file
@@ -26,11 +28,7 @@ class DataGatherer:
             File content or error message
         """
 
-        try:
-            with open(file_path, 'r') as file:
-                return file.read()
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+        return read_file_context(file_path)
 
     @staticmethod
     def execute_command(command):
@@ -0,0 +1,277 @@
+import json
+import os
+import re
+import threading
+
+from .setup import CONFIG_DIR
+
+INDEX_FILE = os.path.join(CONFIG_DIR, "executables.json")
+
+# Tool families: request keywords -> tools to suggest, preferred tools first
+TOOL_FAMILIES = {
+    "git": (
+        {"git", "commit", "commits", "branch", "branches", "merge", "rebase", "stash", "repo", "repository",
+         "clone", "push", "pull", "checkout", "staged", "unstaged", "blame", "tag", "tags", "pr"},
+        ["git", "gh", "tig", "git-lfs"]
+    ),
+    "docker": (
+        {"docker", "container", "containers", "image", "images", "compose", "dockerfile", "volume", "volumes"},
+        ["docker", "docker-compose", "podman", "nerdctl"]
+    ),
+    "kubernetes": (
+        {"kubectl", "kubernetes", "k8s", "pod", "pods", "deployment", "deployments", "namespace", "namespaces",
+         "cluster", "helm", "node", "nodes", "service", "services"},
+        ["kubectl", "helm", "k9s", "kubectx", "kubens", "minikube", "kind"]
+    ),
+    "text search": (
+        {"grep", "search", "containing", "contains", "occurrences", "occurrence", "pattern", "regex", "todo",
+         "todos", "text", "string", "word", "lines", "matching"},
+        ["rg", "ag", "ack", "grep"]
+    ),
+    "file search": (
+        {"find", "locate", "named", "extension", "files", "largest", "newest", "oldest", "modified"},
+        ["fd", "fdfind", "find", "locate"]
+    ),
+    "viewing": (
+        {"view", "read", "cat", "head", "tail", "preview", "highlight"},
+        ["bat", "batcat", "less", "cat", "head", "tail"]
+    ),
+    "json": (
+        {"json", "yaml", "yml", "jq", "parse", "field", "fields"},
+        ["jq", "yq"]
+    ),
+    "http": (
+        {"download", "http", "https", "url", "api", "request", "curl", "wget", "fetch", "endpoint"},
+        ["curl", "wget", "http", "xh"]
+    ),
+    "network": (
+        {"port", "ports", "ping", "ip", "dns", "network", "listening", "connection", "connections", "ssh", "host"},
+        ["ss", "netstat", "lsof", "ping", "dig", "nslookup", "ip", "ifconfig", "ssh", "scp"]
+    ),
+    "disk": (
+        {"disk", "space", "usage", "size", "sizes", "storage", "mounted", "free", "du", "df"},
+        ["dust", "ncdu", "du", "df", "duf"]
+    ),
+    "processes": (
+        {"process", "processes", "running", "kill", "cpu", "memory", "ram", "pid", "top", "load"},
+        ["htop", "btop", "top", "ps", "pgrep", "pkill", "kill", "free"]
+    ),
+    "archives": (
+        {"zip", "unzip", "tar", "archive", "compress", "decompress", "extract", "gz", "gzip", "tgz", "7z"},
+        ["tar", "zip", "unzip", "gzip", "gunzip", "7z", "xz", "zstd"]
+    ),
+    "python": (
+        {"python", "pip", "virtualenv", "venv", "pytest", "package", "packages"},
+        ["python3", "python", "pip3", "pip", "uv", "pipx", "poetry", "pytest"]
+    ),
+    "node": (
+        {"node", "npm", "yarn", "pnpm", "javascript", "typescript", "js", "ts"},
+        ["node", "npm", "pnpm", "yarn", "npx", "bun", "deno"]
+    ),
+    "system packages": (
+        {"install", "uninstall", "upgrade", "update", "apt", "brew", "package", "packages"},
+        ["apt", "apt-get", "dnf", "yum", "pacman", "zypper", "brew", "winget", "choco", "snap", "flatpak"]
+    ),
+    "services": (
+        {"service", "services", "daemon", "systemd", "logs", "journal", "boot"},
+        ["systemctl", "journalctl", "service", "launchctl"]
+    ),
+}
+
+# Everyday words that are also command names; they do not name a tool on their own
+COMMON_WORDS = {
+    "find", "locate", "top", "kill", "free", "ip", "service", "update", "install", "fetch", "read", "head",
+    "tail", "view", "host", "time", "sort", "watch", "which", "make", "open", "test", "join", "split", "yes",
+    "less", "more", "file", "http", "last", "look", "link", "list", "show", "tree", "touch", "date", "size",
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+._-]*")
+
+def query_tokens(query: str) -> list:
+    """Splits a request into lowercase words, keeping tool-like names (docker-compose, python3) whole."""
+
+    return _TOKEN_PATTERN.findall(query.lower())
+
+def scan_directory(path: str) -> list:
+    """Lists the executable files in a directory.
+
+    Args:
+        path: Directory to scan
+
+    Returns:
+        List of executable file names
+    """
+
+    names = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        names.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return names
+
+class ExecutableIndex:
+    def __init__(self, path_dirs: list = None, index_file: str = None):
+        """Persistent index of the executables found on PATH.
+
+        Each directory is stored with its mtime, so a refresh only rescans
+        directories whose contents changed since the last run.
+
+        Args:
+            path_dirs: Directories to index (default: entries of $PATH)
+            index_file: Where the index is persisted (default: INDEX_FILE)
+        """
+
+        if path_dirs is None:
+            path_dirs = os.environ.get('PATH', '').split(os.pathsep)
+        self.path_dirs = list(dict.fromkeys(d for d in path_dirs if d))
+        self.index_file = index_file or INDEX_FILE
+        self._dirs = {}
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                self._dirs = json.load(f).get('dirs', {})
+        except (OSError, ValueError):
+            self._dirs = {}
+
+    def _save(self):
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({'dirs': self._dirs}, f)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            pass
+
+    @property
+    def is_built(self) -> bool:
+        """Whether every PATH directory has been indexed at least once."""
+
+        return all(d in self._dirs for d in self.path_dirs)
+
+    def refresh(self) -> int:
+        """Rescans the PATH directories whose mtime changed.
+
+        Returns:
+            Number of directories rescanned
+        """
+
+        rescanned = 0
+        updated = {}
+        for path in self.path_dirs:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = None  # Missing directory: recorded as empty so is_built still holds
+            cached = self._dirs.get(path)
+            if cached and cached.get('mtime') == mtime:
+                updated[path] = cached
+                continue
+            updated[path] = {'mtime': mtime, 'names': scan_directory(path) if mtime is not None else []}
+            rescanned += 1
+        with self._lock:
+            # Keep entries for directories outside this PATH; other shells may use them
+            self._dirs.update(updated)
+            if rescanned:
+                self._save()
+        return rescanned
+
+    def refresh_in_background(self) -> threading.Thread:
+        """Starts a refresh on a daemon thread unless one is already running.
+
+        Returns:
+            The refresh thread
+        """
+
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+        return self._refresh_thread
+
+    def commands(self) -> list:
+        """Gets the indexed executable names.
+
+        Returns:
+            Sorted list of unique command names on PATH
+        """
+
+        return sorted(self._names())
+
+    def _names(self) -> set:
+        with self._lock:
+            names = set()
+            for path in self.path_dirs:
+                names.update(self._dirs.get(path, {}).get('names', []))
+        return names
+
+    def relevant_commands(self, query: str, limit: int = 12) -> list:
+        """Picks the installed commands most relevant to a request.
+
+        Commands named in the request come first (unless the name is also an
+        everyday word such as 'find'), then the installed tools of
+        every family whose keywords appear in it (in the family's order of
+        preference, so 'rg' is offered before 'grep'), then commands whose
+        name starts with a longer word of the request ('python' -> 'python3').
+
+        Args:
+            query: User's natural language request
+            limit: Maximum number of commands to return
+
+        Returns:
+            List of installed command names, most relevant first
+        """
+
+        installed = self._names()
+        tokens = query_tokens(query)
+        words = set(tokens)
+        scores = {}
+
+        def offer(name, score):
+            if name in installed and score > scores.get(name, 0):
+                scores[name] = score
+
+        for token in tokens:
+            offer(token, 20 if token in COMMON_WORDS else 100)
+        for keywords, tools in TOOL_FAMILIES.values():
+            hits = len(words & keywords)
+            if hits:
+                for position, name in enumerate(tools):
+                    offer(name, 50 + hits - position / 100)
+        for token in words:
+            if len(token) >= 4:
+                matches = sorted((n for n in installed if n.startswith(token)), key=len)[:3]
+                for name in matches:
+                    offer(name, 10 + len(token) / len(name))
+
+        ranked = sorted(scores, key=lambda name: (-scores[name], name))
+        return ranked[:limit]
+
+_shared_index = None
+
+def get_executable_index() -> ExecutableIndex:
+    """Gets the process-wide executable index, refreshing it as cheaply as possible.
+
+    The first build ever is done synchronously; later refreshes run in the
+    background and only rescan directories that changed.
+
+    Returns:
+        ExecutableIndex instance
+    """
+
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = ExecutableIndex()
+    if _shared_index.is_built:
+        _shared_index.refresh_in_background()
+    else:
+        _shared_index.refresh()
+    return _shared_index
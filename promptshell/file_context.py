@@ -0,0 +1,167 @@
+import mmap
+import os
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Total token budget shared by all files referenced in one request
+FILE_TOKEN_BUDGET = 3000
+MAX_FILES = 5
+BINARY_SAMPLE_SIZE = 8192
+MAX_MATCHES_PER_TERM = 5
+MAX_LINE_EXTENSION = 500
+
+# Share of a file's budget given to each sampled region of a large file
+HEAD_SHARE = 0.4
+TAIL_SHARE = 0.3
+
+STOPWORDS = {
+    "the", "and", "for", "from", "with", "into", "this", "that", "file", "files",
+    "content", "contents", "read", "merge", "show", "lines", "line", "all", "what", "does",
+}
+
+def is_binary(sample: bytes) -> bool:
+    """Guesses whether data is binary from a leading sample.
+
+    Args:
+        sample: First bytes of the file
+
+    Returns:
+        True if the data looks binary
+    """
+
+    if b"\0" in sample:
+        return True
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is fine
+        return e.start < len(sample) - 3
+    return False
+
+def query_terms(user_input: str, paths: list = ()) -> list:
+    """Extracts the words worth searching for inside referenced files.
+
+    Args:
+        user_input: User's request
+        paths: File paths mentioned in the request (excluded from the terms)
+
+    Returns:
+        List of search terms
+    """
+
+    words = re.findall(r"[A-Za-z_][\w.-]{2,}", user_input)
+    return [w for w in dict.fromkeys(words) if w.lower() not in STOPWORDS and w not in paths]
+
+def _line_bounds(data, start: int, end: int) -> tuple:
+    """Widens a byte range to whole lines, by at most MAX_LINE_EXTENSION bytes each way."""
+
+    newline = data.rfind(b"\n", max(start - MAX_LINE_EXTENSION, 0), start)
+    if newline == -1:
+        line_start = 0 if start <= MAX_LINE_EXTENSION else start
+    else:
+        line_start = newline + 1
+    newline = data.find(b"\n", end, end + MAX_LINE_EXTENSION)
+    line_end = min(end + MAX_LINE_EXTENSION, len(data)) if newline == -1 else newline + 1
+    return line_start, line_end
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+def sample_large_file(data, terms: list, budget_chars: int) -> str:
+    """Samples the head, the tail and the regions matching the query terms.
+
+    Args:
+        data: File contents (bytes or mmap)
+        terms: Words to locate in the file
+        budget_chars: Maximum characters to return (approximately)
+
+    Returns:
+        Sampled text with markers for omitted parts
+    """
+
+    size = len(data)
+    head_end = _line_bounds(data, 0, int(budget_chars * HEAD_SHARE))[1]
+    tail_start = _line_bounds(data, max(size - int(budget_chars * TAIL_SHARE), head_end), size)[0]
+    tail_start = max(tail_start, head_end)
+
+    regions = []
+    match_budget = budget_chars - head_end - (size - tail_start)
+    for term in terms:
+        for needle in dict.fromkeys([term.encode(), term.lower().encode()]):
+            pos = head_end
+            for _ in range(MAX_MATCHES_PER_TERM):
+                if match_budget <= 0:
+                    break
+                pos = data.find(needle, pos, tail_start)
+                if pos == -1:
+                    break
+                start, end = _line_bounds(data, pos, pos + len(needle))
+                end = min(end, start + match_budget)
+                regions.append((start, end))
+                match_budget -= end - start
+                pos = end
+
+    parts = [_decode(data[:head_end])]
+    last = head_end
+    for start, end in sorted(regions):
+        if end <= last:
+            continue
+        start = max(start, last)
+        parts.append(f"\n... [{start - last} bytes omitted] ...\n")
+        parts.append(_decode(data[start:end]))
+        last = end
+    parts.append(f"\n... [{tail_start - last} bytes omitted] ...\n")
+    parts.append(_decode(data[tail_start:]))
+    return "".join(parts)
+
+def read_file_context(path: str, terms: list = (), token_budget: int = FILE_TOKEN_BUDGET) -> str:
+    """Reads a file for the prompt within a token budget.
+
+    Small text files are returned whole. Large ones are memory-mapped and
+    sampled (head, tail and lines matching the terms), and binary files are
+    replaced by a short note.
+
+    Args:
+        path: File path
+        terms: Words to locate in the file (optional)
+        token_budget: Maximum tokens (~4 characters each) to return
+
+    Returns:
+        File context text or error message
+    """
+
+    budget_chars = token_budget * 4
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            sample = f.read(BINARY_SAMPLE_SIZE)
+            if is_binary(sample):
+                return f"[binary file, {size} bytes, content not included]"
+            if size <= budget_chars:
+                return _decode(sample + f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return f"[large file, {size} bytes, sampled]\n" + sample_large_file(data, terms, budget_chars)
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+def gather_file_contexts(paths: list, user_input: str = "", token_budget: int = FILE_TOKEN_BUDGET) -> dict:
+    """Reads several files concurrently, sharing one token budget between them.
+
+    Args:
+        paths: File paths to read (at most MAX_FILES are used)
+        user_input: User's request, used to find relevant regions
+        token_budget: Total token budget for all files
+
+    Returns:
+        Dictionary mapping each path to its context text
+    """
+
+    paths = list(dict.fromkeys(paths))[:MAX_FILES]
+    if not paths:
+        return {}
+    terms = query_terms(user_input, paths)
+    per_file_budget = max(token_budget // len(paths), 1)
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        contents = executor.map(lambda path: read_file_context(path, terms, per_file_budget), paths)
+        return dict(zip(paths, contents))
@@ -0,0 +1,261 @@
+"""
+Hedged provider requests
+------------------------
+Sends a request to the primary provider and, if no valid answer has started
+arriving within HEDGE_DELAY_MS, to a secondary provider as well. The first
+valid answer wins and the other one is abandoned.
+
+    HEDGE_PROVIDER=openai      # secondary provider (blank = no hedging)
+    HEDGE_MODEL=gpt-4o-mini    # model used on the secondary provider
+    HEDGE_DELAY_MS=2000        # how long the primary gets on its own
+
+A failed primary (an exception or an empty response) triggers the secondary
+immediately; if both fail, the primary's error is raised. Backends report
+failures by raising, so an answer that happens to start with "Error" is a
+real answer.
+
+Streaming backends are raced on their first chunk. A losing stream is closed
+when its next chunk arrives, which releases its connection; a losing blocking
+call() cannot be interrupted and finishes in the background, its answer
+discarded. acall() cancels the losing task outright.
+"""
+
+import asyncio
+import contextvars
+import copy
+import queue
+import threading
+import time
+
+from .providers import PROVIDER_MODULES
+from .setup import config_number
+from .spinner_progress_utils import spinner
+from .tracing import span
+from .usage import attribute_call
+
+def hedge_settings(config: dict, primary_provider: str, primary_model: str):
+    """Reads the hedging configuration.
+
+    Args:
+        config: Configuration dictionary
+        primary_provider: Provider of the calling Node
+        primary_model: Model of the calling Node
+
+    Returns:
+        Tuple (secondary provider, secondary model, delay in seconds), or None when hedging is off
+    """
+
+    provider = str(config.get("HEDGE_PROVIDER", "")).strip().lower()
+    if not provider or provider == "none" or provider not in PROVIDER_MODULES:
+        return None
+    model = str(config.get("HEDGE_MODEL", "")).strip() or primary_model
+    if (provider, model) == (primary_provider, primary_model):
+        return None
+    return provider, model, max(config_number(config, "HEDGE_DELAY_MS", 2000.0), 0.0) / 1000
+
+def is_valid_response(text: str) -> bool:
+    """Whether a (partial) response has any content; failures are raised, not returned."""
+
+    return bool(text.strip())
+
+def _unwrapped(func):
+    # Workers run without the spinner; the hedged call shows a single one
+    return getattr(func, "__wrapped__", func)
+
+class _Attempt:
+    def __init__(self, backend, node, prompt: str, events: queue.Queue):
+        """Runs one provider request on a worker thread, posting its chunks to a shared queue.
+
+        Args:
+            backend: Provider backend
+            node: Node (or secondary proxy) the request is made for
+            prompt: Prompt to send
+            events: Queue receiving (attempt, kind, payload) events
+        """
+
+        self.node = node
+        self.cancelled = threading.Event()
+        self.text = ""
+        self.failed = False
+        self.error = None
+        context = contextvars.copy_context()
+        self.thread = threading.Thread(target=context.run, args=(self._run, backend, prompt, events), daemon=True)
+        self.thread.start()
+
+    def _run(self, backend, prompt, events):
+        try:
+            if hasattr(backend, "stream"):
+                chunks = backend.stream(self.node, prompt)
+                try:
+                    for chunk in chunks:
+                        if self.cancelled.is_set():
+                            return
+                        events.put((self, "chunk", chunk))
+                finally:
+                    close = getattr(chunks, "close", None)
+                    if close:
+                        close()
+            else:
+                events.put((self, "chunk", _unwrapped(backend.call)(self.node, prompt)))
+            events.put((self, "done", None))
+        except Exception as e:
+            events.put((self, "error", e))
+
+    def cancel(self):
+        self.cancelled.set()
+
+class HedgedBackend:
+    def __init__(self, primary, secondary, secondary_provider: str, secondary_model: str, delay: float):
+        """Backend that races a primary provider against a delayed secondary.
+
+        Args:
+            primary: Primary provider backend
+            secondary: Secondary provider backend
+            secondary_provider: Secondary provider name
+            secondary_model: Model used on the secondary provider
+            delay: Seconds before the secondary is also asked
+        """
+
+        self.primary = primary
+        self.secondary = secondary
+        self.secondary_provider = secondary_provider
+        self.secondary_model = secondary_model
+        self.delay = delay
+
+    def _secondary_node(self, node):
+        proxy = copy.copy(node)
+        proxy.provider = self.secondary_provider
+        proxy.model_name = self.secondary_model
+        return proxy
+
+    def _race(self, node, prompt: str, events: queue.Queue):
+        """Waits for the first attempt whose output starts validly.
+
+        Returns:
+            Tuple (winning attempt, output received so far)
+
+        Raises:
+            Exception: The primary's error, if no attempt produced a valid response
+        """
+
+        primary = _Attempt(self.primary, node, prompt, events)
+        attempts = [primary]
+        deadline = time.monotonic() + self.delay
+        with span("hedge", delay_ms=round(self.delay * 1000)) as hedge_span:
+            while True:
+                try:
+                    timeout = max(deadline - time.monotonic(), 0) if len(attempts) == 1 else None
+                    attempt, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    attempts.append(_Attempt(self.secondary, self._secondary_node(node), prompt, events))
+                    continue
+                if attempt.failed:
+                    continue
+                if kind == "chunk":
+                    attempt.text += payload
+                    if not is_valid_response(attempt.text):
+                        continue
+                    for other in attempts:
+                        if other is not attempt:
+                            other.cancel()
+                    hedge_span.set(winner=attempt.node.provider, hedged=len(attempts) > 1)
+                    attribute_call(attempt.node)
+                    return attempt, attempt.text
+                # An error, or a response that ended without any content
+                attempt.failed = True
+                attempt.cancel()
+                attempt.error = payload if kind == "error" else ValueError(f"{attempt.node.provider} returned an empty response")
+                if len(attempts) == 1:
+                    attempts.append(_Attempt(self.secondary, self._secondary_node(node), prompt, events))
+                elif all(a.failed for a in attempts):
+                    hedge_span.set(winner=None, hedged=True)
+                    raise primary.error
+
+    def stream(self, node, prompt: str):
+        """Streams the answer of whichever provider starts answering validly first.
+
+        Args:
+            node: Calling Node instance
+            prompt: Input prompt
+
+        Yields:
+            Response text chunks
+        """
+
+        events = queue.Queue()
+        winner, text = self._race(node, prompt, events)
+        yield text
+        try:
+            while True:
+                attempt, kind, payload = events.get()
+                if attempt is not winner:
+                    continue
+                if kind == "chunk":
+                    yield payload
+                elif kind == "done":
+                    return
+                else:
+                    raise payload
+        finally:
+            winner.cancel()
+
+    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+    def call(self, node, prompt: str) -> str:
+        """Gets the first valid complete answer.
+
+        Args:
+            node: Calling Node instance
+            prompt: Input prompt
+
+        Returns:
+            Response text
+        """
+
+        return "".join(self.stream(node, prompt))
+
+    async def _acall_one(self, backend, node, prompt: str) -> str:
+        if hasattr(backend, "acall"):
+            return await backend.acall(node, prompt)
+        return await asyncio.to_thread(_unwrapped(backend.call), node, prompt)
+
+    async def acall(self, node, prompt: str) -> str:
+        """Async variant of call; the losing request is cancelled outright.
+
+        Args:
+            node: Calling Node instance
+            prompt: Input prompt
+
+        Returns:
+            Response text
+        """
+
+        secondary_node = self._secondary_node(node)
+        pending = {asyncio.ensure_future(self._acall_one(self.primary, node, prompt)): node}
+        hedged = False
+        errors = {}
+        with span("hedge", delay_ms=round(self.delay * 1000)) as hedge_span:
+            try:
+                timeout = self.delay
+                while pending:
+                    done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task_node = pending.pop(task)
+                        if task.exception():
+                            errors[task_node is node] = task.exception()
+                            continue
+                        result = task.result()
+                        if is_valid_response(result):
+                            hedge_span.set(winner=task_node.provider, hedged=hedged)
+                            attribute_call(task_node)
+                            return result
+                        errors[task_node is node] = ValueError(f"{task_node.provider} returned an empty response")
+                    if not hedged:
+                        # The primary is slow or failed: ask the secondary too
+                        hedged = True
+                        timeout = None
+                        pending[asyncio.ensure_future(self._acall_one(self.secondary, secondary_node, prompt))] = secondary_node
+                hedge_span.set(winner=None, hedged=hedged)
+                raise errors.get(True) or errors[False]
+            finally:
+                for task in pending:
+                    task.cancel()
@@ -0,0 +1,308 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+
+from .setup import CONFIG_DIR
+from .format_utils import text_theme, reset_format
+
+HISTORY_FILE = os.path.join(CONFIG_DIR, "history.db")
+
+HISTORY_COLUMNS = ("input", "command", "cwd", "exit_code", "duration_ms", "timestamp")
+
+def fts_query(text: str, match_all: bool = True) -> str:
+    """Builds an FTS5 query from free text, matching each word as a prefix.
+
+    Args:
+        text: Search terms
+        match_all: Require every word (AND) rather than any of them (OR)
+
+    Returns:
+        FTS5 MATCH expression, or an empty string if the text has no words
+    """
+
+    words = re.findall(r"\w+", text.lower())
+    return (" AND " if match_all else " OR ").join(f'"{word}"*' for word in words)
+
+class HistoryStore:
+    def __init__(self, path: str = None, max_entries: int = 200000):
+        """Persistent history of executed commands with full-text search.
+
+        Every record keeps the request, the command that ran, the working
+        directory, exit code, duration and time. The request and command are
+        indexed with SQLite FTS5, so searches stay in the millisecond range
+        with hundreds of thousands of rows. Where FTS5 is not compiled into
+        SQLite, searches fall back to LIKE scans.
+
+        Args:
+            path: Database file (default: HISTORY_FILE)
+            max_entries: Number of records kept; the oldest are pruned
+        """
+
+        self.path = path or HISTORY_FILE
+        self.max_entries = max_entries
+        self.has_fts = False
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    input TEXT NOT NULL,
+                    command TEXT NOT NULL,
+                    cwd TEXT NOT NULL,
+                    exit_code INTEGER,
+                    duration_ms REAL,
+                    timestamp REAL NOT NULL
+                )
+            """)
+        except sqlite3.Error:
+            self._db = None  # History is best effort; run without it
+            return
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts "
+                "USING fts5(input, command, content='history', content_rowid='id')"
+            )
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+                    INSERT INTO history_fts (rowid, input, command) VALUES (new.id, new.input, new.command);
+                END
+            """)
+            self._db.execute("""
+                CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+                    INSERT INTO history_fts (history_fts, rowid, input, command)
+                    VALUES ('delete', old.id, old.input, old.command);
+                END
+            """)
+            self.has_fts = True
+        except sqlite3.Error:
+            pass
+
+    def add(self, user_input: str, command: str, cwd: str, exit_code: int = None, duration_ms: float = None):
+        """Records an executed command and prunes the oldest records beyond max_entries.
+
+        Args:
+            user_input: What the user typed (natural language or direct command)
+            command: Command that was run
+            cwd: Working directory it ran in
+            exit_code: Exit status (None if unknown)
+            duration_ms: Execution time in milliseconds
+        """
+
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = self._db.execute(
+                        "INSERT INTO history (input, command, cwd, exit_code, duration_ms, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (user_input, command, cwd, exit_code, duration_ms, time.time())
+                    )
+                    # Ids only grow, so this range delete uses the primary key
+                    self._db.execute("DELETE FROM history WHERE id <= ?", (cursor.lastrowid - self.max_entries,))
+                    self._db.execute("COMMIT")
+                except sqlite3.Error:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error:
+            pass
+
+    def search(self, text: str, limit: int = 20, match_all: bool = True, successful_only: bool = False) -> list:
+        """Finds the records whose request or command contains the given words.
+
+        Args:
+            text: Search terms (each word matches as a prefix)
+            limit: Maximum number of records
+            match_all: Require every word (default) rather than any of them
+            successful_only: Only return commands that exited with 0
+
+        Returns:
+            List of record dictionaries, best match first
+        """
+
+        query = fts_query(text, match_all)
+        if self._db is None or not query:
+            return []
+        exit_filter = " AND h.exit_code = 0" if successful_only else ""
+        columns = ", ".join(f"h.{column}" for column in HISTORY_COLUMNS)
+        try:
+            with self._lock:
+                if self.has_fts:
+                    # The request is weighted above the command; ties go to the newest record
+                    rows = self._db.execute(
+                        f"SELECT {columns} FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+                        f"WHERE history_fts MATCH ?{exit_filter} "
+                        "ORDER BY bm25(history_fts, 2.0, 1.0), h.id DESC LIMIT ?",
+                        (query, limit)
+                    ).fetchall()
+                else:
+                    words = re.findall(r"\w+", text.lower())
+                    clause = (" AND " if match_all else " OR ").join(
+                        "(lower(h.input) LIKE ? OR lower(h.command) LIKE ?)" for _ in words
+                    )
+                    params = [f"%{word}%" for word in words for _ in range(2)]
+                    rows = self._db.execute(
+                        f"SELECT {columns} FROM history h WHERE ({clause}){exit_filter} ORDER BY h.id DESC LIMIT ?",
+                        (*params, limit)
+                    ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [dict(zip(HISTORY_COLUMNS, row)) for row in rows]
+
+    def relevant(self, text: str, limit: int = 5, successful_only: bool = False) -> list:
+        """Gets the past commands most related to a request, one record per distinct command.
+
+        Args:
+            text: Request, question or command to relate to
+            limit: Maximum number of records
+            successful_only: Only return commands that exited with 0
+
+        Returns:
+            List of record dictionaries, most relevant first
+        """
+
+        entries = {}
+        for entry in self.search(text, limit * 4, match_all=False, successful_only=successful_only):
+            entries.setdefault(entry["command"], entry)
+        return list(entries.values())[:limit]
+
+    def successful_translations(self, limit: int = 5000) -> list:
+        """Gets distinct natural language requests whose command exited with 0.
+
+        Commands that needed an extra confirmation ('CONFIRM:' prefix) are left out.
+
+        Args:
+            limit: Maximum number of pairs
+
+        Returns:
+            List of (request, command) tuples, most recently used first
+        """
+
+        if self._db is None:
+            return []
+        try:
+            with self._lock:
+                return self._db.execute(
+                    "SELECT input, command FROM history "
+                    "WHERE exit_code = 0 AND input != command AND substr(input, 1, 1) != '!' "
+                    "AND substr(command, 1, 8) != 'CONFIRM:' "
+                    "GROUP BY input, command ORDER BY MAX(id) DESC LIMIT ?",
+                    (limit,)
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def recent(self, limit: int = 20) -> list:
+        """Gets the most recent records, newest first.
+
+        Args:
+            limit: Maximum number of records
+
+        Returns:
+            List of record dictionaries
+        """
+
+        if self._db is None:
+            return []
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT {', '.join(HISTORY_COLUMNS)} FROM history ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [dict(zip(HISTORY_COLUMNS, row)) for row in rows]
+
+    def clear(self):
+        """Deletes all records."""
+
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM history")
+                if self.has_fts:
+                    self._db.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Closes the database; the store then behaves as if it could not be opened."""
+
+        if self._db is None:
+            return
+        with self._lock:
+            db, self._db = self._db, None
+            db.close()
+
+def format_history_entry(entry: dict, details: bool = True) -> str:
+    """Formats one history record as a single line.
+
+    Args:
+        entry: Record dictionary
+        details: Include the time, working directory and duration
+
+    Returns:
+        Formatted line
+    """
+
+    status = "?" if entry["exit_code"] is None else entry["exit_code"]
+    line = f"[exit {status}] {entry['input']}"
+    if entry["command"] != entry["input"]:
+        line += f" -> {entry['command']}"
+    if details:
+        when = datetime.fromtimestamp(entry["timestamp"]).strftime("%Y-%m-%d %H:%M")
+        duration = f", {entry['duration_ms']:.0f} ms" if entry["duration_ms"] is not None else ""
+        line = f"{when}  {line}  ({entry['cwd']}{duration})"
+    return line
+
+def handle_history_command(command: str, history: HistoryStore) -> str:
+    """Processes history commands.
+
+    Args:
+        command: Full history command string
+        history: HistoryStore instance, or None if history is disabled
+
+    Returns:
+        Command execution result message
+    """
+
+    if history is None:
+        return f"{text_theme('info')}Command history is disabled (HISTORY=off in the configuration).{reset_format()}"
+    parts = command.split()
+    subcommand = parts[1].lower() if len(parts) > 1 else "list"
+    if subcommand == "search" and len(parts) > 2:
+        start = time.perf_counter()
+        entries = history.search(" ".join(parts[2:]))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not entries:
+            return f"{text_theme('info')}No matching commands ({elapsed_ms:.1f} ms).{reset_format()}"
+        lines = [format_history_entry(entry) for entry in entries]
+        lines.append(f"{text_theme('info')}{len(entries)} matches in {elapsed_ms:.1f} ms{reset_format()}")
+        return "\n".join(lines)
+    if subcommand == "list":
+        limit = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 20
+        entries = history.recent(limit)
+        if not entries:
+            return f"{text_theme('info')}No commands recorded yet.{reset_format()}"
+        return "\n".join(format_history_entry(entry) for entry in reversed(entries))
+    if subcommand == "clear":
+        history.clear()
+        return f"{text_theme('success')}Command history cleared.{reset_format()}"
+    if subcommand == "help":
+        return (
+            "History Commands:\n"
+            "  history search <words> - Find past commands by request or command text\n"
+            "  history list [n] - Show the last n commands (default: 20)\n"
+            "  history clear - Delete the recorded history\n"
+            "  history help - Show this help"
+        )
+    return f"{text_theme('error')}Invalid history command: Use history help for valid commands{reset_format()}"
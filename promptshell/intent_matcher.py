@@ -0,0 +1,224 @@
+"""
+Local intent matching
+---------------------
+Answers common requests ("list files", "show disk usage", "create directory
+build") from OS-specific templates without calling the LLM.
+
+Each intent is a set of phrasings, matched against the whole request, with
+slots for the parts that vary:
+
+    {path}, {source}, {target}   a file or directory (quoted if it has spaces)
+    {pattern}                    a search pattern (quoted if it has spaces)
+    {size}                       a size such as 100M, 2 GB or 500kb
+
+Only requests that match a phrasing completely are answered locally, so
+anything unusual ("list files changed by bob last week") still goes to the
+Command Executor. Slot values are shell-quoted before they are substituted,
+and values that look like options ('-rf') are never accepted.
+
+Example usage:
+    matcher = IntentMatcher("linux")
+    matcher.match("create directory 'my project'")   # -> "mkdir 'my project'"
+    print(matcher.format_stats())
+"""
+
+import re
+import shlex
+import threading
+import time
+
+from typing import Optional
+
+from .format_utils import text_theme, reset_format
+
+_QUOTED = r'"[^"]+"|\'[^\']+\''
+SLOTS = {
+    "path": rf'{_QUOTED}|[^\s"\']+',
+    "source": rf'{_QUOTED}|[^\s"\']+',
+    "target": rf'{_QUOTED}|[^\s"\']+',
+    "pattern": rf'{_QUOTED}|[^\s"\']+',
+    "size": r'\d+\s*(?:[kmgt]i?b?|bytes?|b)?',
+}
+
+# Words that refer to something the request does not name; those need the LLM
+VAGUE_WORDS = {
+    "it", "this", "that", "them", "these", "those", "here", "there", "everything", "all", "something",
+    "anything", "file", "files", "folder", "directory", "the", "a", "my",
+}
+
+_POLITE_PREFIX = r"(?:please\s+)?(?:(?:can|could|would) you\s+)?(?:please\s+)?"
+_ARTICLE = r"(?:\s+(?:the|a|an|my))?"
+
+# (name, phrasings, {os: command template or None when the OS has no simple equivalent})
+INTENTS = [
+    ("list_files", [
+        rf"(?:list|show)(?:\s+me)?(?:\s+all)?{_ARTICLE}\s+files(?:\s+here|\s+in{_ARTICLE}\s+(?:current|this)\s+(?:directory|folder))?",
+    ], {"linux": "ls -l", "macos": "ls -lG", "windows": "dir"}),
+    ("list_files_in", [
+        rf"(?:list|show)(?:\s+me)?(?:\s+all)?{_ARTICLE}\s+files\s+(?:in|inside)\s+{{path}}",
+        rf"list{_ARTICLE}\s+contents\s+of\s+{{path}}",
+    ], {"linux": "ls -l {path}", "macos": "ls -lG {path}", "windows": "dir {path}"}),
+    ("list_hidden_files", [
+        rf"(?:list|show)(?:\s+me)?(?:\s+all)?{_ARTICLE}\s+(?:hidden\s+files|files\s+including\s+hidden(?:\s+ones)?)",
+    ], {"linux": "ls -la", "macos": "ls -laG", "windows": "dir /a"}),
+    ("current_directory", [
+        rf"(?:show|print|display|what\s+is|what's)(?:\s+me)?{_ARTICLE}\s+(?:current|present|working)(?:\s+working)?\s+(?:directory|folder|path)",
+        r"where\s+am\s+i",
+    ], {"linux": "pwd", "macos": "pwd", "windows": "cd"}),
+    ("disk_usage", [
+        rf"(?:(?:show|check|display)(?:\s+me)?{_ARTICLE}\s+)?(?:disk\s+usage|disk\s+space|free\s+(?:disk\s+)?space)",
+    ], {"linux": "df -h", "macos": "df -h", "windows": "wmic logicaldisk get caption,freespace,size"}),
+    ("directory_size", [
+        rf"(?:(?:show|check|display)(?:\s+me)?{_ARTICLE}\s+)?(?:disk\s+usage|size)\s+of\s+{{path}}",
+    ], {"linux": "du -sh {path}", "macos": "du -sh {path}", "windows": None}),
+    ("create_directory", [
+        rf"(?:create|make)(?:\s+a)?(?:\s+new)?\s+(?:directory|folder|dir)(?:\s+(?:named|called))?\s+{{path}}",
+        r"mkdir\s+{path}",
+    ], {"linux": "mkdir {path}", "macos": "mkdir {path}", "windows": "mkdir {path}"}),
+    ("delete_file", [
+        rf"(?:delete|remove){_ARTICLE}\s+file(?:\s+(?:named|called))?\s+{{path}}",
+    ], {"linux": "CONFIRM: rm {path}", "macos": "CONFIRM: rm {path}", "windows": "CONFIRM: del {path}"}),
+    ("copy_file", [
+        rf"copy{_ARTICLE}(?:\s+file)?\s+{{source}}\s+(?:to|into)\s+{{target}}",
+    ], {"linux": "cp {source} {target}", "macos": "cp {source} {target}", "windows": "copy {source} {target}"}),
+    ("move_file", [
+        rf"(?:move|rename){_ARTICLE}(?:\s+file)?\s+{{source}}\s+(?:to|into|as)\s+{{target}}",
+    ], {"linux": "mv {source} {target}", "macos": "mv {source} {target}", "windows": "move {source} {target}"}),
+    ("search_text", [
+        r"(?:search|grep|look)(?:\s+for)?\s+{pattern}\s+in\s+{path}",
+        r"find\s+(?:the\s+)?(?:text|string|word)\s+{pattern}\s+in\s+{path}",
+    ], {"linux": "grep -rn {pattern} {path}", "macos": "grep -rn {pattern} {path}", "windows": "findstr /s /n {pattern} {path}"}),
+    ("large_files", [
+        r"(?:find|list|show)(?:\s+all)?\s+files\s+(?:larger|bigger|over)\s+(?:than\s+)?{size}",
+    ], {"linux": "find . -type f -size +{size}", "macos": "find . -type f -size +{size}", "windows": None}),
+    ("show_file", [
+        rf"(?:show|print|display|read)(?:\s+me)?{_ARTICLE}\s+(?:contents?|content)\s+of{_ARTICLE}(?:\s+file)?\s+{{path}}",
+        rf"(?:show|print|display)(?:\s+me)?{_ARTICLE}\s+file\s+{{path}}",
+    ], {"linux": "cat {path}", "macos": "cat {path}", "windows": "type {path}"}),
+    ("list_processes", [
+        rf"(?:list|show)(?:\s+me)?(?:\s+all)?{_ARTICLE}\s+(?:running\s+)?processes",
+    ], {"linux": "ps aux", "macos": "ps aux", "windows": "tasklist"}),
+    ("memory_usage", [
+        rf"(?:(?:show|check|display)(?:\s+me)?{_ARTICLE}\s+)?(?:memory|ram)\s+usage",
+    ], {"linux": "free -h", "macos": "vm_stat", "windows": None}),
+    ("current_user", [
+        r"who\s+am\s+i",
+        r"(?:show|print|what\s+is|what's)(?:\s+my)?\s+(?:user\s*name|current\s+user)",
+    ], {"linux": "whoami", "macos": "whoami", "windows": "whoami"}),
+    ("current_date", [
+        rf"(?:show|print|what\s+is|what's){_ARTICLE}(?:\s+current)?\s+(?:date|time|date\s+and\s+time)",
+    ], {"linux": "date", "macos": "date", "windows": "echo %date% %time%"}),
+]
+
+def compile_phrasing(phrasing: str) -> re.Pattern:
+    """Compiles a phrasing, turning {slot} placeholders into named groups."""
+
+    regex = re.sub(r"\{(\w+)\}", lambda m: f"(?P<{m.group(1)}>{SLOTS[m.group(1)]})", phrasing)
+    return re.compile(rf"{_POLITE_PREFIX}{regex}", re.IGNORECASE)
+
+def find_size(value: str) -> Optional[str]:
+    """Converts a size such as '100 MB' or '2g' to find's -size syntax ('100M', '2G')."""
+
+    match = re.fullmatch(r"(\d+)\s*([kmgt]?)(?:i?b|bytes?)?", value.strip().lower())
+    if not match:
+        return None
+    number, unit = match.groups()
+    if unit == "t":
+        return f"{int(number) * 1024}G"
+    return number + {"": "c", "k": "k", "m": "M", "g": "G"}[unit]
+
+def quote_argument(value: str, os_name: str) -> str:
+    """Quotes a path or pattern for the target shell."""
+
+    if os_name == "windows":
+        return f'"{value}"' if re.search(r'[\s&|<>^()]', value) else value
+    return shlex.quote(value)
+
+class IntentMatcher:
+    def __init__(self, os_name: str, intents: list = None):
+        """Translates common requests locally for one operating system.
+
+        Args:
+            os_name: 'linux', 'macos' or 'windows' (see get_current_os)
+            intents: (name, phrasings, commands) entries (default: INTENTS)
+        """
+
+        self.os_name = os_name
+        self._intents = []
+        for name, phrasings, commands in intents or INTENTS:
+            template = commands.get(os_name)
+            if template:
+                self._intents.append((name, [compile_phrasing(p) for p in phrasings], template))
+        self.lookups = 0
+        self.hits = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def match(self, user_input: str) -> Optional[str]:
+        """Translates a request if it matches a known intent completely.
+
+        Args:
+            user_input: User's natural language request
+
+        Returns:
+            Shell command, or None if the request needs the LLM
+        """
+
+        start = time.perf_counter()
+        command = self._translate(user_input.strip().rstrip(" .!?"))
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.lookups += 1
+            if command is None:
+                self.miss_seconds += elapsed
+            else:
+                self.hits += 1
+                self.hit_seconds += elapsed
+        return command
+
+    def _translate(self, text: str) -> Optional[str]:
+        for _, patterns, template in self._intents:
+            for pattern in patterns:
+                match = pattern.fullmatch(text)
+                if match:
+                    slots = self._fill_slots(match.groupdict())
+                    if slots is not None:
+                        return template.format(**slots)
+        return None
+
+    def _fill_slots(self, values: dict) -> Optional[dict]:
+        slots = {}
+        for name, value in values.items():
+            if name == "size":
+                size = find_size(value)
+                if size is None:
+                    return None
+                slots[name] = size
+                continue
+            quoted = value[0] in "\"'"
+            value = value[1:-1] if quoted else value
+            if not value.strip() or value.startswith("-") or (not quoted and value.lower() in VAGUE_WORDS):
+                return None
+            slots[name] = quote_argument(value, self.os_name)
+        return slots
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def format_stats(self) -> str:
+        """Formats the session's hit rate and matching latency.
+
+        Returns:
+            Printable report
+        """
+
+        misses = self.lookups - self.hits
+        hit_us = self.hit_seconds / self.hits * 1e6 if self.hits else 0.0
+        miss_us = self.miss_seconds / misses * 1e6 if misses else 0.0
+        return (
+            "\n" + text_theme('section_header', bold=True) + "[Local translations]" + reset_format() + "\n"
+            f"Answered without AI: {self.hits}/{self.lookups} ({self.hit_rate:.0%}), "
+            f"avg match time {hit_us:.0f}µs on hits, {miss_us:.0f}µs on misses"
+        )
@@ -6,10 +6,13 @@ from .readline_setup import setup_readline
 from .ansi_support import enable_ansi_support
 from .ai_terminal_assistant import AITerminalAssistant
 from .format_utils import text_theme, reset_format, get_terminal_size
-from .setup import setup_wizard, load_config, get_active_model
+from .setup import setup_wizard, load_config, get_active_model, config_changed
 from .alias_manager import handle_alias_command
+from .history_store import handle_history_command
 from .version import get_version
 from .tutorial import start_tutorial
+from . import tracing
+from .usage import format_stats
 
 def main():
     """Main entry point for the terminal assistant."""
@@ -19,6 +22,10 @@ def main():
         print(f"PromptShell v{get_version()}")
         return
 
+    if "--batch" in sys.argv[1:]:
+        from .batch import batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+
     config = load_config()
     if not config:
         print("First-time setup required!")
@@ -26,10 +33,16 @@ def main():
         config = load_config()
 
     enable_ansi_support()
-    setup_readline()
     model_name = get_active_model()
+    profile = "--profile" in sys.argv[1:]
+    tracing.configure(profile=profile, trace_file=config.get("TRACE_FILE"))
 
-    assistant = AITerminalAssistant(config=config, model_name=model_name)
+    assistant = AITerminalAssistant(config=config, model_name=model_name, stream_output=True)
+    # Sources are looked up through 'assistant' on every Tab, so they follow --config reloads
+    setup_readline(command_sources=[
+        lambda: assistant.alias_manager.aliases,
+        lambda: assistant.executable_index.commands(),
+    ])
 
     print(f"""\n{text_theme('prompt', bold=True)}Welcome to the AI-Powered Terminal Assistant!
 Active provider: ({model_name} - {platform.system()})
@@ -44,6 +57,14 @@ Type '--help' for assistance and '--config' for settings.{reset_format()}""")
             if len(prompt) + len(user_input) > columns:
                 print()  # Move to the next line if input is too long
 
+            if config_changed():
+                # The config file was edited while the REPL was running
+                config = load_config()
+                model_name = get_active_model()
+                tracing.configure(profile=profile, trace_file=config.get("TRACE_FILE"))
+                assistant.reload_config(config, model_name)
+                print(f"{text_theme('info', bold=True)}Configuration file changed, settings reloaded ({model_name}).{reset_format()}")
+
             if user_input.lower() in  ('quit', 'exit'):
                 print(text_theme('info', bold=True) + "\nTerminating..." + reset_format())
                 break
@@ -52,10 +73,24 @@ Type '--help' for assistance and '--config' for settings.{reset_format()}""")
                 setup_wizard()
                 config = load_config()
                 model_name = get_active_model()
-                assistant = AITerminalAssistant(config=config, model_name=model_name)
+                tracing.configure(profile=profile, trace_file=config.get("TRACE_FILE"))
+                assistant.reload_config(config, model_name)
                 print(f"{text_theme('info', bold=True)}Configuration updated!{reset_format()}")
                 continue
 
+            if user_input.lower() == "--profile":
+                profile = not profile
+                tracing.configure(profile=profile, trace_file=config.get("TRACE_FILE"))
+                print(f"{text_theme('info', bold=True)}Profiling {'on' if profile else 'off'}.{reset_format()}")
+                continue
+
+            if user_input.lower() == "--stats":
+                nodes = [assistant.command_executor, assistant.error_handler, assistant.debugger, assistant.question_answerer]
+                print(format_stats(definitions={node.name: node.definition for node in nodes}))
+                if assistant.intent_matcher is not None:
+                    print(assistant.intent_matcher.format_stats())
+                continue
+
             if user_input.lower() == "--tutorial":
                 start_tutorial()
                 continue
@@ -72,7 +107,10 @@ Type '--help' for assistance and '--config' for settings.{reset_format()}""")
   {text_theme('prompt')}{'--help':<{col_width}}{reset_format()}Show this help message
   {text_theme('prompt')}{'--tutorial':<{col_width}}{reset_format()}Start the interactive tutorial
   {text_theme('prompt')}{'--config':<{col_width}}{reset_format()}Re-run the setup wizard to change AI provider or model
+  {text_theme('prompt')}{'--profile':<{col_width}}{reset_format()}Toggle the per-request timing breakdown
+  {text_theme('prompt')}{'--stats':<{col_width}}{reset_format()}Show token usage, speed and estimated cost for this session
   {text_theme('prompt')}{'alias':<{col_width}}{reset_format()}Manage command shortcuts (use 'alias help' for details)
+  {text_theme('prompt')}{'history':<{col_width}}{reset_format()}Search past commands, e.g. history search docker (use 'history help' for details)
   {text_theme('prompt')}{'clear / cls':<{col_width}}{reset_format()}Clear the terminal screen
   {text_theme('prompt')}{'exit / quit':<{col_width}}{reset_format()}Terminate the assistant
 
@@ -87,7 +125,13 @@ Type '--help' for assistance and '--config' for settings.{reset_format()}""")
                 print(result)
                 continue
 
-            result = assistant.execute_command(user_input)
+            words = user_input.lower().split()
+            if words and words[0] == "history" and (len(words) == 1 or words[1] in ("search", "list", "clear", "help")):
+                print(handle_history_command(user_input, assistant.history))
+                continue
+
+            with tracing.span("request", input=user_input):
+                result = assistant.execute_command(user_input)
             print(result)
 
         except KeyboardInterrupt:
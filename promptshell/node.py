@@ -1,17 +1,17 @@
-import requests
-import json
-import anthropic
-import google.generativeai as genai
-
-from openai import OpenAI
-from groq import Groq
-from typing import List, Tuple
+import asyncio
+import textwrap
+import time
 
 from .setup import get_provider
-from .spinner_progress_utils import spinner, progress_bar
+from .providers import Prompt, get_backend
+from .context_store import ContextStore
+from .tracing import span, record_span
+from .usage import CallMeter
+from .hedging import HedgedBackend, hedge_settings
+from .resilience import ProviderError, call_with_retries, acall_with_retries, stream_with_retries
 
 class Node:
-    def __init__(self, model_name: str, name: str, max_tokens: int = 8192, config: dict = None):
+    def __init__(self, model_name: str, name: str, max_tokens: int = 8192, config: dict = None, context_tokens: int = 2000):
         """Initializes an AI node.
         
         Args:
@@ -19,257 +19,204 @@ class Node:
             name: Node role name
             max_tokens: Response token limit (default: 8192)
             config: Configuration dictionary (default: None)
+            context_tokens: Token budget for the conversation history (default: 2000)
         """
         
         self.model_name = model_name
         self.name = name
         self.definition = ""
-        self.context = []
+        self.context = ContextStore(token_budget=context_tokens)
         self.max_tokens = max_tokens
         self.config = config or {}
         self.provider = get_provider()
 
-    def __call__(self, input_text: str, additional_data: dict = None):
+    def __call__(self, input_text: str, additional_data: dict = None, stream: bool = False):
         """Processes input through the AI node.
         
         Args:
             input_text: Input prompt
             additional_data: Supplementary context (optional)
-            
+            stream: Yield response chunks as they arrive (default: False)
+        
         Returns:
-            AI-generated response
+            AI-generated response, or a generator of response chunks when streaming
+
+        Raises:
+            ProviderError: If the provider failed, even after retries
         """
-        
-        try:
-            context_str = "\n".join([f"{msg['role']} {msg['content']}" for msg in self.context])
-            prompt = f""" system {self.definition} 
-{context_str}
-user {input_text} """
-            if additional_data:
-                prompt += "\n system Additional data:\n"
-                for key, value in additional_data.items():
-                    prompt += f"{key}: {value}\n"
-                prompt += " "
-            prompt += "\n assistant "
 
-            if self.provider == "ollama":
-                response = self._call_ollama(prompt)
-            elif self.provider == "openai":
-                response = self._call_openai(prompt)
-            elif self.provider == "anthropic":
-                response = self._call_anthropic(prompt)
-            elif self.provider == "google":
-                response = self._call_google(prompt)
-            elif self.provider == "groq":
-                response = self._call_groq(prompt)
-            elif self.provider == "fireworks":
-                response = self._call_fireworks(prompt)
-            elif self.provider == "openrouter":
-                response = self._call_openrouter(prompt)
-            elif self.provider == "deepseek":
-                response = self._call_deepseek(prompt)
-            else:
-                return "Unsupported provider."
+        if stream:
+            return self._stream(input_text, additional_data)
+
+        with span("node", role=self.name, provider=self.provider):
+            with span("build_prompt"):
+                prompt = self.build_prompt(input_text, additional_data)
+            backend = self.get_backend()
+            with span("provider_call", prompt_chars=len(prompt)), CallMeter(self, prompt) as meter:
+                response = call_with_retries(self, lambda: backend.call(self, prompt))
+                meter.output = response
 
             output = response.strip()
-            self.context.append({"role": "user", "content": input_text})
-            self.context.append({"role": "assistant", "content": output})
+            self.remember(input_text, output, additional_data)
             return output
 
-        except Exception as e:
-            return f"Error in processing: {str(e)}"
-
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_ollama(self, prompt: str) -> str:
-        """Calls Ollama API.
+    async def acall(self, input_text: str, additional_data: dict = None, remember: bool = True) -> str:
+        """Processes input through the AI node without blocking the event loop.
         
         Args:
-            prompt: Input prompt
+            input_text: Input prompt
+            additional_data: Supplementary context (optional)
+            remember: Record the exchange in the context (default: True)
             
         Returns:
-            API response
+            AI-generated response
+
+        Raises:
+            ProviderError: If the provider failed, even after retries
         """
-        
-        response = requests.post(
-            'http://localhost:11434/api/generate',
-            json={
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "stop": [" ", " ", " "],
-                    "num_predict": self.max_tokens
-                }
-            }
-        )
-        if response.status_code == 200:
-            return response.json().get("response", "").strip()
-        else:
-            return f"Error in Ollama API call: {response.status_code} - {response.text}"
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_openai(self, prompt: str) -> str:
-        """Calls OpenAI API.
+        with span("node", role=self.name, provider=self.provider):
+            with span("build_prompt"):
+                prompt = self.build_prompt(input_text, additional_data)
+            backend = self.get_backend()
+            if hasattr(backend, "acall"):
+                request = lambda: backend.acall(self, prompt)
+            else:
+                request = lambda: asyncio.to_thread(backend.call, self, prompt)
+            with span("provider_call", prompt_chars=len(prompt)), CallMeter(self, prompt) as meter:
+                response = await acall_with_retries(self, request)
+                meter.output = response
+
+            output = response.strip()
+            if remember:
+                self.remember(input_text, output, additional_data)
+            return output
+
+    def _stream(self, input_text: str, additional_data: dict = None):
+        """Streams a response, recording whatever was received in the context.
         
         Args:
-            prompt: Input prompt
-            
-        Returns:
-            API response
-        """
+            input_text: Input prompt
+            additional_data: Supplementary context (optional)
         
-        api_key = self.config["OPENAI_API_KEY"]
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content.strip()
+        Yields:
+            Response text chunks
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_anthropic(self, prompt: str) -> str:
-        """Calls Anthropic API.
-        
-        Args:
-            prompt: Input prompt
-            
-        Returns:
-            API response
+        Raises:
+            ProviderError: If the provider failed, even after retries
         """
-        
-        api_key = self.config["ANTHROPIC_API_KEY"]
-        client = anthropic.Anthropic(api_key=api_key)
-        response = client.messages.create(
-            model=self.model_name,
-            max_tokens=self.max_tokens,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.content[0].text.strip()
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_google(self, prompt: str) -> str:
-        """Calls Google API.
+        chunks = []
+        failed = False
+        start = time.perf_counter()
+        first_chunk = None
+        meter = None
+        try:
+            prompt = self.build_prompt(input_text, additional_data)
+            backend = self.get_backend()
+            meter = CallMeter(self, prompt)
+            if hasattr(backend, "stream"):
+                chunk_stream = stream_with_retries(self, lambda: backend.stream(self, prompt))
+                for chunk in meter.iterate(chunk_stream):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter()
+                    chunks.append(chunk)
+                    yield chunk
+            else:
+                with meter:
+                    response = call_with_retries(self, lambda: backend.call(self, prompt))
+                chunks.append(response)
+                yield response
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Also runs when the consumer stops early (e.g. after the first line)
+            if chunks and not failed:
+                self.remember(input_text, "".join(chunks).strip(), additional_data)
+                meter.finish("".join(chunks))
+            # The span is recorded afterwards: it cannot stay open across yields
+            ttft_ms = round((first_chunk - start) * 1000, 1) if first_chunk else None
+            record_span("node", start, role=self.name, provider=self.provider, stream=True, ttft_ms=ttft_ms)
+
+    def get_backend(self):
+        """Gets the backend for this node's provider, hedged with a secondary provider if configured.
         
-        Args:
-            prompt: Input prompt
-            
         Returns:
-            API response
+            Backend
+
+        Raises:
+            ProviderError: If the provider is unsupported
         """
-        
-        api_key = self.config["GOOGLE_API_KEY"]
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(self.model_name)
-        response = model.generate_content(prompt)
-        return response.text.strip()
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_groq(self, prompt: str) -> str:
-        """Calls Groq API.
+        backend = get_backend(self.provider, self.config)
+        if backend is None:
+            raise ProviderError(f"Unsupported provider: {self.provider}", self.provider)
+        hedge = hedge_settings(self.config, self.provider, self.model_name)
+        if hedge is None:
+            return backend
+        provider, model, delay = hedge
+        secondary = get_backend(provider, self.config)
+        return HedgedBackend(backend, secondary, provider, model, delay) if secondary else backend
+
+    def build_prompt(self, input_text: str, additional_data: dict = None) -> Prompt:
+        """Builds the prompt sent to the provider.
+        
+        The prompt is the flat prompt text and carries the equivalent chat
+        messages: the static system definition first (cacheable by the
+        provider), then the conversation history, then the new input with
+        its additional data.
         
         Args:
-            prompt: Input prompt
-            
+            input_text: Input prompt
+            additional_data: Supplementary context (optional)
+        
         Returns:
-            API response
+            Prompt
         """
-        
-        api_key = self.config["GROQ_API_KEY"]
-        client = Groq(api_key=api_key)
-        
-        messages = [
-            {
-                "role": "system",
-                "content": "Always respond in valid JSON format using double quotes with a 'command' key."
-            },
-            {
-                "role": "user", 
-                "content": f"{prompt}. Return ONLY a JSON object with a 'command' key."
-            }
-        ]
-        
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            max_tokens=self.max_tokens,
-            response_format={"type": "json_object"},
-        )
-        
-        # Extract and parse the JSON response
-        response_json = json.loads(response.choices[0].message.content.strip())
-        return response_json["command"].strip()
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_fireworks(self, prompt: str) -> str:
-        """Handle API calls for Fireworks AI provider
+        text = f"""{self.prompt_prefix()}{self.context.render()}user {input_text} """
+        user_content = input_text
+        if additional_data:
+            text += "\n system Additional data:\n"
+            user_content += "\n\nAdditional data:\n"
+            for key, value in additional_data.items():
+                text += f"{key}: {value}\n"
+                user_content += f"{key}: {value}\n"
+            text += " "
+        text += "\n assistant "
+        messages = self.system_messages() + list(self.context)
+        messages.append({"role": "user", "content": user_content})
+        return Prompt(text, messages)
+
+    def system_messages(self) -> list:
+        """Gets the static start of every chat (the role definition as a system message).
         
-        Args:
-            prompt: Input prompt
-            
         Returns:
-            API response
+            List with the system message, empty if the role has no definition
         """
-        
-        api_key = self.config["FIREWORKS_API_KEY"]
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.fireworks.ai/inference/v1/accounts/fireworks/models/",
-        )
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=self.max_tokens
-        )
-        return response.choices[0].message.content.strip()
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_openrouter(self, prompt: str) -> str:
-        """Handle API calls for OpenRouter provider
+        definition = textwrap.dedent(self.definition).strip()
+        return [{"role": "system", "content": definition}] if definition else []
+
+    def prompt_prefix(self) -> str:
+        """Gets the static start of every flat prompt (the role definition).
         
-        Args:
-            prompt: Input prompt
-            
         Returns:
-            API response
+            Prompt prefix
         """
 
-        api_key = self.config["OPENROUTER_API_KEY"]
-        client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-            default_headers={
-                "HTTP-Referer": self.config.get("OPENROUTER_REFERER", "https://github.com/your-repo"),
-                "X-Title": self.config.get("OPENROUTER_TITLE", "AI Application"),
-            }
-        )
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=self.max_tokens
-        )
-        return response.choices[0].message.content.strip()
+        return f""" system {self.definition} 
+"""
 
-    @spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
-    def _call_deepseek(self, prompt: str) -> str:
-        """Handle API calls for DeepSeek provider
+    def remember(self, input_text: str, output: str, additional_data: dict = None):
+        """Records a completed exchange in the conversation context.
         
         Args:
-            prompt: Input prompt
-            
-        Returns:
-            API response
+            input_text: Input prompt
+            output: AI-generated response
+            additional_data: Supplementary context sent with the input (optional)
         """
 
-        api_key = self.config["DEEPSEEK_API_KEY"]
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.deepseek.com/v1",
-        )
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=self.max_tokens,
-            temperature=0.3  # Recommended default for DeepSeek
-        )
-        return response.choices[0].message.content.strip()
-
+        self.context.append("user", input_text, additional_data)
+        self.context.append("assistant", output)
@@ -0,0 +1,123 @@
+import codecs
+import subprocess
+import sys
+import threading
+
+from collections import deque
+from typing import Tuple
+
+from .format_utils import text_theme, reset_format
+
+# Characters of each output stream kept in memory for exit handling and debugging
+OUTPUT_TAIL_CHARS = 64 * 1024
+
+class TailBuffer:
+    def __init__(self, max_chars: int = OUTPUT_TAIL_CHARS):
+        """Ring buffer that keeps only the last max_chars characters written to it.
+
+        Args:
+            max_chars: Maximum number of characters retained
+        """
+
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self._chunks = deque()
+        self._size = 0
+
+    def write(self, text: str):
+        """Appends text, dropping the oldest chunks beyond the limit.
+
+        Args:
+            text: Text to append
+        """
+
+        if not text:
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        self.total_chars += len(text)
+        while self._size - len(self._chunks[0]) >= self.max_chars:
+            self._size -= len(self._chunks.popleft())
+
+    @property
+    def truncated(self) -> bool:
+        """Whether output was dropped from the front of the buffer."""
+
+        return self.total_chars > self.max_chars
+
+    def getvalue(self) -> str:
+        """Returns the retained tail (at most max_chars characters)."""
+
+        return "".join(self._chunks)[-self.max_chars:]
+
+def _emit(text: str, sink, tail: TailBuffer, prefix: str, suffix: str):
+    if not text:
+        return
+    tail.write(text)
+    if sink is not None:
+        sink.write(prefix + text + suffix)
+        sink.flush()
+
+def _pump(pipe, sink, tail: TailBuffer, prefix: str = "", suffix: str = ""):
+    """Forwards a process pipe to a terminal stream as data arrives.
+
+    Args:
+        pipe: Binary pipe of the child process
+        sink: Text stream to forward to (sys.stdout/sys.stderr), or None to only collect
+        tail: Buffer collecting the end of the output
+        prefix: Text written before each chunk (e.g. a color code)
+        suffix: Text written after each chunk (e.g. a reset code)
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    read = getattr(pipe, "read1", pipe.read)
+    try:
+        while True:
+            data = read(8192)
+            if not data:
+                break
+            _emit(decoder.decode(data), sink, tail, prefix, suffix)
+        _emit(decoder.decode(b"", final=True), sink, tail, prefix, suffix)
+    except (OSError, ValueError):
+        pass  # Pipe closed underneath us (e.g. process killed)
+    finally:
+        pipe.close()
+
+def run_with_live_output(args, shell: bool = False, max_chars: int = OUTPUT_TAIL_CHARS, forward: bool = True) -> Tuple[str, str, int]:
+    """Runs a command, forwarding stdout and stderr live while keeping only their tails.
+
+    Args:
+        args: Command string (shell=True) or argument list
+        shell: Run through the system shell (default: False)
+        max_chars: Characters of each stream kept in memory
+        forward: Write the output to the terminal as it arrives (default: True)
+
+    Returns:
+        Tuple containing stdout tail, stderr tail, and exit code
+    """
+
+    stdout_tail = TailBuffer(max_chars)
+    stderr_tail = TailBuffer(max_chars)
+    proc = subprocess.Popen(args, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, sys.stdout if forward else None, stdout_tail), daemon=True),
+        threading.Thread(
+            target=_pump, args=(proc.stderr, sys.stderr if forward else None, stderr_tail, text_theme('error'), reset_format()), daemon=True
+        ),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        exit_code = proc.wait()
+    except KeyboardInterrupt:
+        # Stop the command, not the assistant
+        proc.terminate()
+        try:
+            exit_code = proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            exit_code = proc.wait()
+        print(text_theme('warning') + "\nCommand interrupted." + reset_format())
+    for reader in readers:
+        reader.join()
+    return stdout_tail.getvalue(), stderr_tail.getvalue(), exit_code
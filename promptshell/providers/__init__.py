@@ -0,0 +1,269 @@
+"""
+Provider backends for Node
+--------------------------
+Each AI provider lives in its own module and is imported only when it is
+selected, so launching PromptShell never pays for SDKs it does not use.
+
+Every backend module exposes:
+    call(node, prompt) -> str
+
+and may also expose a generator yielding response chunks as they arrive,
+and a coroutine built on the provider's async HTTP client:
+    stream(node, prompt) -> Iterator[str]
+    async acall(node, prompt) -> str
+
+Local providers may also expose a startup hook, run in the background while
+the user types the first request:
+    warm_up(nodes) -> None
+
+The prompt built by Node is a Prompt: the flat prompt text, which also
+carries the system/user/assistant messages it was built from. Chat APIs are
+sent chat_messages(prompt), whose first message is the role's static system
+definition, so provider-side prompt caching can reuse it across calls.
+
+Backends obtain their SDK clients through get_client(), so all Nodes share
+one long-lived, connection-pooled client per provider and base URL.
+
+Backends raise on failure rather than returning error text, pass the
+timeouts from resilience.request_timeouts() to every request, and leave
+retrying to Node (SDK clients are built with max_retries=0).
+"""
+
+import asyncio
+import importlib
+import inspect
+import threading
+import weakref
+
+from ..usage import report_usage
+
+# Maps provider names (as returned by setup.get_provider) to backend modules
+PROVIDER_MODULES = {
+    "ollama": "ollama_provider",
+    "openai": "openai_provider",
+    "anthropic": "anthropic_provider",
+    "google": "google_provider",
+    "groq": "groq_provider",
+    "fireworks": "fireworks_provider",
+    "openrouter": "openrouter_provider",
+    "deepseek": "deepseek_provider",
+    # Serves responses recorded in a cassette (CASSETTE_MODE=replay)
+    "replay": "replay_provider",
+}
+
+def get_backend(provider: str, config: dict = None):
+    """Imports and returns the backend module for a provider.
+    
+    With CASSETTE_MODE=record in the configuration, the backend is wrapped
+    so every exchange is also saved to the cassette.
+    
+    Args:
+        provider: Provider name
+        config: Configuration dictionary (optional)
+        
+    Returns:
+        Backend module, or None if the provider is unsupported
+    """
+
+    module_name = PROVIDER_MODULES.get(provider)
+    if module_name is None:
+        return None
+    backend = importlib.import_module(f".{module_name}", __name__)
+    if config and provider != "replay":
+        from .cassette import cassette_mode, get_cassette, RecordingBackend
+        if cassette_mode(config) == "record":
+            return RecordingBackend(backend, get_cassette(config), provider)
+    return backend
+
+class Prompt(str):
+    """Flat prompt text that also carries the chat messages it was built from."""
+
+    def __new__(cls, text: str, messages: list):
+        prompt = super().__new__(cls, text)
+        prompt.messages = messages
+        return prompt
+
+def chat_messages(prompt) -> list:
+    """Gets the chat messages for a prompt.
+    
+    Args:
+        prompt: Prompt built by Node, or plain prompt text
+        
+    Returns:
+        List of {"role", "content"} dictionaries (plain text becomes one user message)
+    """
+
+    messages = getattr(prompt, "messages", None)
+    if messages is None:
+        return [{"role": "user", "content": str(prompt)}]
+    return [dict(message) for message in messages]
+
+def split_system(messages: list) -> tuple:
+    """Separates the system instructions from the conversation, for APIs that take them apart.
+    
+    The conversation is made to start with a user turn and to alternate
+    roles, merging consecutive turns of the same role.
+    
+    Args:
+        messages: Chat messages
+        
+    Returns:
+        Tuple (system text, conversation messages)
+    """
+
+    system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    conversation = []
+    for message in messages:
+        if message["role"] == "system" or (not conversation and message["role"] != "user"):
+            continue
+        if conversation and conversation[-1]["role"] == message["role"]:
+            conversation[-1] = {**conversation[-1], "content": conversation[-1]["content"] + "\n\n" + message["content"]}
+        else:
+            conversation.append(dict(message))
+    return system, conversation
+
+# (provider, base_url) -> (credentials, client)
+_clients = {}
+# event loop -> {(provider, base_url): (credentials, async client)}
+_async_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+def get_client(provider: str, base_url: str, credentials, factory):
+    """Returns the shared client for a provider and base URL.
+    
+    The client is built on first use and reused by every Node afterwards.
+    It is rebuilt only when the credentials change (e.g. after --config).
+    
+    Args:
+        provider: Provider name
+        base_url: Endpoint the client talks to
+        credentials: Hashable value identifying the credentials in use
+        factory: Zero-argument callable that builds a new client
+        
+    Returns:
+        Client instance
+    """
+
+    key = (provider, base_url)
+    with _clients_lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[0] == credentials:
+            return entry[1]
+        if entry is not None:
+            _close_client(entry[1])
+        client = factory()
+        _clients[key] = (credentials, client)
+        return client
+
+def get_async_client(provider: str, base_url: str, credentials, factory):
+    """Returns the shared async client for a provider and base URL.
+    
+    Async clients are bound to the event loop they were created on,
+    so one is kept per running loop. Await aclose_clients() before the loop
+    ends to close them; clients of loops that were closed without it are
+    forgotten.
+    
+    Args:
+        provider: Provider name
+        base_url: Endpoint the client talks to
+        credentials: Hashable value identifying the credentials in use
+        factory: Zero-argument callable that builds a new async client
+        
+    Returns:
+        Async client instance
+    """
+
+    loop = asyncio.get_running_loop()
+    key = (provider, base_url)
+    with _clients_lock:
+        for other in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[other]
+        clients = _async_clients.setdefault(loop, {})
+        entry = clients.get(key)
+        if entry is not None and entry[0] == credentials:
+            return entry[1]
+        if entry is not None:
+            loop.create_task(_aclose_client(entry[1]))
+        client = factory()
+        clients[key] = (credentials, client)
+        return client
+
+async def aclose_clients():
+    """Closes and forgets the async clients of the running event loop."""
+
+    with _clients_lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for _, client in clients.values():
+        await _aclose_client(client)
+
+def close_clients():
+    """Closes and forgets every shared client.
+
+    Async clients can only be closed on their own loop (see aclose_clients);
+    here they are just forgotten.
+    """
+
+    with _clients_lock:
+        for _, client in _clients.values():
+            _close_client(client)
+        _clients.clear()
+        _async_clients.clear()
+
+def _close_client(client):
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+async def _aclose_client(client):
+    # httpx clients have aclose(); the provider SDKs' async clients have an async close()
+    close = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if callable(close):
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            pass
+
+def stream_chat_completion(client, **kwargs):
+    """Streams an OpenAI-compatible chat completion.
+    
+    Args:
+        client: OpenAI-compatible SDK client
+        **kwargs: Arguments for chat.completions.create
+        
+    Yields:
+        Response text chunks
+    """
+
+    response = client.chat.completions.create(stream=True, **kwargs)
+    try:
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            report_chat_usage(chunk)  # Usage arrives on the last chunk, if requested
+    finally:
+        response.close()
+
+def report_chat_usage(response):
+    """Reports the usage block of an OpenAI-compatible chat completion, if present.
+    
+    Args:
+        response: Chat completion (or final stream chunk)
+    """
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached is None:
+            cached = getattr(usage, "prompt_cache_hit_tokens", None)  # DeepSeek
+        report_usage(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            generation_seconds=getattr(usage, "completion_time", None),  # Groq only
+            cached_tokens=cached,
+        )
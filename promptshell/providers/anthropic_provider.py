@@ -0,0 +1,85 @@
+import anthropic
+
+from . import get_client, get_async_client, chat_messages, split_system
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+from ..usage import report_usage
+
+def _report(message):
+    usage = getattr(message, "usage", None)
+    if usage is not None:
+        # input_tokens excludes the tokens read from or written to the prompt cache
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        report_usage(
+            prompt_tokens=usage.input_tokens + cache_read + cache_write,
+            completion_tokens=usage.output_tokens,
+            cached_tokens=cache_read,
+        )
+
+def _request(node, prompt) -> dict:
+    system, messages = split_system(chat_messages(prompt))
+    request = {
+        "model": node.model_name,
+        "timeout": http_timeout(node.config),
+        "max_tokens": node.max_tokens,
+        "messages": messages,
+    }
+    if system:
+        # The role definition is the same on every call: mark it for Anthropic's prompt cache
+        request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    return request
+
+def _client(node) -> anthropic.Anthropic:
+    api_key = node.config["ANTHROPIC_API_KEY"]
+    return get_client("anthropic", None, api_key, lambda: anthropic.Anthropic(api_key=api_key, max_retries=0))
+
+def _async_client(node) -> anthropic.AsyncAnthropic:
+    api_key = node.config["ANTHROPIC_API_KEY"]
+    return get_async_client("anthropic", None, api_key, lambda: anthropic.AsyncAnthropic(api_key=api_key, max_retries=0))
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Calls Anthropic API.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    response = _client(node).messages.create(**_request(node, prompt))
+    _report(response)
+    return response.content[0].text.strip()
+
+def stream(node, prompt: str):
+    """Streams an Anthropic API response.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    with _client(node).messages.stream(**_request(node, prompt)) as response:
+        yield from response.text_stream
+        _report(response.get_final_message())
+
+async def acall(node, prompt: str) -> str:
+    """Calls Anthropic API asynchronously.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = await _async_client(node).messages.create(**_request(node, prompt))
+    _report(response)
+    return response.content[0].text.strip()
@@ -0,0 +1,205 @@
+"""
+Record/replay cassettes
+-----------------------
+A cassette is a JSON Lines file of provider exchanges. Each line holds the
+Node role, the exact prompt, the response, and when each chunk arrived:
+
+    {"key": "...", "role": "Command Executor", "provider": "ollama",
+     "model": "llama3", "prompt": "...", "response": "ls -la",
+     "chunks": [[0.412, "ls"], [0.455, " -la"]], "recorded_at": 1718000000.0}
+
+With CASSETTE_MODE=record, every call to the real provider is appended to
+the cassette. With CASSETTE_MODE=replay, the "replay" backend serves the
+responses back without any network access, either instantly or paced like
+the recording (REPLAY_LATENCY=instant/recorded).
+
+Replay only serves recordings of the exact prompt. With REPLAY_FALLBACK=on,
+a prompt that was never recorded gets the role's recordings in order
+instead (useful to replay a session on another machine); such responses
+are announced, since they answer a different request.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ..setup import CONFIG_DIR
+
+DEFAULT_CASSETTE = os.path.join(CONFIG_DIR, "cassette.jsonl")
+
+def cassette_mode(config: dict) -> str:
+    """Gets the record/replay mode ('off', 'record' or 'replay')."""
+
+    mode = str(config.get("CASSETTE_MODE", "")).strip().lower()
+    return mode if mode in ("record", "replay") else "off"
+
+def replay_fallback(config: dict) -> bool:
+    """Whether unrecorded prompts are served the role's recordings in order (REPLAY_FALLBACK)."""
+
+    return str(config.get("REPLAY_FALLBACK", "")).strip().lower() in ("on", "true", "1", "yes")
+
+def cassette_path(config: dict) -> str:
+    return os.path.expanduser(str(config.get("CASSETTE_FILE", "")).strip() or DEFAULT_CASSETTE)
+
+def exchange_key(role: str, prompt: str) -> str:
+    """Identifies an exchange by the role and the exact prompt sent."""
+
+    return hashlib.sha1(f"{role}\0{prompt}".encode("utf-8")).hexdigest()
+
+class Cassette:
+    def __init__(self, path: str):
+        """Recorded provider exchanges backed by a JSON Lines file.
+
+        Args:
+            path: Cassette file
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_key = None
+        self._by_role = None
+        self._served = {}
+
+    def _load(self):
+        self._by_key, self._by_role = {}, {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Partially written line
+                    self._index(entry)
+        except OSError:
+            pass
+
+    def _index(self, entry: dict):
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_role.setdefault(entry.get("role", ""), []).append(entry)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._by_key is None:
+                self._load()
+            return sum(len(entries) for entries in self._by_key.values())
+
+    def record(self, node, prompt: str, chunks: list, provider: str = None):
+        """Appends an exchange to the cassette.
+
+        Args:
+            node: Node that made the call
+            prompt: Prompt sent to the provider
+            chunks: List of (seconds since the request, text) pairs
+            provider: Provider that answered
+        """
+
+        entry = {
+            "key": exchange_key(node.name, prompt),
+            "role": node.name,
+            "provider": provider or node.provider,
+            "model": node.model_name,
+            "prompt": prompt,
+            "response": "".join(text for _, text in chunks),
+            "chunks": [[round(offset, 4), text] for offset, text in chunks],
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            if self._by_key is not None:
+                self._index(entry)
+
+    def lookup(self, role: str, prompt: str, fallback: bool = False) -> dict:
+        """Finds the recorded exchange for a call.
+
+        Repeated prompts are served in recording order.
+
+        Args:
+            role: Node role name
+            prompt: Prompt about to be sent
+            fallback: When the prompt was never recorded (e.g. it mentions a
+                different directory), serve the role's recordings in order
+
+        Returns:
+            Recorded entry; a fallback entry is a copy with "fallback": True
+
+        Raises:
+            LookupError: If the prompt was not recorded (or, with fallback, nothing was recorded for the role)
+        """
+
+        with self._lock:
+            if self._by_key is None:
+                self._load()
+            key = exchange_key(role, prompt)
+            entries = self._by_key.get(key)
+            if entries:
+                served = self._served.get(key, 0)
+                self._served[key] = served + 1
+                return entries[served % len(entries)]
+            entries = self._by_role.get(role) if fallback else None
+            if not entries:
+                raise LookupError(f"No recorded response for this {role} prompt in {self.path}")
+            key = ("role", role)
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return {**entries[served % len(entries)], "fallback": True}
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+def get_cassette(config: dict) -> Cassette:
+    """Gets the shared cassette for the configured file."""
+
+    path = cassette_path(config)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+class RecordingBackend:
+    def __init__(self, backend, cassette: Cassette, provider: str):
+        """Wraps a provider backend and records every exchange it makes.
+
+        Exposes the same call/stream/acall functions as the wrapped backend.
+
+        Args:
+            backend: Provider backend module
+            cassette: Cassette to append to
+            provider: Provider name of the wrapped backend
+        """
+
+        self.backend = backend
+        self.cassette = cassette
+        self.provider = provider
+        if hasattr(backend, "stream"):
+            self.stream = self._stream
+        if hasattr(backend, "acall"):
+            self.acall = self._acall
+
+    def call(self, node, prompt: str) -> str:
+        start = time.perf_counter()
+        response = self.backend.call(node, prompt)
+        self.cassette.record(node, prompt, [(time.perf_counter() - start, response)], self.provider)
+        return response
+
+    def _stream(self, node, prompt: str):
+        start = time.perf_counter()
+        chunks = []
+        try:
+            for chunk in self.backend.stream(node, prompt):
+                chunks.append((time.perf_counter() - start, chunk))
+                yield chunk
+        finally:
+            # Also records when the consumer stops early (e.g. after the first line)
+            if chunks:
+                self.cassette.record(node, prompt, chunks, self.provider)
+
+    async def _acall(self, node, prompt: str) -> str:
+        start = time.perf_counter()
+        response = await self.backend.acall(node, prompt)
+        self.cassette.record(node, prompt, [(time.perf_counter() - start, response)], self.provider)
+        return response
@@ -0,0 +1,78 @@
+from openai import AsyncOpenAI, OpenAI
+
+from . import get_client, get_async_client, chat_messages, stream_chat_completion, report_chat_usage
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+
+BASE_URL = "https://api.deepseek.com/v1"
+
+def _client(node) -> OpenAI:
+    api_key = node.config["DEEPSEEK_API_KEY"]
+    return get_client("deepseek", BASE_URL, api_key, lambda: OpenAI(api_key=api_key, base_url=BASE_URL, max_retries=0))
+
+def _async_client(node) -> AsyncOpenAI:
+    api_key = node.config["DEEPSEEK_API_KEY"]
+    return get_async_client("deepseek", BASE_URL, api_key, lambda: AsyncOpenAI(api_key=api_key, base_url=BASE_URL, max_retries=0))
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Handle API calls for DeepSeek provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = _client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens,
+        temperature=0.3  # Recommended default for DeepSeek
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
+
+def stream(node, prompt: str):
+    """Stream API responses from DeepSeek provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    yield from stream_chat_completion(
+        _client(node),
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens,
+        temperature=0.3
+    )
+
+async def acall(node, prompt: str) -> str:
+    """Handle async API calls for DeepSeek provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = await _async_client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens,
+        temperature=0.3
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
@@ -0,0 +1,75 @@
+from openai import AsyncOpenAI, OpenAI
+
+from . import get_client, get_async_client, chat_messages, stream_chat_completion, report_chat_usage
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+
+BASE_URL = "https://api.fireworks.ai/inference/v1/accounts/fireworks/models/"
+
+def _client(node) -> OpenAI:
+    api_key = node.config["FIREWORKS_API_KEY"]
+    return get_client("fireworks", BASE_URL, api_key, lambda: OpenAI(api_key=api_key, base_url=BASE_URL, max_retries=0))
+
+def _async_client(node) -> AsyncOpenAI:
+    api_key = node.config["FIREWORKS_API_KEY"]
+    return get_async_client("fireworks", BASE_URL, api_key, lambda: AsyncOpenAI(api_key=api_key, base_url=BASE_URL, max_retries=0))
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Handle API calls for Fireworks AI provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    response = _client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
+
+def stream(node, prompt: str):
+    """Stream API responses from Fireworks AI provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    yield from stream_chat_completion(
+        _client(node),
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+
+async def acall(node, prompt: str) -> str:
+    """Handle async API calls for Fireworks AI provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = await _async_client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
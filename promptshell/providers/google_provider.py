@@ -0,0 +1,90 @@
+import google.generativeai as genai
+
+from . import get_client, chat_messages, split_system
+from ..resilience import request_timeouts
+from ..spinner_progress_utils import spinner
+from ..usage import report_usage
+
+def _report(response):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None and getattr(usage, "total_token_count", 0):
+        report_usage(
+            prompt_tokens=usage.prompt_token_count,
+            completion_tokens=usage.candidates_token_count,
+            cached_tokens=getattr(usage, "cached_content_token_count", None),
+        )
+
+def _make_model(api_key: str, model_name: str, system: str):
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name, system_instruction=system or None)
+
+def _request_options(node) -> dict:
+    return {"timeout": request_timeouts(node.config)[1]}
+
+def _model(node, system: str):
+    api_key = node.config["GOOGLE_API_KEY"]
+    # genai keeps its transport globally, so the model object is what we pool,
+    # one per role definition (Gemini takes the system instruction at construction)
+    return get_client(
+        "google", (node.model_name, system), api_key, lambda: _make_model(api_key, node.model_name, system)
+    )
+
+def _contents(prompt) -> tuple:
+    """Gets the system instruction and the conversation in Gemini's format."""
+
+    system, messages = split_system(chat_messages(prompt))
+    contents = [
+        {"role": "model" if m["role"] == "assistant" else "user", "parts": [m["content"]]}
+        for m in messages
+    ]
+    return system, contents
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Calls Google API.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    system, contents = _contents(prompt)
+    response = _model(node, system).generate_content(contents, request_options=_request_options(node))
+    _report(response)
+    return response.text.strip()
+
+def stream(node, prompt: str):
+    """Streams a Google API response.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    system, contents = _contents(prompt)
+    for chunk in _model(node, system).generate_content(contents, stream=True, request_options=_request_options(node)):
+        if chunk.text:
+            yield chunk.text
+        _report(chunk)  # Counts are cumulative; the last chunk has the totals
+
+async def acall(node, prompt: str) -> str:
+    """Calls Google API asynchronously.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    system, contents = _contents(prompt)
+    response = await _model(node, system).generate_content_async(contents, request_options=_request_options(node))
+    _report(response)
+    return response.text.strip()
@@ -0,0 +1,71 @@
+import json
+
+from groq import AsyncGroq, Groq
+
+from . import get_client, get_async_client, chat_messages, report_chat_usage
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+
+# Groq is called in JSON mode, which cannot be streamed meaningfully,
+# so this backend has no stream() and Node falls back to call().
+
+def _messages(prompt) -> list:
+    messages = chat_messages(prompt)
+    # Static instructions first, so the start of every request is the same
+    messages.insert(0, {
+        "role": "system",
+        "content": "Always respond in valid JSON format using double quotes with a 'command' key."
+    })
+    messages[-1]["content"] += ". Return ONLY a JSON object with a 'command' key."
+    return messages
+
+def _parse(response) -> str:
+    report_chat_usage(response)
+    # Extract and parse the JSON response
+    response_json = json.loads(response.choices[0].message.content.strip())
+    return response_json["command"].strip()
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Calls Groq API.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    api_key = node.config["GROQ_API_KEY"]
+    client = get_client("groq", None, api_key, lambda: Groq(api_key=api_key, max_retries=0))
+    response = client.chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=_messages(prompt),
+        max_tokens=node.max_tokens,
+        response_format={"type": "json_object"},
+    )
+    return _parse(response)
+
+async def acall(node, prompt: str) -> str:
+    """Calls Groq API asynchronously.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    api_key = node.config["GROQ_API_KEY"]
+    client = get_async_client("groq", None, api_key, lambda: AsyncGroq(api_key=api_key, max_retries=0))
+    response = await client.chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=_messages(prompt),
+        max_tokens=node.max_tokens,
+        response_format={"type": "json_object"},
+    )
+    return _parse(response)
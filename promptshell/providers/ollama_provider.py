@@ -0,0 +1,194 @@
+import json
+import httpx
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from . import get_client, get_async_client, chat_messages
+from ..resilience import ProviderHTTPError, http_timeout, request_timeouts
+from ..spinner_progress_utils import spinner
+from ..usage import report_usage
+
+DEFAULT_HOST = "http://localhost:11434"
+# How long Ollama keeps the model loaded after a request (Ollama's own default is 5m)
+DEFAULT_KEEP_ALIVE = "30m"
+
+def _make_session() -> requests.Session:
+    """Builds a keep-alive session with a small connection pool."""
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def get_session(config: dict) -> tuple:
+    """Gets the shared Ollama session.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        Tuple (session, host URL)
+    """
+
+    host = (config.get("OLLAMA_HOST") or DEFAULT_HOST).rstrip("/")
+    return get_client("ollama", host, None, _make_session), host
+
+def keep_alive(config: dict):
+    """Gets the keep_alive value sent with every request.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        Duration string such as "30m", or seconds as an int (-1 keeps the model loaded)
+    """
+
+    value = str(config.get("OLLAMA_KEEP_ALIVE", "")).strip() or DEFAULT_KEEP_ALIVE
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def _payload(node, messages: list, stream: bool) -> dict:
+    # The role definition leads every chat, so Ollama's prompt cache can reuse its evaluation
+    return {
+        "model": node.model_name,
+        "messages": messages,
+        "stream": stream,
+        "keep_alive": keep_alive(node.config),
+        "options": {
+            "num_predict": node.max_tokens
+        }
+    }
+
+def _content(data: dict) -> str:
+    return (data.get("message") or {}).get("content", "")
+
+def _report(data: dict):
+    """Reports the token counts and generation time of a finished response."""
+
+    report_usage(
+        prompt_tokens=data.get("prompt_eval_count"),
+        completion_tokens=data.get("eval_count"),
+        generation_seconds=(data.get("eval_duration") or 0) / 1e9,
+    )
+
+def get_async_session(config: dict) -> tuple:
+    """Gets the shared async Ollama client for the running event loop.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        Tuple (httpx.AsyncClient, host URL)
+    """
+
+    host = (config.get("OLLAMA_HOST") or DEFAULT_HOST).rstrip("/")
+    limits = httpx.Limits(max_keepalive_connections=8, max_connections=16)
+    return get_async_client("ollama", host, None, lambda: httpx.AsyncClient(limits=limits, timeout=None)), host
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Calls Ollama API.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    session, host = get_session(node.config)
+    response = session.post(
+        f"{host}/api/chat", json=_payload(node, chat_messages(prompt), stream=False),
+        timeout=request_timeouts(node.config)
+    )
+    if response.status_code != 200:
+        raise ProviderHTTPError(response.status_code, response.text, response.headers)
+    data = response.json()
+    _report(data)
+    return _content(data).strip()
+
+def stream(node, prompt: str):
+    """Streams an Ollama API response.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    session, host = get_session(node.config)
+    with session.post(
+        f"{host}/api/chat", json=_payload(node, chat_messages(prompt), stream=True), stream=True,
+        timeout=request_timeouts(node.config)
+    ) as response:
+        if response.status_code != 200:
+            raise ProviderHTTPError(response.status_code, response.text, response.headers)
+        for line in response.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if _content(data):
+                yield _content(data)
+            if data.get("done"):
+                _report(data)
+                break
+
+async def acall(node, prompt: str) -> str:
+    """Calls Ollama API asynchronously.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    client, host = get_async_session(node.config)
+    response = await client.post(
+        f"{host}/api/chat", json=_payload(node, chat_messages(prompt), stream=False),
+        timeout=http_timeout(node.config)
+    )
+    if response.status_code != 200:
+        raise ProviderHTTPError(response.status_code, response.text, response.headers)
+    data = response.json()
+    _report(data)
+    return _content(data).strip()
+
+def warm_up(nodes: list):
+    """Loads the model and primes Ollama's prompt cache with each role's system message.
+    
+    The first request only loads the model (an empty prompt generates
+    nothing). Then each role's definition is evaluated once: Ollama keeps
+    the KV cache of recent prompts and reuses the longest matching prefix,
+    so later chats, which start with the same system message, skip
+    re-evaluating it. How many prefixes stay cached depends on the server's
+    OLLAMA_NUM_PARALLEL. Failures are ignored; the real request reports them.
+    
+    Args:
+        nodes: Nodes to warm up (all using the same model and configuration)
+    """
+
+    if not nodes:
+        return
+    config = nodes[0].config
+    session, host = get_session(config)
+    timeout = request_timeouts(config)
+    try:
+        load = {"model": nodes[0].model_name, "prompt": "", "stream": False, "keep_alive": keep_alive(config)}
+        session.post(f"{host}/api/generate", json=load, timeout=timeout).raise_for_status()
+        for node in nodes:
+            if not node.system_messages():
+                continue
+            prime = _payload(node, node.system_messages(), stream=False)
+            prime["options"]["num_predict"] = 1
+            session.post(f"{host}/api/chat", json=prime, timeout=timeout).raise_for_status()
+    except requests.RequestException:
+        pass
@@ -0,0 +1,77 @@
+from openai import AsyncOpenAI, OpenAI
+
+from . import get_client, get_async_client, chat_messages, stream_chat_completion, report_chat_usage
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+
+def _base_url(node):
+    # Optional override for OpenAI-compatible servers (proxies, local stand-ins)
+    return node.config.get("OPENAI_BASE_URL") or None
+
+def _client(node) -> OpenAI:
+    api_key = node.config["OPENAI_API_KEY"]
+    base_url = _base_url(node)
+    return get_client("openai", base_url, api_key, lambda: OpenAI(api_key=api_key, base_url=base_url, max_retries=0))
+
+def _async_client(node) -> AsyncOpenAI:
+    api_key = node.config["OPENAI_API_KEY"]
+    base_url = _base_url(node)
+    return get_async_client("openai", base_url, api_key, lambda: AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0))
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Calls OpenAI API.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+    
+    response = _client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt)
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
+
+def stream(node, prompt: str):
+    """Streams an OpenAI API response.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    yield from stream_chat_completion(
+        _client(node),
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        stream_options={"include_usage": True}
+    )
+
+async def acall(node, prompt: str) -> str:
+    """Calls OpenAI API asynchronously.
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = await _async_client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt)
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
@@ -0,0 +1,89 @@
+from openai import AsyncOpenAI, OpenAI
+
+from . import get_client, get_async_client, chat_messages, stream_chat_completion, report_chat_usage
+from ..resilience import http_timeout
+from ..spinner_progress_utils import spinner
+
+BASE_URL = "https://openrouter.ai/api/v1"
+
+def _headers(node) -> dict:
+    return {
+        "HTTP-Referer": node.config.get("OPENROUTER_REFERER", "https://github.com/your-repo"),
+        "X-Title": node.config.get("OPENROUTER_TITLE", "AI Application"),
+    }
+
+def _client(node) -> OpenAI:
+    api_key = node.config["OPENROUTER_API_KEY"]
+    headers = _headers(node)
+    return get_client(
+        "openrouter", BASE_URL, (api_key, tuple(headers.items())),
+        lambda: OpenAI(base_url=BASE_URL, api_key=api_key, default_headers=headers, max_retries=0)
+    )
+
+def _async_client(node) -> AsyncOpenAI:
+    api_key = node.config["OPENROUTER_API_KEY"]
+    headers = _headers(node)
+    return get_async_client(
+        "openrouter", BASE_URL, (api_key, tuple(headers.items())),
+        lambda: AsyncOpenAI(base_url=BASE_URL, api_key=api_key, default_headers=headers, max_retries=0)
+    )
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Handle API calls for OpenRouter provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = _client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
+
+def stream(node, prompt: str):
+    """Stream API responses from OpenRouter provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Yields:
+        Response text chunks
+    """
+
+    yield from stream_chat_completion(
+        _client(node),
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+
+async def acall(node, prompt: str) -> str:
+    """Handle async API calls for OpenRouter provider
+    
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+        
+    Returns:
+        API response
+    """
+
+    response = await _async_client(node).chat.completions.create(
+        model=node.model_name,
+        timeout=http_timeout(node.config),
+        messages=chat_messages(prompt),
+        max_tokens=node.max_tokens
+    )
+    report_chat_usage(response)
+    return response.choices[0].message.content.strip()
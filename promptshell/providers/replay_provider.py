@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from .cassette import get_cassette, replay_fallback
+from ..format_utils import text_theme, reset_format
+from ..spinner_progress_utils import spinner
+
+def _recorded_timing(node) -> bool:
+    return str(node.config.get("REPLAY_LATENCY", "")).strip().lower() == "recorded"
+
+def _lookup(node, prompt: str) -> dict:
+    entry = get_cassette(node.config).lookup(node.name, prompt, fallback=replay_fallback(node.config))
+    if entry.get("fallback"):
+        print(text_theme('warning') + f"[replay] This prompt was not recorded; serving a {node.name} "
+              f"recording made for another prompt: {entry['prompt'].strip()[-80:]!r}" + reset_format())
+    return entry
+
+def _total_latency(entry: dict) -> float:
+    chunks = entry.get("chunks") or [[0.0, entry.get("response", "")]]
+    return chunks[-1][0]
+
+@spinner(spinner_type="random", message=" [magenta]Waiting for API response...")
+def call(node, prompt: str) -> str:
+    """Serves a recorded response.
+
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+
+    Returns:
+        Recorded response
+    """
+
+    entry = _lookup(node, prompt)
+    if _recorded_timing(node):
+        time.sleep(_total_latency(entry))
+    return entry["response"]
+
+def stream(node, prompt: str):
+    """Serves a recorded response chunk by chunk.
+
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+
+    Yields:
+        Recorded response chunks, paced like the recording if configured
+    """
+
+    entry = _lookup(node, prompt)
+    chunks = entry.get("chunks") or [[0.0, entry["response"]]]
+    paced = _recorded_timing(node)
+    start = time.perf_counter()
+    for offset, text in chunks:
+        if paced:
+            delay = offset - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        yield text
+
+async def acall(node, prompt: str) -> str:
+    """Serves a recorded response without blocking the event loop.
+
+    Args:
+        node: Calling Node instance
+        prompt: Input prompt
+
+    Returns:
+        Recorded response
+    """
+
+    entry = _lookup(node, prompt)
+    if _recorded_timing(node):
+        await asyncio.sleep(_total_latency(entry))
+    return entry["response"]
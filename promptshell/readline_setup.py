@@ -1,10 +1,130 @@
 import sys
-import glob
 import os
 import atexit
 
-def setup_readline():
-    """Configures tab completion and history support."""
+class Completer:
+    def __init__(self, readline_module=None, command_sources=None):
+        """Readline completer for paths, aliases and executables.
+        
+        Candidates are computed once per Tab press (state 0) and served from
+        memory for the following states. Directory listings are cached and
+        reused until the directory's mtime changes.
+        
+        Args:
+            readline_module: readline implementation in use (optional)
+            command_sources: Callables returning names to complete at command position
+        """
+
+        self.readline = readline_module
+        self.command_sources = list(command_sources or [])
+        self._matches = []
+        self._dir_cache = {}
+
+    def complete(self, text, state):
+        """readline completer entry point.
+        
+        Args:
+            text: Word being completed
+            state: Index of the requested match
+            
+        Returns:
+            The match for this state, or None when exhausted
+        """
+
+        if state == 0:
+            try:
+                line = self.readline.get_line_buffer() if self.readline else ""
+                begidx = self.readline.get_begidx() if self.readline else 0
+                self._matches = self.candidates(text, line[:begidx])
+            except Exception:
+                self._matches = []
+        return self._matches[state] if state < len(self._matches) else None
+
+    def candidates(self, text, line_before=""):
+        """Computes the completions for a word.
+        
+        Args:
+            text: Word being completed
+            line_before: Input preceding the word
+            
+        Returns:
+            Sorted list of completions
+        """
+
+        prefix = ""
+        if text.startswith("!"):  # Direct execution, e.g. "!gi<Tab>"
+            prefix, text = "!", text[1:]
+        matches = self.path_candidates(text)
+        if not line_before.strip() and "/" not in text and os.sep not in text and not text.startswith(("~", ".")):
+            names = set()
+            for source in self.command_sources:
+                try:
+                    names.update(name for name in source() if name.startswith(text))
+                except Exception:
+                    continue
+            matches = sorted(names) + matches
+        return [prefix + match for match in dict.fromkeys(matches)]
+
+    def path_candidates(self, text):
+        """Completes a filesystem path using cached directory listings.
+        
+        Args:
+            text: Partial path (may start with ~)
+            
+        Returns:
+            Sorted list of matching paths, directories ending with a separator
+        """
+
+        directory, partial = os.path.split(text)
+        listing = self.list_directory(os.path.expanduser(directory) or os.curdir)
+        show_hidden = partial.startswith(".")
+        return [
+            os.path.join(directory, name) + (os.sep if is_dir else "")
+            for name, is_dir in listing
+            if name.startswith(partial) and (show_hidden or not name.startswith("."))
+        ]
+
+    def list_directory(self, path):
+        """Lists a directory, reusing the cached listing while its mtime is unchanged.
+        
+        Args:
+            path: Directory path
+            
+        Returns:
+            Sorted list of (name, is_dir) tuples
+        """
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return []
+        cached = self._dir_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        entries.append((entry.name, entry.is_dir()))
+                    except OSError:
+                        entries.append((entry.name, False))
+        except OSError:
+            return []
+        entries.sort()
+        self._dir_cache[path] = (mtime, entries)
+        return entries
+
+def setup_readline(command_sources=None):
+    """Configures tab completion and history support.
+    
+    Args:
+        command_sources: Callables returning names to complete at command
+            position, e.g. alias names and PATH executables (optional)
+            
+    Returns:
+        Completer instance when readline is available
+    """
     
     try:
         import readline  # Works on Unix-like systems
@@ -44,9 +164,7 @@ def setup_readline():
     # Configure readline for tab completion
     readline.parse_and_bind("tab: complete")
 
-    def complete(text, state):
-        matches = glob.glob(os.path.expanduser(text) + "*") + [None]
-        return matches[state]
-
-    readline.set_completer(complete)
-    readline.set_completer_delims(" \t\n;")
\ No newline at end of file
+    completer = Completer(readline, command_sources)
+    readline.set_completer(completer.complete)
+    readline.set_completer_delims(" \t\n;")
+    return completer
\ No newline at end of file
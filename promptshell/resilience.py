@@ -0,0 +1,434 @@
+"""
+Timeouts, retries and circuit breaking
+--------------------------------------
+Every provider call made by a Node goes through call_with_retries (or its
+async and streaming variants):
+
+    CONNECT_TIMEOUT=5              # seconds to open a connection
+    READ_TIMEOUT=60                # seconds to wait for (more of) a response
+    TIMEOUT_COMMAND_EXECUTOR=60    # wall-clock limit per call, one key per role
+    MAX_RETRIES=2                  # retries of timeouts, 429 and 5xx responses
+    RETRY_BACKOFF_MS=500           # base of the jittered exponential backoff
+    CIRCUIT_BREAKER_FAILURES=5     # consecutive failures that open the breaker
+    CIRCUIT_BREAKER_COOLDOWN=30    # seconds the provider is skipped once open
+
+Only transient failures are retried; anything else (bad API key, invalid
+request, missing recording) fails at once. A provider whose breaker is open
+is not called at all until the cooldown has passed, after which a single
+probe request decides whether it is closed again.
+
+Failures surface as ProviderError, never as response text, so an error can
+not be mistaken for a command to run.
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+
+from .setup import config_number
+from .tracing import span
+
+# Wall-clock limit per call for each role, in seconds
+DEFAULT_ROLE_TIMEOUTS = {
+    "Command Executor": 60.0,
+    "Error Handler": 60.0,
+    "Debugger Expert": 120.0,
+    "Question Answerer": 180.0,
+}
+DEFAULT_ROLE_TIMEOUT = 120.0
+MAX_BACKOFF = 8.0
+
+# HTTP statuses worth retrying: timeouts, rate limits and server errors
+RETRY_STATUSES = {408, 409, 425, 429}
+
+# Exception class names (across requests, httpx and the provider SDKs) that mean the request may succeed if repeated
+TRANSIENT_ERRORS = {
+    "Timeout", "ConnectTimeout", "ReadTimeout", "ConnectionError", "ChunkedEncodingError",
+    "TimeoutException", "ConnectError", "ReadError", "RemoteProtocolError", "NetworkError",
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "ServiceUnavailable", "DeadlineExceeded", "ResourceExhausted", "TooManyRequests",
+}
+
+_deadline = contextvars.ContextVar("promptshell_deadline", default=None)
+
+class ProviderError(Exception):
+    def __init__(self, message: str, provider: str = None):
+        """A provider call that failed for good (after any retries).
+
+        Args:
+            message: Description shown to the user
+            provider: Provider name
+        """
+
+        super().__init__(message)
+        self.provider = provider
+
+class ProviderHTTPError(Exception):
+    def __init__(self, status_code: int, text: str, headers: dict = None):
+        """Non-success HTTP response from a provider called without an SDK.
+
+        Args:
+            status_code: HTTP status
+            text: Response body
+            headers: Response headers (for Retry-After)
+        """
+
+        super().__init__(f"HTTP {status_code}: {text.strip()[:200]}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+def role_timeout(config: dict, role: str) -> float:
+    """Gets the wall-clock limit for one call of a role.
+
+    Args:
+        config: Configuration dictionary
+        role: Node role name
+
+    Returns:
+        Seconds (TIMEOUT_<ROLE> in the configuration, e.g. TIMEOUT_COMMAND_EXECUTOR)
+    """
+
+    key = "TIMEOUT_" + role.upper().replace(" ", "_")
+    return config_number(config, key, DEFAULT_ROLE_TIMEOUTS.get(role, DEFAULT_ROLE_TIMEOUT))
+
+def request_timeouts(config: dict) -> tuple:
+    """Gets the connect and read timeouts for a request made now.
+
+    The read timeout is shortened so the request cannot outlive the
+    wall-clock limit of the call it belongs to.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Tuple (connect seconds, read seconds)
+    """
+
+    connect = config_number(config, "CONNECT_TIMEOUT", 5.0)
+    read = config_number(config, "READ_TIMEOUT", 60.0)
+    deadline = _deadline.get()
+    if deadline is not None:
+        remaining = max(deadline - time.monotonic(), 0.1)
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
+
+def http_timeout(config: dict):
+    """Gets the request timeouts as an httpx.Timeout, as accepted by the httpx-based SDKs."""
+
+    import httpx
+
+    connect, read = request_timeouts(config)
+    return httpx.Timeout(read, connect=connect)
+
+def _status_code(exc: Exception):
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_transient(exc: Exception) -> bool:
+    """Whether a failed request may succeed if repeated.
+
+    Args:
+        exc: Exception raised by a backend
+
+    Returns:
+        True for timeouts, connection failures, 429 and 5xx responses
+    """
+
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRY_STATUSES or status >= 500
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(exc).__mro__)
+
+def retry_after(exc: Exception):
+    """Gets the delay requested by a Retry-After header, in seconds, if any."""
+
+    headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return max(float(headers.get("retry-after") or headers.get("Retry-After")), 0.0)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def backoff_delay(attempt: int, base: float, requested: float = None) -> float:
+    """Gets the pause before a retry ("full jitter" exponential backoff).
+
+    Args:
+        attempt: Number of attempts made so far (1 for the first retry)
+        base: Base delay in seconds
+        requested: Delay asked for by the provider (Retry-After), if any
+
+    Returns:
+        Seconds to wait
+    """
+
+    delay = random.uniform(0, min(MAX_BACKOFF, base * 2 ** (attempt - 1)))
+    return max(delay, requested) if requested is not None else delay
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, clock=time.monotonic):
+        """Stops calling a provider after repeated failures.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the breaker
+            cooldown: Seconds to fail fast before letting a probe request through
+            clock: Monotonic time source
+        """
+
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; in half-open state only one probe at a time is."""
+
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(self.cooldown - (self.clock() - self.opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def release(self):
+        """Ends a probe that neither succeeded nor failed transiently."""
+
+        with self._lock:
+            self._probing = False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(provider: str, config: dict) -> CircuitBreaker:
+    """Gets the process-wide circuit breaker of a provider, applying the current settings."""
+
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker()
+        breaker.failure_threshold = max(config_number(config, "CIRCUIT_BREAKER_FAILURES", 5), 1)
+        breaker.cooldown = config_number(config, "CIRCUIT_BREAKER_COOLDOWN", 30.0)
+        return breaker
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+class _Retrier:
+    def __init__(self, node):
+        """Retry state for one Node call."""
+
+        self.node = node
+        self.limit = role_timeout(node.config, node.name)
+        self.deadline = time.monotonic() + self.limit
+        self.max_retries = max(config_number(node.config, "MAX_RETRIES", 2), 0)
+        self.base = max(config_number(node.config, "RETRY_BACKOFF_MS", 500.0), 0.0) / 1000
+        self.breaker = get_breaker(node.provider, node.config)
+        self.attempts = 0
+
+    def before_attempt(self):
+        """Raises instead of calling a provider that is known to be down."""
+
+        if not self.breaker.allow():
+            raise ProviderError(
+                f"{self.node.provider} is unavailable after repeated failures; "
+                f"not retrying for another {self.breaker.retry_in():.0f}s",
+                self.node.provider,
+            )
+        self.attempts += 1
+
+    def failed(self, exc: Exception) -> float:
+        """Records a failed attempt.
+
+        Returns:
+            Seconds to wait before the next attempt
+
+        Raises:
+            ProviderError: If the call should not be retried
+        """
+
+        if isinstance(exc, ProviderError):
+            self.breaker.release()
+            raise exc
+        provider = self.node.provider
+        if not is_transient(exc):
+            self.breaker.release()
+            raise ProviderError(f"{provider}: {exc}", provider) from exc
+        self.breaker.record_failure()
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise ProviderError(f"{provider} did not answer within {self.limit:g}s ({self.node.name})", provider) from exc
+        delay = backoff_delay(self.attempts, self.base, retry_after(exc))
+        if self.attempts > self.max_retries or delay >= remaining or self.breaker.state == "open":
+            tries = f" after {self.attempts} attempts" if self.attempts > 1 else ""
+            raise ProviderError(f"{provider} request failed{tries}: {exc}", provider) from exc
+        return delay
+
+    def timed_out(self) -> ProviderError:
+        self.breaker.record_failure()
+        return ProviderError(f"{self.node.provider} did not answer within {self.limit:g}s ({self.node.name})", self.node.provider)
+
+def call_with_retries(node, request):
+    """Makes a blocking provider request, retrying transient failures within the role's time limit.
+
+    Args:
+        node: Calling Node instance
+        request: Zero-argument callable that sends the request and returns the response
+
+    Returns:
+        Response of the first successful attempt
+
+    Raises:
+        ProviderError: If the call failed for good
+    """
+
+    retrier = _Retrier(node)
+    while True:
+        retrier.before_attempt()
+        token = _deadline.set(retrier.deadline)
+        try:
+            response = request()
+        except Exception as e:
+            delay = retrier.failed(e)
+        except BaseException:
+            # Interrupted or cancelled: a probe must not keep the breaker half-open for good
+            retrier.breaker.release()
+            raise
+        else:
+            retrier.breaker.record_success()
+            return response
+        finally:
+            _deadline.reset(token)
+        with span("retry", attempt=retrier.attempts, delay_ms=round(delay * 1000)):
+            time.sleep(delay)
+
+async def acall_with_retries(node, request):
+    """Async variant of call_with_retries; each attempt is also cancelled at the role's time limit.
+
+    Args:
+        node: Calling Node instance
+        request: Zero-argument coroutine function that sends the request
+
+    Returns:
+        Response of the first successful attempt
+
+    Raises:
+        ProviderError: If the call failed for good
+    """
+
+    retrier = _Retrier(node)
+    while True:
+        retrier.before_attempt()
+        token = _deadline.set(retrier.deadline)
+        try:
+            response = await asyncio.wait_for(request(), timeout=max(retrier.deadline - time.monotonic(), 0.001))
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError) and time.monotonic() >= retrier.deadline:
+                raise retrier.timed_out() from None
+            delay = retrier.failed(e)
+        except BaseException:
+            # Interrupted or cancelled: a probe must not keep the breaker half-open for good
+            retrier.breaker.release()
+            raise
+        else:
+            retrier.breaker.record_success()
+            return response
+        finally:
+            _deadline.reset(token)
+        with span("retry", attempt=retrier.attempts, delay_ms=round(delay * 1000)):
+            await asyncio.sleep(delay)
+
+def stream_with_retries(node, open_stream):
+    """Streams a provider response, retrying transient failures until the first chunk arrives.
+
+    Once text has been passed on, a failure can no longer be retried
+    transparently and is raised as a ProviderError. The role's time limit
+    is checked as chunks arrive.
+
+    Args:
+        node: Calling Node instance
+        open_stream: Zero-argument callable returning a new chunk iterator
+
+    Yields:
+        Response text chunks
+
+    Raises:
+        ProviderError: If the stream failed for good
+    """
+
+    retrier = _Retrier(node)
+    while True:
+        retrier.before_attempt()
+        token = _deadline.set(retrier.deadline)
+        chunks = None
+        try:
+            chunks = iter(open_stream())
+            first = next(chunks)
+        except StopIteration:
+            retrier.breaker.record_success()
+            return
+        except Exception as e:
+            _close(chunks)
+            delay = retrier.failed(e)
+        except BaseException:
+            _close(chunks)
+            retrier.breaker.release()
+            raise
+        else:
+            retrier.breaker.record_success()
+            break
+        finally:
+            _deadline.reset(token)
+        with span("retry", attempt=retrier.attempts, delay_ms=round(delay * 1000)):
+            time.sleep(delay)
+
+    try:
+        yield first
+        for chunk in chunks:
+            if time.monotonic() > retrier.deadline:
+                raise retrier.timed_out()
+            yield chunk
+    except ProviderError:
+        raise
+    except Exception as e:
+        raise ProviderError(f"{node.provider} stream interrupted: {e}", node.provider) from e
+    finally:
+        _close(chunks)
+
+def _close(chunks):
+    close = getattr(chunks, "close", None)
+    if callable(close):
+        close()
@@ -1,5 +1,4 @@
 import questionary
-import requests
 import os
 
 from .format_utils import text_theme, reset_format
@@ -53,6 +52,8 @@ def setup_wizard():
 
     def get_installed_models():
         """Fetch installed models from local Ollama server"""
+        import requests  # Imported lazily: only the wizard needs it at startup
+
         try:
             response = requests.get(f"{ollama_host}/api/tags")
             response.raise_for_status()
@@ -182,11 +183,56 @@ API_MODEL={config["API_MODEL"]}
 # Provider API Keys (only set for your active provider)
 GROQ_API_KEY={config.get("GROQ_API_KEY", "")}
 OPENAI_API_KEY={config.get("OPENAI_API_KEY", "")}
+# Optional OpenAI-compatible endpoint (leave blank for api.openai.com)
+OPENAI_BASE_URL={config.get("OPENAI_BASE_URL", "")}
 GOOGLE_API_KEY={config.get("GOOGLE_API_KEY", "")}
 ANTHROPIC_API_KEY={config.get("ANTHROPIC_API_KEY", "")}
 FIREWORKS_API_KEY={config.get("FIREWORKS_API_KEY", "")}
 OPENROUTER_API_KEY={config.get("OPENROUTER_API_KEY", "")}
 DEEPSEEK_API_KEY={config.get("DEEPSEEK_API_KEY", "")}
+# Performance
+TRANSLATION_CACHE={config.get("TRANSLATION_CACHE", "on")}
+TRANSLATION_CACHE_SIZE={config.get("TRANSLATION_CACHE_SIZE", "1000")}
+TRANSLATION_CACHE_TTL_DAYS={config.get("TRANSLATION_CACHE_TTL_DAYS", "30")}
+# Keep a searchable history of executed commands (on/off) and how many records to keep
+HISTORY={config.get("HISTORY", "on")}
+HISTORY_SIZE={config.get("HISTORY_SIZE", "200000")}
+# Offer the command of a similar past request that succeeded before asking the AI (on/off), and how similar it must be (0-1)
+SIMILAR_MATCHES={config.get("SIMILAR_MATCHES", "on")}
+SIMILAR_MATCH_THRESHOLD={config.get("SIMILAR_MATCH_THRESHOLD", "0.8")}
+# Answer common requests (list files, disk usage, create directory ...) from built-in templates without the AI (on/off)
+LOCAL_INTENTS={config.get("LOCAL_INTENTS", "on")}
+# Load the local model and prime its prompt cache in the background at startup (on/off)
+WARM_UP={config.get("WARM_UP", "on")}
+# How long Ollama keeps the model in memory after a request (e.g. 30m, 2h, -1 = forever)
+OLLAMA_KEEP_ALIVE={config.get("OLLAMA_KEEP_ALIVE", "30m")}
+# Record/replay (off/record/replay); cassette defaults to cassette.jsonl next to this file
+CASSETTE_MODE={config.get("CASSETTE_MODE", "off")}
+CASSETTE_FILE={config.get("CASSETTE_FILE", "")}
+# Replay timing (instant/recorded)
+REPLAY_LATENCY={config.get("REPLAY_LATENCY", "instant")}
+# Serve the role's recordings in order when a prompt was never recorded (on/off)
+REPLAY_FALLBACK={config.get("REPLAY_FALLBACK", "off")}
+# Append per-request timing spans to this JSON Lines file (blank = off)
+TRACE_FILE={config.get("TRACE_FILE", "")}
+# Hedged requests: also ask this provider if the active one has not answered within HEDGE_DELAY_MS
+# (blank = off; the provider's API key must be set above)
+HEDGE_PROVIDER={config.get("HEDGE_PROVIDER", "")}
+HEDGE_MODEL={config.get("HEDGE_MODEL", "")}
+HEDGE_DELAY_MS={config.get("HEDGE_DELAY_MS", "2000")}
+# Network timeouts in seconds, and the wall-clock limit of one AI call per role
+CONNECT_TIMEOUT={config.get("CONNECT_TIMEOUT", "5")}
+READ_TIMEOUT={config.get("READ_TIMEOUT", "60")}
+TIMEOUT_COMMAND_EXECUTOR={config.get("TIMEOUT_COMMAND_EXECUTOR", "60")}
+TIMEOUT_ERROR_HANDLER={config.get("TIMEOUT_ERROR_HANDLER", "60")}
+TIMEOUT_DEBUGGER_EXPERT={config.get("TIMEOUT_DEBUGGER_EXPERT", "120")}
+TIMEOUT_QUESTION_ANSWERER={config.get("TIMEOUT_QUESTION_ANSWERER", "180")}
+# Retries of timeouts, 429 and 5xx responses (jittered exponential backoff)
+MAX_RETRIES={config.get("MAX_RETRIES", "2")}
+RETRY_BACKOFF_MS={config.get("RETRY_BACKOFF_MS", "500")}
+# Stop calling a provider for CIRCUIT_BREAKER_COOLDOWN seconds after this many consecutive failures
+CIRCUIT_BREAKER_FAILURES={config.get("CIRCUIT_BREAKER_FAILURES", "5")}
+CIRCUIT_BREAKER_COOLDOWN={config.get("CIRCUIT_BREAKER_COOLDOWN", "30")}
 """
 
     with open(CONFIG_FILE, "w") as file:
@@ -195,10 +241,61 @@ DEEPSEEK_API_KEY={config.get("DEEPSEEK_API_KEY", "")}
     print(text_theme("success", bg="black") + f"\n✅ Configuration updated! Saved to {CONFIG_FILE}" + reset_format())
     print(text_theme("info") + f"Active model: {get_active_model()}" + reset_format())
 
+class Config:
+    """
+    In-memory view of the configuration file.
+    The file is parsed again only when its modification time or size changes,
+    so repeated load_config() calls cost a single stat().
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._values = None
+        self._signature = None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path or CONFIG_FILE)
+        except OSError:
+            return None
+        return (self.path or CONFIG_FILE, stat.st_mtime_ns, stat.st_size)
+
+    def load(self) -> dict:
+        """Returns a copy of the configuration, re-reading the file if it changed."""
+
+        signature = self._file_signature()
+        if self._values is None or signature != self._signature:
+            self._values = read_config_file(self.path or CONFIG_FILE)
+            self._signature = signature
+        return dict(self._values)
+
+    def changed(self) -> bool:
+        """Checks whether the file changed since it was last loaded."""
+
+        return self._values is not None and self._file_signature() != self._signature
+
+_config = Config()
+
 def load_config():
     """
-    Loads the configuration file into a dictionary.
+    Loads the configuration into a dictionary.
     Returns default values if the file is missing or incomplete.
+    The file is only parsed again after it changes on disk.
+    """
+
+    return _config.load()
+
+def config_changed():
+    """
+    Checks whether the configuration file was edited since it was last loaded.
+    Used by the REPL to hot-reload settings without a restart.
+    """
+
+    return _config.changed()
+
+def read_config_file(config_file: str):
+    """
+    Parses a configuration file into a dictionary on top of the defaults.
     """
     global warning_printed  
 
@@ -210,20 +307,49 @@ def load_config():
         "API_MODEL": "mixtral-8x7b-32768",
         "GROQ_API_KEY": "",
         "OPENAI_API_KEY": "",
+        "OPENAI_BASE_URL": "",
         "GOOGLE_API_KEY": "",
         "ANTHROPIC_API_KEY": "",
         "FIREWORKS_API_KEY": "",
         "OPENROUTER_API_KEY": "",
         "DEEPSEEK_API_KEY": "",
+        "TRANSLATION_CACHE": "on",
+        "TRANSLATION_CACHE_SIZE": "1000",
+        "TRANSLATION_CACHE_TTL_DAYS": "30",
+        "HISTORY": "on",
+        "HISTORY_SIZE": "200000",
+        "SIMILAR_MATCHES": "on",
+        "SIMILAR_MATCH_THRESHOLD": "0.8",
+        "LOCAL_INTENTS": "on",
+        "WARM_UP": "on",
+        "OLLAMA_KEEP_ALIVE": "30m",
+        "CASSETTE_MODE": "off",
+        "CASSETTE_FILE": "",
+        "REPLAY_LATENCY": "instant",
+        "REPLAY_FALLBACK": "off",
+        "TRACE_FILE": "",
+        "HEDGE_PROVIDER": "",
+        "HEDGE_MODEL": "",
+        "HEDGE_DELAY_MS": "2000",
+        "CONNECT_TIMEOUT": "5",
+        "READ_TIMEOUT": "60",
+        "TIMEOUT_COMMAND_EXECUTOR": "60",
+        "TIMEOUT_ERROR_HANDLER": "60",
+        "TIMEOUT_DEBUGGER_EXPERT": "120",
+        "TIMEOUT_QUESTION_ANSWERER": "180",
+        "MAX_RETRIES": "2",
+        "RETRY_BACKOFF_MS": "500",
+        "CIRCUIT_BREAKER_FAILURES": "5",
+        "CIRCUIT_BREAKER_COOLDOWN": "30",
     }
 
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file):
         if not warning_printed:
-            print(text_theme('error') + f"⚠️ Config file '{CONFIG_FILE}' not found. Using default settings." + reset_format())
+            print(text_theme('error') + f"⚠️ Config file '{config_file}' not found. Using default settings." + reset_format())
             warning_printed = True  
         return config
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as file:
+    with open(config_file, "r", encoding="utf-8") as file:
         for line in file:
             line = line.strip()
             if not line or line.startswith("#"):
@@ -238,6 +364,40 @@ def load_config():
 
     return config
 
+def config_flag(config: dict, key: str, default: bool = False) -> bool:
+    """Reads an on/off style setting from the configuration.
+    
+    Args:
+        config: Configuration dictionary
+        key: Setting name
+        default: Value used when the setting is missing or blank
+        
+    Returns:
+        Boolean value of the setting
+    """
+
+    value = str(config.get(key, "")).strip().lower()
+    if not value:
+        return default
+    return value in ("1", "on", "true", "yes")
+
+def config_number(config: dict, key: str, default: float) -> float:
+    """Reads a numeric setting from the configuration.
+    
+    Args:
+        config: Configuration dictionary
+        key: Setting name
+        default: Value used when the setting is missing or invalid
+        
+    Returns:
+        Numeric value of the setting (same type as default)
+    """
+
+    try:
+        return type(default)(str(config.get(key, "")).strip())
+    except ValueError:
+        return default
+
 def get_active_model():
     """
     Gets active AI model name based on the operation mode.
@@ -261,6 +421,8 @@ def get_provider():
     """
 
     config = load_config()
+    if config.get("CASSETTE_MODE", "").strip().lower() == "replay":
+        return "replay"
     if config["MODE"] == "api":
         return config["ACTIVE_API_PROVIDER"]
     else:
@@ -0,0 +1,194 @@
+"""
+Similar request lookup
+----------------------
+Finds a past request that succeeded and closely resembles a new one, so its
+command can be offered before asking the LLM ("list all python files here"
+vs "list python files in here").
+
+Requests are compared as TF-IDF vectors of character trigrams (taken within
+words, so the order of words matters little and typos cost little) by cosine
+similarity. The vectors are held as a compressed sparse row matrix in NumPy
+arrays, so one lookup is a handful of vectorized operations even with
+thousands of past requests. No embeddings service is involved.
+
+A close request is not always the same request: "kill the process on port
+8081" scores high against "... port 8080", and "restart the containers"
+against "start the containers". Matches are therefore only offered when
+they use the same words as the request apart from filler words ("the",
+"all", "please", ...), and commands that needed an extra confirmation
+('CONFIRM:') are never indexed.
+
+NumPy is imported on the first lookup, so it does not slow down startup.
+"""
+
+import math
+import threading
+
+from collections import Counter, namedtuple
+from typing import Callable, Optional
+
+from .translation_cache import normalize_input
+
+SimilarMatch = namedtuple("SimilarMatch", ["input", "command", "score"])
+
+NGRAM_SIZE = 3
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> list:
+    """Splits a request into the character n-grams of its words.
+
+    Each word is padded with spaces, so short words still produce an n-gram
+    and word starts and ends are told apart.
+
+    Args:
+        text: Request text
+        n: N-gram length
+
+    Returns:
+        List of n-grams (with repetitions)
+    """
+
+    grams = []
+    for word in normalize_input(text).split():
+        padded = f" {word} "
+        grams.extend(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+    return grams
+
+# Words that do not change what a request asks for
+FILLER_WORDS = {
+    "a", "an", "the", "all", "any", "some", "every", "each", "my", "me", "i", "you", "please", "can", "could",
+    "would", "will", "to", "in", "into", "inside", "on", "of", "for", "from", "with", "here", "this", "these",
+    "that", "those", "current", "now", "just", "is", "are", "and",
+}
+
+def content_words(text: str) -> frozenset:
+    """Gets the words of a request that decide what it asks for.
+
+    Verbs ('start' vs 'restart'), names, numbers and paths ('8080',
+    'old_build', '*.py') all count; a past command built for other words
+    would not fit.
+
+    Args:
+        text: Request text
+
+    Returns:
+        Set of the lowercased words that are not FILLER_WORDS
+    """
+
+    # A trailing full stop ends the sentence, not the path
+    words = (word.strip("\"'`,;:!?()").rstrip(".") for word in text.lower().split())
+    return frozenset(word for word in words if word and word not in FILLER_WORDS)
+
+class SimilarityIndex:
+    def __init__(self, load_pairs: Callable[[], list], max_entries: int = 5000):
+        """Index of past (request, command) pairs searchable by similarity.
+
+        The pairs are loaded and vectorized on the first lookup; pairs added
+        later mark the vectors stale and they are rebuilt on the next lookup.
+
+        Args:
+            load_pairs: Returns the (request, command) pairs to index, newest first
+            max_entries: Maximum number of distinct requests indexed
+        """
+
+        self.load_pairs = load_pairs
+        self.max_entries = max_entries
+        self._pairs = None     # normalized request -> (request, command), oldest first
+        self._matrix = None    # (requests, vocabulary, idf, indptr, indices, weights)
+        self._lock = threading.Lock()
+
+    def add(self, user_input: str, command: str):
+        """Adds a request whose command succeeded.
+
+        Args:
+            user_input: Natural language request
+            command: Command that ran successfully
+        """
+
+        if command.startswith("CONFIRM:"):
+            return
+        with self._lock:
+            if self._pairs is None:
+                return  # Not loaded yet; the first lookup reads it from the source
+            key = normalize_input(user_input)
+            self._pairs.pop(key, None)
+            self._pairs[key] = (user_input, command)
+            while len(self._pairs) > self.max_entries:
+                self._pairs.pop(next(iter(self._pairs)))
+            self._matrix = None
+
+    def match(self, user_input: str, threshold: float = 0.8) -> Optional[SimilarMatch]:
+        """Finds the most similar past request made of the same content words.
+
+        Args:
+            user_input: Natural language request
+            threshold: Minimum cosine similarity (0-1) to report a match
+
+        Returns:
+            SimilarMatch, or None if nothing is similar enough
+        """
+
+        import numpy as np
+
+        with self._lock:
+            if self._pairs is None:
+                self._pairs = {}
+                for request, command in reversed(self.load_pairs()[:self.max_entries]):
+                    if command.startswith("CONFIRM:"):
+                        continue
+                    key = normalize_input(request)
+                    self._pairs.pop(key, None)
+                    self._pairs[key] = (request, command)
+            if self._matrix is None:
+                self._matrix = self._build(np)
+            requests, vocabulary, idf, indptr, indices, weights = self._matrix
+        if not requests:
+            return None
+
+        counts = Counter(char_ngrams(user_input))
+        if not counts:
+            return None
+        unseen_idf = math.log(len(requests) + 1) + 1
+        known = [(vocabulary[gram], count) for gram, count in counts.items() if gram in vocabulary]
+        # Unseen n-grams have no match anywhere but still count towards the query's length
+        norm = math.sqrt(sum(
+            ((1 + math.log(count)) * unseen_idf) ** 2 for gram, count in counts.items() if gram not in vocabulary
+        ))
+        if not known:
+            return None
+        ids = np.array([gram_id for gram_id, _ in known], dtype=np.int64)
+        values = (1 + np.log(np.array([count for _, count in known], dtype=np.float32))) * idf[ids]
+        norm = math.sqrt(norm ** 2 + float(values @ values))
+        query = np.zeros(len(vocabulary), dtype=np.float32)
+        query[ids] = values / norm
+
+        scores = np.add.reduceat(weights * query[indices], indptr[:-1])
+        candidates = np.flatnonzero(scores >= threshold)
+        words = content_words(user_input)
+        for best in candidates[np.argsort(-scores[candidates], kind="stable")]:
+            request, command = requests[best]
+            if content_words(request) == words:
+                return SimilarMatch(request, command, float(scores[best]))
+        return None
+
+    def _build(self, np) -> tuple:
+        """Vectorizes the indexed requests into CSR arrays of L2-normalized TF-IDF weights."""
+
+        requests, rows, vocabulary = [], [], {}
+        for request, command in self._pairs.values():
+            counts = Counter(char_ngrams(request))
+            if counts:
+                requests.append((request, command))
+                rows.append({vocabulary.setdefault(gram, len(vocabulary)): count for gram, count in counts.items()})
+        if not rows:
+            return [], {}, None, None, None, None
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter((gram_id for row in rows for gram_id in row), dtype=np.int64, count=indptr[-1])
+        counts = np.fromiter((count for row in rows for count in row.values()), dtype=np.float32, count=indptr[-1])
+        document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        idf = (np.log((len(rows) + 1) / (document_frequency + 1)) + 1).astype(np.float32)
+        weights = (1 + np.log(counts)) * idf[indices]
+        norms = np.sqrt(np.add.reduceat(weights ** 2, indptr[:-1]))
+        weights /= np.repeat(norms, np.diff(indptr))
+        return requests, vocabulary, idf, indptr, indices, weights
@@ -47,9 +47,21 @@ NOTE: progress bar don't take simple fuctions as input, they need generators.
 Here the yield keyword is used to generate the progress report for the progress bar decorator.
 Another test example is shown in main funtion below
 
+--------------------------
+Streaming (for token-by-token AI responses)
+--------------------------
+
+Example usage:
+    text, ttft = render_stream(node(prompt, stream=True))
+    line, ttft = read_first_line(node(prompt, stream=True))
+
+A spinner is shown only until the first token arrives; ttft is the time to
+first token in seconds (None if nothing arrived).
+
 """
 
 import random
+import time
 
 from functools import wraps
 
@@ -59,6 +71,11 @@ from rich.spinner import SPINNERS
 
 
 #--------SPINNER-------
+def resolve_spinner(spinner_type: str) -> str:
+    """Gets the Rich spinner name to use, picking one at random for "random"."""
+
+    return random.choice(list(SPINNERS.keys())) if spinner_type == "random" else spinner_type
+
 def spinner(spinner_type="dots", message=" [cyan]Working..."):
     """Decorator for CLI spinners.
     
@@ -74,12 +91,7 @@ def spinner(spinner_type="dots", message=" [cyan]Working..."):
         @wraps(func)
         def wrapper(*args, **kwargs):
             console = Console()
-            chosen_spinner = (
-                random.choice(list(SPINNERS.keys()))
-                if spinner_type == "random"
-                else spinner_type
-            )
-            with console.status(f"{message}", spinner=chosen_spinner):
+            with console.status(f"{message}", spinner=resolve_spinner(spinner_type)):
                 return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -110,6 +122,76 @@ def progress_bar(description="Downloading..."):
         return wrapper
     return decorator
 
+#--------STREAMING-------
+def render_stream(chunks, spinner_type="dots", message=" [cyan]Working..."):
+    """Prints streamed chunks as they arrive, with a spinner until the first one.
+    
+    Args:
+        chunks: Iterable of text chunks
+        spinner_type: Spinner style
+        message: Display message while waiting
+        
+    Returns:
+        Tuple (full text, seconds to first token or None)
+    """
+
+    console = Console()
+    chunks = iter(chunks)
+    start = time.perf_counter()
+    parts = []
+    ttft = None
+    with console.status(message, spinner=resolve_spinner(spinner_type)):
+        for chunk in chunks:
+            if chunk:
+                ttft = time.perf_counter() - start
+                parts.append(chunk.lstrip())
+                break
+    if parts:
+        print(parts[0], end="", flush=True)
+    for chunk in chunks:
+        parts.append(chunk)
+        print(chunk, end="", flush=True)
+    print()
+    return "".join(parts), ttft
+
+def read_first_line(chunks, spinner_type="dots", message=" [cyan]Working..."):
+    """Consumes a stream until its first non-empty line is complete, then stops it.
+    
+    Markdown code fences around the line are skipped.
+    
+    Args:
+        chunks: Generator of text chunks
+        spinner_type: Spinner style
+        message: Display message while waiting
+        
+    Returns:
+        Tuple (first line, seconds to first token or None)
+    """
+
+    console = Console()
+    start = time.perf_counter()
+    buffer = ""
+    ttft = None
+    line = ""
+    with console.status(message, spinner=resolve_spinner(spinner_type)):
+        for chunk in chunks:
+            if ttft is None and chunk:
+                ttft = time.perf_counter() - start
+            buffer += chunk
+            while "\n" in buffer:
+                candidate, buffer = buffer.split("\n", 1)
+                candidate = candidate.strip()
+                if candidate and not candidate.startswith("```"):
+                    line = candidate
+                    break
+            if line:
+                break
+    if hasattr(chunks, "close"):
+        chunks.close()
+    if not line:
+        line = buffer.strip().strip("`").strip()
+    return line, ttft
+
 
 # To test the progress bar
 if __name__ == "__main__":
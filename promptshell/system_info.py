@@ -1,5 +1,11 @@
+import json
+import os
 import platform
 
+from .setup import CONFIG_DIR
+
+SYSTEM_INFO_FILE = os.path.join(CONFIG_DIR, "system_info.json")
+
 def get_system_info() -> dict:
     """Retrieve system information as a dictionary with structured data.
     
@@ -26,3 +32,37 @@ def get_system_info() -> dict:
             'cpu': 'Unknown',
             'platform': 'Unknown'
         }
+
+def _system_fingerprint() -> str:
+    """Cheap identifier of the running system (no subprocesses involved)."""
+
+    uname = platform.uname()
+    return "|".join([uname.system, uname.node, uname.release, uname.version, uname.machine])
+
+def get_cached_system_info() -> dict:
+    """Retrieve system information, reusing the copy saved by a previous run.
+
+    The cache is keyed on the kernel/OS identity, so it is refreshed after an
+    OS upgrade or on a different machine sharing the same home directory.
+
+    Returns:
+        Dictionary of system properties
+    """
+
+    fingerprint = _system_fingerprint()
+    try:
+        with open(SYSTEM_INFO_FILE, 'r') as f:
+            cached = json.load(f)
+        if cached.get('fingerprint') == fingerprint:
+            return cached['info']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    info = get_system_info()
+    if 'error' not in info:
+        try:
+            with open(SYSTEM_INFO_FILE, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'info': info}, f)
+        except OSError:
+            pass
+    return info
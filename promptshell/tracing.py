@@ -0,0 +1,210 @@
+"""
+Lightweight span tracing
+------------------------
+Times the stages of a request (prompt building, provider call, confirmation,
+subprocess, debugging) so slow requests can be explained.
+
+Example usage:
+    from .tracing import span
+
+    with span("translate", role="Command Executor"):
+        ...
+
+Spans nest by context (threads started with asyncio.to_thread included).
+A span opened with no parent is a root: when it ends, its whole tree is
+printed as a breakdown (--profile) and/or appended as one JSON line to the
+trace file (TRACE_FILE in the configuration).
+
+While tracing is off, span() returns a shared no-op object, so instrumented
+code only pays for a function call.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+
+from .format_utils import text_theme, reset_format
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NOOP = _NoopSpan()
+_tracer = None
+_current = contextvars.ContextVar("promptshell_span", default=None)
+
+class Span:
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.root = None
+        self.depth = 0
+        self.start = 0.0
+        self.end = None
+        self.children = None
+        self._token = None
+
+    def set(self, **attrs):
+        """Adds attributes to the span (e.g. results known only at the end)."""
+
+        self.attrs.update(attrs)
+
+    def _attach(self):
+        self.parent = _current.get()
+        if self.parent is None:
+            self.root = self
+            self.children = []
+        else:
+            self.root = self.parent.root
+            self.depth = self.parent.depth + 1
+
+    def _close(self):
+        if self.root is self:
+            self.tracer.finish(self)
+        else:
+            self.root.children.append(self)
+
+    def __enter__(self):
+        self._attach()
+        self.start = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.attrs["error"] = exc_type.__name__
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            _current.set(self.parent)  # Closed from another context
+        self._close()
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "depth": self.depth,
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+
+class Tracer:
+    def __init__(self, profile: bool = False, trace_file: str = None):
+        """Collects span trees and reports them when their root ends.
+
+        Args:
+            profile: Print a per-request breakdown
+            trace_file: JSON Lines file that receives one record per request (optional)
+        """
+
+        self.profile = profile
+        self.trace_file = trace_file
+        self._lock = threading.Lock()
+
+    def finish(self, root: Span):
+        spans = sorted(root.children, key=lambda s: s.start)
+        if self.profile:
+            print(format_breakdown(root, spans))
+        if self.trace_file:
+            record = {
+                "timestamp": time.time(),
+                **root.to_dict(root.start),
+                "spans": [s.to_dict(root.start) for s in spans],
+            }
+            try:
+                with self._lock, open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+            except OSError:
+                pass
+
+def format_breakdown(root: Span, spans: list) -> str:
+    """Formats a span tree as an indented table of durations.
+
+    Args:
+        root: Root span
+        spans: Descendant spans ordered by start time
+
+    Returns:
+        Printable breakdown
+    """
+
+    total = root.duration_ms or 1.0
+    title = root.attrs.get("input") or root.name
+    lines = [text_theme('info', bold=True) + f"Profile: {root.duration_ms:.1f} ms  {title}" + reset_format()]
+    for s in spans:
+        label = "  " * s.depth + s.name
+        details = ", ".join(f"{k}={v}" for k, v in s.attrs.items())
+        lines.append(
+            text_theme('info') + f"{label:<32}{s.duration_ms:>10.1f} ms {s.duration_ms / total:>6.1%}" + reset_format()
+            + (f"  {details}" if details else "")
+        )
+    return "\n".join(lines)
+
+def span(name: str, **attrs):
+    """Opens a span; use as a context manager.
+
+    Args:
+        name: Stage name
+        **attrs: Extra attributes recorded with the span
+
+    Returns:
+        Span, or a no-op stand-in when tracing is off
+    """
+
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, attrs)
+
+def record_span(name: str, start: float, end: float = None, **attrs):
+    """Records a span that was timed by hand, under the currently open span.
+
+    Used where a context manager cannot be held open, e.g. around a
+    generator whose consumer may stop early.
+
+    Args:
+        name: Stage name
+        start: time.perf_counter() value when the stage began
+        end: time.perf_counter() value when it ended (default: now)
+        **attrs: Extra attributes recorded with the span
+    """
+
+    tracer = _tracer
+    if tracer is None:
+        return
+    finished = Span(tracer, name, attrs)
+    finished._attach()
+    finished.start = start
+    finished.end = end if end is not None else time.perf_counter()
+    finished._close()
+
+def configure(profile: bool = False, trace_file: str = None):
+    """Turns tracing on or off.
+
+    Args:
+        profile: Print a per-request breakdown
+        trace_file: JSON Lines trace file (optional)
+    """
+
+    global _tracer
+    trace_file = os.path.expanduser(trace_file.strip()) if trace_file and trace_file.strip() else None
+    _tracer = Tracer(profile, trace_file) if profile or trace_file else None
+
+def is_profiling() -> bool:
+    return _tracer is not None and _tracer.profile
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from typing import Optional
+
+from .setup import CONFIG_DIR
+
+CACHE_FILE = os.path.join(CONFIG_DIR, "translation_cache.db")
+
+# Words suggesting the request depends on what is in the current directory
+CWD_HINTS = re.compile(r"\b(here|this|these|current|cwd|pwd)\b|(^|\s)[.~]|[/\\]")
+
+def normalize_input(user_input: str) -> str:
+    """Normalizes a request so trivial variations share a cache entry.
+
+    Args:
+        user_input: User's natural language request
+
+    Returns:
+        Lowercased request with collapsed whitespace and no trailing punctuation
+    """
+
+    return re.sub(r"\s+", " ", user_input.strip().lower()).rstrip(" .!")
+
+def cwd_context(user_input: str, cwd: str) -> str:
+    """Returns the part of the working directory that affects a translation.
+
+    Requests that mention the current location or a path are tied to cwd;
+    generic ones ("show disk usage") are shared across directories.
+
+    Args:
+        user_input: User's natural language request
+        cwd: Current working directory
+
+    Returns:
+        cwd if the translation depends on it, otherwise an empty string
+    """
+
+    return cwd if CWD_HINTS.search(normalize_input(user_input)) else ""
+
+class TranslationCache:
+    def __init__(self, path: str = None, max_entries: int = 1000, ttl_seconds: float = 30 * 86400):
+        """Persistent natural language -> command cache shared between processes.
+
+        Uses SQLite in WAL mode so several promptshell processes can read and
+        write concurrently. Entries expire after ttl_seconds and the least
+        recently used ones are evicted beyond max_entries.
+
+        Args:
+            path: Database file (default: CACHE_FILE)
+            max_entries: Maximum number of cached translations
+            ttl_seconds: Lifetime of an entry in seconds
+        """
+
+        self.path = path or CACHE_FILE
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    command TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations(last_used)")
+        except sqlite3.Error:
+            self._db = None  # Caching is best effort; run without it
+
+    @staticmethod
+    def make_key(user_input: str, os_name: str, model: str, provider: str, cwd: str) -> str:
+        """Builds the cache key for a translation request.
+
+        Args:
+            user_input: User's natural language request
+            os_name: Current OS name
+            model: Active model name
+            provider: Active provider name
+            cwd: Current working directory
+
+        Returns:
+            Hex digest identifying the request
+        """
+
+        parts = [normalize_input(user_input), os_name, model, provider, cwd_context(user_input, cwd)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Looks up a cached command and marks it as recently used.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached command or None
+        """
+
+        if self._db is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT command FROM translations WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row:
+                    self._db.execute("UPDATE translations SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, command: str):
+        """Stores a translation and evicts stale or surplus entries.
+
+        Args:
+            key: Cache key from make_key
+            command: Translated command
+        """
+
+        if self._db is None:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations (key, command, created_at, last_used) VALUES (?, ?, ?, ?)",
+                        (key, command, now, now)
+                    )
+                    self._db.execute("DELETE FROM translations WHERE created_at <= ?", (now - self.ttl_seconds,))
+                    self._db.execute(
+                        "DELETE FROM translations WHERE key NOT IN "
+                        "(SELECT key FROM translations ORDER BY last_used DESC LIMIT ?)",
+                        (self.max_entries,)
+                    )
+                    self._db.execute("COMMIT")
+                except sqlite3.Error:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error:
+            pass
+
+    def invalidate(self, key: str):
+        """Removes a translation, e.g. after the command failed.
+
+        Args:
+            key: Cache key from make_key
+        """
+
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM translations WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Closes the database; the cache then behaves as if it could not be opened."""
+
+        if self._db is None:
+            return
+        with self._lock:
+            db, self._db = self._db, None
+            db.close()
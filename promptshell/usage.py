@@ -0,0 +1,320 @@
+"""
+Token usage and cost accounting
+-------------------------------
+Every provider call made by a Node is metered: backends report the token
+counts their API returns, and calls whose provider reports nothing are
+estimated from the text length (~4 characters per token).
+
+Usage is aggregated for the session per role (Command Executor, Debugger
+Expert, ...) and per provider/model, and shown by the `--stats` command.
+
+Backends report usage from inside call/stream/acall:
+    report_usage(prompt_tokens=..., completion_tokens=..., generation_seconds=...,
+                 cached_tokens=...)
+
+cached_tokens is the part of the prompt served from the provider's prompt
+cache (the static role definition, when caching works).
+"""
+
+import contextvars
+import threading
+import time
+
+from .format_utils import text_theme, reset_format
+
+# Estimated USD per million tokens (input, output), matched by model name prefix.
+# Override with PRICE_INPUT_PER_MTOK / PRICE_OUTPUT_PER_MTOK in the configuration.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "chatgpt-4o": (5.00, 15.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "o1-mini": (1.10, 4.40),
+    "o1": (15.00, 60.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-opus": (15.00, 75.00),
+    "claude-3-sonnet": (3.00, 15.00),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-1.5-flash-8b": (0.0375, 0.15),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama3-70b-8192": (0.59, 0.79),
+    "llama3-8b-8192": (0.05, 0.08),
+    "mixtral-8x7b-32768": (0.24, 0.24),
+    "gemma2-9b-it": (0.20, 0.20),
+    "deepseek-chat": (0.27, 1.10),
+}
+
+# Providers that run on the user's machine
+FREE_PROVIDERS = {"ollama", "replay"}
+
+_current_meter = contextvars.ContextVar("promptshell_usage_meter", default=None)
+
+def estimate_tokens(text_chars: int) -> int:
+    return (text_chars + 3) // 4
+
+def report_usage(prompt_tokens: int = None, completion_tokens: int = None, generation_seconds: float = None,
+                 cached_tokens: int = None):
+    """Reports the usage returned by a provider API for the call in progress.
+
+    Args:
+        prompt_tokens: Input tokens, including cached ones
+        completion_tokens: Output tokens generated
+        generation_seconds: Time spent generating the output, if the API reports it
+        cached_tokens: Input tokens read from the provider's prompt cache, if the API reports it
+    """
+
+    meter = _current_meter.get()
+    if meter is None:
+        return
+    if prompt_tokens is not None:
+        meter.prompt_tokens = prompt_tokens
+    if completion_tokens is not None:
+        meter.completion_tokens = completion_tokens
+    if generation_seconds:
+        meter.generation_seconds = generation_seconds
+    if cached_tokens is not None:
+        meter.cached_tokens = cached_tokens
+
+def attribute_call(node):
+    """Attributes the call in progress to another provider/model (e.g. the winner of a hedged request).
+
+    Args:
+        node: Node, or proxy, carrying the provider and model that answered
+    """
+
+    meter = _current_meter.get()
+    if meter is not None:
+        meter.node = node
+
+def price_for(model: str, provider: str, config: dict = None) -> tuple:
+    """Gets the (input, output) price per million tokens for a model.
+
+    Args:
+        model: Model name
+        provider: Provider name
+        config: Configuration dictionary with optional price overrides
+
+    Returns:
+        Tuple of prices in USD, or None if unknown
+    """
+
+    config = config or {}
+    try:
+        override = (float(config["PRICE_INPUT_PER_MTOK"]), float(config["PRICE_OUTPUT_PER_MTOK"]))
+        return override
+    except (KeyError, ValueError):
+        pass
+    if provider in FREE_PROVIDERS:
+        return (0.0, 0.0)
+    name = (model or "").split("/")[-1].lower()
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    return None
+
+class UsageTotals:
+    def __init__(self):
+        self.calls = 0
+        self.estimated_calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+        self.generation_seconds = 0.0
+        self.cost = 0.0
+        self.unpriced_calls = 0
+
+    def add(self, other: "UsageTotals"):
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def tokens_per_second(self) -> float:
+        seconds = self.generation_seconds or self.seconds
+        return self.completion_tokens / seconds if seconds else 0.0
+
+class UsageStats:
+    def __init__(self):
+        """Session-wide usage, keyed by (role, provider, model)."""
+
+        self.started = time.time()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, role: str, provider: str, model: str, prompt_tokens: int, completion_tokens: int,
+               seconds: float, generation_seconds: float = 0.0, estimated: bool = False, config: dict = None,
+               cached_tokens: int = 0):
+        """Adds one provider call.
+
+        Args:
+            role: Node role name
+            provider: Provider name
+            model: Model name
+            prompt_tokens: Input tokens
+            completion_tokens: Output tokens
+            seconds: Wall-clock duration of the call
+            generation_seconds: Generation time reported by the provider (optional)
+            estimated: Token counts were estimated from text length
+            config: Configuration dictionary (for price overrides)
+            cached_tokens: Input tokens served from the provider's prompt cache
+        """
+
+        price = price_for(model, provider, config)
+        with self._lock:
+            totals = self._entries.setdefault((role, provider, model), UsageTotals())
+            totals.calls += 1
+            totals.estimated_calls += int(estimated)
+            totals.prompt_tokens += prompt_tokens
+            totals.cached_tokens += cached_tokens or 0
+            totals.completion_tokens += completion_tokens
+            totals.seconds += seconds
+            totals.generation_seconds += generation_seconds or 0.0
+            if price is None:
+                totals.unpriced_calls += 1
+            else:
+                totals.cost += (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+    def by(self, field: str) -> dict:
+        """Aggregates the session usage by 'role', 'provider' or 'session'.
+
+        Args:
+            field: Grouping
+
+        Returns:
+            Dictionary mapping group labels to UsageTotals
+        """
+
+        groups = {}
+        with self._lock:
+            for (role, provider, model), totals in self._entries.items():
+                label = {"role": role, "provider": f"{provider} ({model})", "session": "Session total"}[field]
+                groups.setdefault(label, UsageTotals()).add(totals)
+        return groups
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.started = time.time()
+
+session_stats = UsageStats()
+
+class CallMeter:
+    def __init__(self, node, prompt: str, stats: UsageStats = None):
+        """Meters one provider call made by a Node.
+
+        Use as a context manager around a blocking or async call, or wrap a
+        stream with iterate() and call finish() when it ends.
+
+        Args:
+            node: Calling Node instance
+            prompt: Prompt sent to the provider
+            stats: Aggregate to record into (default: session_stats)
+        """
+
+        self.node = node
+        self.prompt_chars = len(prompt)
+        self.stats = stats or session_stats
+        self.output = ""
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.generation_seconds = None
+        self.cached_tokens = None
+        self.start = time.perf_counter()
+        self._token = None
+        self._done = False
+
+    def __enter__(self):
+        self._token = _current_meter.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_meter.reset(self._token)
+        if exc_type is None:
+            self.finish()
+        return False
+
+    def iterate(self, chunks):
+        """Passes a stream through, making this meter current while it produces chunks.
+
+        Args:
+            chunks: Iterable of response chunks from a backend
+
+        Yields:
+            The same chunks
+        """
+
+        iterator = iter(chunks)
+        while True:
+            token = _current_meter.set(self)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current_meter.reset(token)
+            self.output += chunk
+            yield chunk
+
+    def finish(self, output: str = None):
+        """Records the call (once), estimating whatever the provider did not report.
+
+        Args:
+            output: Response text (default: the text seen by iterate())
+        """
+
+        if self._done:
+            return
+        self._done = True
+        if output is not None:
+            self.output = output
+        estimated = self.prompt_tokens is None or self.completion_tokens is None
+        prompt_tokens = self.prompt_tokens if self.prompt_tokens is not None else estimate_tokens(self.prompt_chars)
+        completion_tokens = self.completion_tokens if self.completion_tokens is not None else estimate_tokens(len(self.output))
+        self.stats.record(
+            self.node.name, self.node.provider, self.node.model_name, prompt_tokens, completion_tokens,
+            time.perf_counter() - self.start, self.generation_seconds, estimated, self.node.config,
+            self.cached_tokens
+        )
+
+def format_stats(stats: UsageStats = None, definitions: dict = None) -> str:
+    """Formats the session usage as tables per role and per provider.
+
+    Args:
+        stats: Usage to report (default: session_stats)
+        definitions: Role name -> system prompt, to show its size (optional)
+
+    Returns:
+        Printable report
+    """
+
+    stats = stats or session_stats
+    groups = stats.by("session")
+    if not groups:
+        return text_theme('info') + "No AI calls made in this session yet." + reset_format()
+
+    definitions = definitions or {}
+    header = f"{'':<34}{'Calls':>6}{'Prompt tok':>12}{'Avg prompt':>12}{'Cached':>9}{'Output tok':>12}{'Tok/s':>8}{'Est. cost':>11}"
+    lines = []
+    for title, field in (("[Usage by role]", "role"), ("[Usage by provider]", "provider"), ("", "session")):
+        if title:
+            lines.append("\n" + text_theme('section_header', bold=True) + title + reset_format())
+            lines.append(text_theme('info') + header + reset_format())
+        for label, totals in sorted(stats.by(field).items()):
+            marker = "~" if totals.estimated_calls else " "
+            cost = "n/a" if totals.unpriced_calls == totals.calls else f"${totals.cost:.4f}"
+            name = label
+            if field == "role" and label in definitions:
+                name = f"{label} (system ~{estimate_tokens(len(definitions[label]))})"
+            lines.append(
+                f"{name:<34}{totals.calls:>6}{marker}{totals.prompt_tokens:>11,}{totals.prompt_tokens // totals.calls:>12,}"
+                f"{totals.cached_tokens / totals.prompt_tokens if totals.prompt_tokens else 0:>9.0%}"
+                f"{totals.completion_tokens:>12,}{totals.tokens_per_second:>8.1f}{cost:>11}"
+            )
+    if any(totals.estimated_calls for totals in groups.values()):
+        lines.append(text_theme('info') + "~ includes token counts estimated from text length" + reset_format())
+    return "\n".join(lines)
@@ -5,7 +5,7 @@ import os
 def mock_config_dir(tmp_path, mocker):
     """
     tmp_path creates a temporary config directory and mocks the constants in the
-    setup and alias_manager modules to use it.
+    setup module and the modules that keep files there to use it.
     """
 
     # Create a temporary directory for the test
@@ -18,4 +18,41 @@ def mock_config_dir(tmp_path, mocker):
 
     # The ALIAS_FILE is derived from CONFIG_DIR, so we must update it too
     mocker.patch('promptshell.alias_manager.ALIAS_FILE', os.path.join(str(temp_dir), "aliases.json"))
+    mocker.patch('promptshell.history_store.HISTORY_FILE', os.path.join(str(temp_dir), "history.db"))
+    mocker.patch('promptshell.translation_cache.CACHE_FILE', os.path.join(str(temp_dir), "translation_cache.db"))
+    mocker.patch('promptshell.executable_index.INDEX_FILE', os.path.join(str(temp_dir), "executables.json"))
+    mocker.patch('promptshell.system_info.SYSTEM_INFO_FILE', os.path.join(str(temp_dir), "system_info.json"))
+    mocker.patch('promptshell.tutorial.TUTORIAL_PROGRESS_FILE', os.path.join(str(temp_dir), "tutorial_progress.json"))
+
+    # The process-wide executable index remembers the file it was loaded from
+    mocker.patch('promptshell.executable_index._shared_index', None)
     return str(temp_dir)
+
+@pytest.fixture
+def confirm(mocker):
+    """Mock of questionary.confirm as used by the assistant; set confirm.return_value.ask.return_value."""
+
+    return mocker.patch('promptshell.ai_terminal_assistant.questionary.confirm')
+
+@pytest.fixture
+def make_assistant(mocker, mock_config_dir, confirm):
+    """
+    Returns a function building an AITerminalAssistant that does not scan PATH
+    or query the system. History, the translation cache and the warm-up are
+    off unless the given config turns them on; passing a HistoryStore turns
+    history on with that store.
+    """
+
+    from promptshell.ai_terminal_assistant import AITerminalAssistant
+
+    mocker.patch('promptshell.ai_terminal_assistant.get_executable_index')
+    mocker.patch.object(AITerminalAssistant, 'initialize_system_context')
+
+    def make(config=None, history=None):
+        settings = {"HISTORY": "off", "TRANSLATION_CACHE": "off", "WARM_UP": "off"}
+        if history is not None:
+            mocker.patch('promptshell.ai_terminal_assistant.HistoryStore', return_value=history)
+            settings["HISTORY"] = "on"
+        settings.update(config or {})
+        return AITerminalAssistant("model", config=settings)
+    return make
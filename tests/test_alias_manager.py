@@ -1,6 +1,9 @@
 import pytest
 import json
+import os
+import threading
 
+from promptshell import alias_manager as alias_module
 from promptshell.alias_manager import AliasManager, handle_alias_command
 
 # Use the fixture to ensure all tests in this class use a clean, temporary config directory.
@@ -99,6 +102,61 @@ class TestAliasManager:
         assert manager2.list_aliases("gco")["command"] == "git checkout"
         assert manager2.list_aliases('gco')["description"] == "changes git branch"
 
+    def test_changes_are_batched_into_one_save(self, mock_config_dir, mocker):
+        write = mocker.spy(alias_module, "write_json_atomic")
+        manager = AliasManager(save_delay=60)
+        for name in ("a", "b", "c"):
+            manager.add_alias(name, f"echo {name}")
+        manager.remove_alias("b")
+        assert write.call_count == 0
+        assert manager.expand_alias("a") == "echo a"
+
+        manager.flush()
+        assert write.call_count == 1
+        assert set(AliasManager().list_aliases()) == {"a", "c"}
+
+    def test_concurrent_shells_keep_each_others_aliases(self, mock_config_dir):
+        managers = [AliasManager(save_delay=0) for _ in range(4)]
+        def add_many(index, manager):
+            for i in range(25):
+                manager.add_alias(f"s{index}_{i}", f"echo {i}")
+        threads = [threading.Thread(target=add_many, args=item) for item in enumerate(managers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(AliasManager().list_aliases()) == 100
+        # Other shells' aliases show up without restarting
+        assert managers[0].expand_alias("s3_7 now") == "echo 7 now"
+
+    def test_failed_save_leaves_the_file_intact(self, mock_config_dir, mocker):
+        manager = AliasManager(save_delay=0)
+        manager.add_alias("gs", "git status")
+        mocker.patch("promptshell.alias_manager.json.dump", side_effect=OSError("disk full"))
+        with pytest.raises(OSError):
+            manager.add_alias("gp", "git push")
+        with open(f"{mock_config_dir}/aliases.json") as f:
+            assert list(json.load(f)["aliases"]) == ["gs"]
+        assert sorted(os.listdir(mock_config_dir)) == ["aliases.json", "aliases.json.lock"]
+        # The change stays pending and is written by the next save
+        assert "gp" in manager.list_aliases()
+
+    def test_bulk_import_validates_once_and_writes_once(self, mock_config_dir, tmp_path, mocker):
+        entries = {f"alias_{i}": {"command": f"echo {i}", "description": ""} for i in range(5000)}
+        entries["bad name"] = {"command": "ls"}
+        entries["boom"] = {"command": "rm -rf /"}
+        entries["nocmd"] = {"description": "missing command"}
+        source = tmp_path / "team_aliases.json"
+        source.write_text(json.dumps({"aliases": entries}))
+
+        write = mocker.spy(alias_module, "write_json_atomic")
+        manager = AliasManager()
+        success, message = manager.import_aliases(str(source))
+        assert success
+        assert "5000 imported, 3 skipped" in message
+        assert write.call_count == 1
+        assert len(AliasManager().list_aliases()) == 5000
+
 def test_handle_alias_command_add(mocker):
     # Mock the AliasManager instance that the handler function will use
     mock_manager = mocker.MagicMock(spec=AliasManager)
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import json
+
+from promptshell.batch import parse_batch_args, read_requests, run_batch
+
+class FakeCache:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, command):
+        self.entries[key] = command
+
+class FakeAssistant:
+    def __init__(self, commands, cache=None, delay=0.0):
+        self.commands = commands
+        self.translation_cache = cache or FakeCache()
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    def local_command(self, user_input):
+        return "ls -l" if user_input == "list files" else None
+
+    def gather_additional_data(self, user_input):
+        return {}
+
+    def translation_cache_key(self, user_input, additional_data=None):
+        return user_input
+
+    @staticmethod
+    def is_cacheable(command):
+        return bool(command) and not command.startswith("Error in processing")
+
+    async def atranslate_command(self, user_input, additional_data=None, remember=True):
+        assert remember is False
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return self.commands[user_input]
+
+def run(assistant, requests, **kwargs):
+    out = io.StringIO()
+    failures = asyncio.run(run_batch(assistant, requests, out=out, **kwargs))
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_parse_batch_args_defaults_to_stdin_dry_run():
+    args = parse_batch_args(["--batch"])
+    assert args.batch == "-"
+    assert args.workers == 4
+    assert not args.execute
+
+def test_read_requests_skips_blanks_and_comments(tmp_path):
+    path = tmp_path / "requests.txt"
+    path.write_text("list files\n\n# comment\n  show disk usage  \n")
+    assert read_requests(str(path)) == ["list files", "show disk usage"]
+
+def test_results_keep_input_order_and_report_cache_hits():
+    assistant = FakeAssistant({"a": "echo a", "b": "echo b"}, cache=FakeCache({"c": "echo c"}))
+    failures, records = run(assistant, ["a", "b", "c"])
+    assert failures == 0
+    assert [r["input"] for r in records] == ["a", "b", "c"]
+    assert [r["command"] for r in records] == ["echo a", "echo b", "echo c"]
+    assert [r["cached"] for r in records] == [False, False, True]
+    assert all(set(r) == {"input", "command", "latency_ms", "cached", "local"} for r in records)
+
+def test_common_requests_are_answered_locally():
+    assistant = FakeAssistant({"a": "echo a"})
+    failures, records = run(assistant, ["list files", "a"])
+    assert failures == 0
+    assert [r["command"] for r in records] == ["ls -l", "echo a"]
+    assert [r["local"] for r in records] == [True, False]
+    assert "list files" not in assistant.translation_cache.entries
+
+def test_workers_limit_concurrency():
+    commands = {str(i): f"echo {i}" for i in range(8)}
+    assistant = FakeAssistant(commands, delay=0.02)
+    run(assistant, list(commands), workers=3)
+    assert assistant.peak == 3
+
+def test_provider_errors_are_reported_not_returned_as_commands():
+    assistant = FakeAssistant({"a": "Error in processing: timeout"})
+    failures, records = run(assistant, ["a"])
+    assert failures == 1
+    assert records[0]["command"] is None
+    assert records[0]["error"] == "Error in processing: timeout"
+
+def test_execute_runs_commands_and_caches_successes(mocker):
+    mocker.patch("promptshell.batch.execute_batch_command", side_effect=[("ok\n", "", 0), ("", "boom\n", 2)])
+    assistant = FakeAssistant({"a": "echo ok", "b": "false"})
+    failures, records = run(assistant, ["a", "b"], execute=True)
+    assert failures == 1
+    assert records[0]["exit_code"] == 0 and records[0]["stdout"] == "ok\n"
+    assert records[1]["exit_code"] == 2
+    assert assistant.translation_cache.entries == {"a": "echo ok"}
+
+def test_execute_errors_fail_only_their_record():
+    assistant = FakeAssistant({"a": "definitely-not-a-command --x", "b": "echo b", "c": "echo 'unbalanced"})
+    failures, records = run(assistant, ["a", "b", "c"], execute=True)
+    assert failures == 2
+    assert "error" in records[0] and "exit_code" not in records[0]
+    assert records[1]["exit_code"] == 0 and records[1]["stdout"] == "b\n"
+    assert "error" in records[2]
+    assert assistant.translation_cache.entries == {"b": "echo b"}
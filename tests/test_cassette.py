@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+import time
+
+from types import SimpleNamespace
+
+from promptshell.node import Node
+from promptshell.providers import get_backend
+from promptshell.providers.cassette import Cassette, RecordingBackend, get_cassette
+from promptshell.resilience import ProviderError
+
+def slow_call(node, prompt):
+    time.sleep(0.05)
+    return "ls -la"
+
+def make_config(tmp_path, **extra):
+    return {"CASSETTE_FILE": str(tmp_path / "cassette.jsonl"), **extra}
+
+def test_get_backend_wraps_only_in_record_mode(tmp_path):
+    assert not isinstance(get_backend("ollama", make_config(tmp_path)), RecordingBackend)
+    assert isinstance(get_backend("ollama", make_config(tmp_path, CASSETTE_MODE="record")), RecordingBackend)
+
+def test_record_then_replay(mocker, tmp_path):
+    config = make_config(tmp_path)
+    live = SimpleNamespace(call=slow_call, stream=lambda node, prompt: iter(["git ", "status"]))
+    recorder = RecordingBackend(live, Cassette(config["CASSETTE_FILE"]), "ollama")
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    mocker.patch('promptshell.node.get_backend', return_value=recorder)
+    assert Node("model", "Command Executor", config=config)("list files") == "ls -la"
+    assert "".join(Node("model", "Question Answerer", config=config)("what changed?", stream=True)) == "git status"
+
+    mocker.patch('promptshell.node.get_provider', return_value="replay")
+    mocker.patch('promptshell.node.get_backend', side_effect=get_backend)
+    executor = Node("model", "Command Executor", config=config)
+    start = time.perf_counter()
+    assert executor("list files") == "ls -la"
+    assert time.perf_counter() - start < 0.05  # Instant by default
+    answerer = Node("model", "Question Answerer", config=config)
+    assert list(answerer("what changed?", stream=True)) == ["git ", "status"]
+    # Prompts include the conversation so far, so a fresh node sends the recorded one again
+    assert asyncio.run(Node("model", "Command Executor", config=config).acall("list files")) == "ls -la"
+
+def test_replay_with_recorded_latency(mocker, tmp_path, capsys):
+    config = make_config(tmp_path, REPLAY_LATENCY="recorded", REPLAY_FALLBACK="on")
+    recorder = RecordingBackend(SimpleNamespace(call=slow_call), get_cassette(config), "groq")
+    recorder.call(SimpleNamespace(name="Debugger Expert", provider="groq", model_name="m"), "prompt")
+
+    mocker.patch('promptshell.node.get_provider', return_value="replay")
+    node = Node("model", "Debugger Expert", config=config)
+    start = time.perf_counter()
+    assert node("something else entirely") == "ls -la"  # Falls back to the role's recordings
+    assert time.perf_counter() - start >= 0.05
+    assert "not recorded" in capsys.readouterr().out
+
+def test_unrecorded_prompt_is_an_error_without_fallback(mocker, tmp_path):
+    config = make_config(tmp_path)
+    recorder = RecordingBackend(SimpleNamespace(call=slow_call), Cassette(config["CASSETTE_FILE"]), "groq")
+    recorder.call(SimpleNamespace(name="Command Executor", provider="groq", model_name="m"), "list files")
+
+    cassette = Cassette(config["CASSETTE_FILE"])
+    assert cassette.lookup("Command Executor", "list files")["response"] == "ls -la"
+    with pytest.raises(LookupError):
+        cassette.lookup("Command Executor", "delete everything")
+    assert cassette.lookup("Command Executor", "delete everything", fallback=True)["fallback"] is True
+    mocker.patch('promptshell.node.get_provider', return_value="replay")
+    with pytest.raises(ProviderError, match="No recorded response"):
+        Node("model", "Command Executor", config=config)("delete everything")
+
+def test_missing_recording_is_an_error(mocker, tmp_path):
+    mocker.patch('promptshell.node.get_provider', return_value="replay")
+    node = Node("model", "Error Handler", config=make_config(tmp_path))
+    with pytest.raises(ProviderError, match="No recorded response"):
+        node("anything")
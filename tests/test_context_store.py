@@ -0,0 +1,34 @@
+from promptshell.context_store import ContextStore, attachment_ref, estimate_tokens
+
+def test_render_is_incremental_history():
+    store = ContextStore(token_budget=1000)
+    store.append("user", "list files")
+    store.append("assistant", "ls -l")
+    assert store.render() == "user list files\nassistant ls -l\n"
+    assert list(store)[-1] == {"role": "assistant", "content": "ls -l"}
+
+def test_oldest_turns_are_evicted_over_budget():
+    store = ContextStore(token_budget=50)
+    for i in range(20):
+        store.append("user", f"request number {i} " * 3)
+    assert store.tokens <= 50
+    assert "request number 19" in store.render()
+    assert "request number 0 " not in store.render()
+    assert store.render() == "".join(f"{t['role']} {t['content']}\n" for t in store)
+
+def test_oversized_turn_is_truncated():
+    store = ContextStore(token_budget=10)
+    store.append("user", "x" * 1000)
+    assert len(store) == 1
+    assert store[0]["content"].endswith("[truncated]")
+
+def test_large_attachments_are_kept_as_a_hash():
+    store = ContextStore(token_budget=1000, attachment_threshold=100)
+    big = "line of log output\n" * 500
+    store.append("user", "summarize this file", {"file_content": big, "target_file": "app.log"})
+    assert big not in store.render()
+    assert "target_file: app.log" in store.render()
+    assert f"[file_content: attachment {attachment_ref(big)}]" in store.render()
+
+def test_estimate_tokens():
+    assert estimate_tokens("abcd" * 10) == 11
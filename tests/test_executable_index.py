@@ -0,0 +1,85 @@
+import os
+import stat
+
+from promptshell.executable_index import ExecutableIndex, scan_directory
+
+def make_executable(directory, name):
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+def test_scan_directory_lists_only_executables(tmp_path):
+    make_executable(tmp_path, "tool")
+    (tmp_path / "notes.txt").write_text("not executable")
+    (tmp_path / "subdir").mkdir()
+    assert scan_directory(str(tmp_path)) == ["tool"]
+
+def test_index_is_persisted_and_only_changed_dirs_rescanned(tmp_path):
+    bin_a, bin_b = tmp_path / "a", tmp_path / "b"
+    bin_a.mkdir()
+    bin_b.mkdir()
+    make_executable(bin_a, "git")
+    make_executable(bin_b, "rg")
+    index_file = str(tmp_path / "index.json")
+
+    index = ExecutableIndex([str(bin_a), str(bin_b)], index_file=index_file)
+    assert not index.is_built
+    assert index.refresh() == 2
+    assert index.commands() == ["git", "rg"]
+
+    # A new process reuses the saved index and rescans nothing
+    index = ExecutableIndex([str(bin_a), str(bin_b)], index_file=index_file)
+    assert index.is_built
+    assert index.commands() == ["git", "rg"]
+    assert index.refresh() == 0
+
+    make_executable(bin_b, "fd")
+    os.utime(bin_b, (0, 12345))  # Make sure the mtime changes even on coarse filesystems
+    assert index.refresh() == 1
+    assert index.commands() == ["fd", "git", "rg"]
+
+def test_missing_path_directories_do_not_force_a_rebuild(tmp_path):
+    bin_a, missing = tmp_path / "a", tmp_path / "missing"
+    bin_a.mkdir()
+    make_executable(bin_a, "git")
+    index_file = str(tmp_path / "index.json")
+    index = ExecutableIndex([str(bin_a), str(missing)], index_file=index_file)
+    index.refresh()
+
+    index = ExecutableIndex([str(bin_a), str(missing)], index_file=index_file)
+    assert index.is_built
+    assert index.refresh() == 0
+
+    # A directory created later is picked up on the next refresh
+    missing.mkdir()
+    make_executable(missing, "rg")
+    assert index.refresh() == 1
+    assert index.commands() == ["git", "rg"]
+
+def test_background_refresh(tmp_path):
+    make_executable(tmp_path, "docker")
+    index = ExecutableIndex([str(tmp_path)], index_file=str(tmp_path / "index.json"))
+    index.refresh_in_background().join(timeout=5)
+    assert index.commands() == ["docker"]
+
+def make_index(tmp_path, names):
+    for name in names:
+        make_executable(tmp_path, name)
+    index = ExecutableIndex([str(tmp_path)], index_file=str(tmp_path / "index.json"))
+    index.refresh()
+    return index
+
+def test_relevant_commands_prefer_installed_family_tools(tmp_path):
+    index = make_index(tmp_path, ["grep", "rg", "find", "fd", "git", "docker", "kubectl", "zip", "ls"])
+    assert index.relevant_commands("search for TODO in the source")[:2] == ["rg", "grep"]
+    assert index.relevant_commands("find files named setup.py")[:2] == ["fd", "find"]
+    assert index.relevant_commands("list running docker containers") == ["docker"]
+    assert index.relevant_commands("restart the pods in namespace web") == ["kubectl"]
+    assert index.relevant_commands("what is the weather like") == []
+
+def test_relevant_commands_put_named_commands_first(tmp_path):
+    index = make_index(tmp_path, ["grep", "rg", "python3", "python3-config", "python3.12", "pip3"])
+    assert index.relevant_commands("use grep to search logs")[0] == "grep"
+    assert index.relevant_commands("run the python tests")[:2] == ["python3", "pip3"]
+    assert len(index.relevant_commands("search text with grep or rg", limit=1)) == 1
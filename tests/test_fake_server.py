@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fake_server import FakeLLMServer
+from benchmarks.run import compare, summarize
+from promptshell.node import Node
+from promptshell.providers import close_clients
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(response="ls -la /tmp") as server:
+        yield server
+    close_clients()
+
+def make_node(mocker, provider, server):
+    mocker.patch('promptshell.node.get_provider', return_value=provider)
+    config = {"OLLAMA_HOST": server.url, "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": server.url + "/v1"}
+    return Node("fake-model", "Command Executor", config=config)
+
+@pytest.mark.parametrize("provider", ["ollama", "openai"])
+def test_providers_talk_to_fake_server(mocker, server, provider):
+    node = make_node(mocker, provider, server)
+    assert node("list files") == "ls -la /tmp"
+    assert "".join(node("list files", stream=True)) == "ls -la /tmp"
+    assert asyncio.run(node.acall("list files")) == "ls -la /tmp"
+    assert len(server.requests) == 3
+    assert all("list files" in str(body) for _, body in server.requests)
+
+def test_latency_and_token_rate(mocker, server):
+    server.latency, server.tokens_per_second = 0.1, 20  # 3 tokens -> 2 gaps of 50ms
+    node = make_node(mocker, "ollama", server)
+    start = time.perf_counter()
+    node("list files")
+    assert time.perf_counter() - start >= 0.2
+
+def test_compare_flags_regressions():
+    baseline = {"meta": {"commit": "a"}, "startup": {"version": summarize([0.100, 0.100])}}
+    current = {"meta": {"commit": "b"}, "startup": {"version": summarize([0.150, 0.150])}}
+    rows = {name: regressed for name, _, _, _, regressed in compare(baseline, current)}
+    assert rows["startup.version.median_ms"] is True
+    assert "startup.version.runs" not in rows
+
+@pytest.mark.parametrize("provider, path", [("ollama", "/api/chat"), ("openai", "/v1/chat/completions")])
+def test_role_definition_is_sent_as_leading_system_message(mocker, server, provider, path):
+    node = make_node(mocker, provider, server)
+    node.definition = "[ROLE] Shell Command Interpreter"
+    node("list files")
+    node("show disk usage")
+    (first_path, first), (_, second) = server.requests
+    assert first_path == path
+    assert first["messages"][0] == second["messages"][0] == {"role": "system", "content": "[ROLE] Shell Command Interpreter"}
+    assert [m["role"] for m in second["messages"]] == ["system", "user", "assistant", "user"]
@@ -0,0 +1,41 @@
+from promptshell.file_context import gather_file_contexts, is_binary, query_terms, read_file_context
+
+def test_small_text_file_is_read_whole(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("hello\nworld\n")
+    assert read_file_context(str(path)) == "hello\nworld\n"
+
+def test_binary_file_is_skipped(tmp_path):
+    path = tmp_path / "image.bin"
+    path.write_bytes(b"\x89PNG\x00\x01\x02" * 100)
+    assert read_file_context(str(path)).startswith("[binary file, 700 bytes")
+
+def test_is_binary_tolerates_cut_multibyte_character():
+    assert not is_binary("héllo".encode("utf-8")[:2])
+
+def test_large_file_is_sampled_with_matching_lines(tmp_path):
+    path = tmp_path / "app.log"
+    lines = [f"INFO request {i} ok" for i in range(100000)]
+    lines[50000] = "ERROR database timeout in request 50000"
+    path.write_text("\n".join(lines) + "\n")
+
+    content = read_file_context(str(path), terms=["ERROR"], token_budget=500)
+    assert len(content) < 2500
+    assert content.startswith("[large file")
+    assert "INFO request 0 ok" in content
+    assert "INFO request 99999 ok" in content
+    assert "ERROR database timeout in request 50000" in content
+    assert "bytes omitted" in content
+
+def test_query_terms_skip_stopwords_and_paths():
+    assert query_terms("read the ERROR lines from app.log", ["app.log"]) == ["ERROR"]
+
+def test_multiple_files_share_the_budget(tmp_path):
+    paths = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_text("x" * 10000)
+        paths.append(str(path))
+    contents = gather_file_contexts(paths, "merge a.txt and b.txt", token_budget=1000)
+    assert list(contents) == paths
+    assert all(len(content) < 2500 for content in contents.values())
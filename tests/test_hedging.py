@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+import time
+
+from types import SimpleNamespace
+
+from benchmarks.fake_server import FakeLLMServer
+from promptshell.hedging import HedgedBackend, hedge_settings
+from promptshell.node import Node
+from promptshell.providers import close_clients
+
+def slow_stream(delay, chunks, log):
+    def stream(node, prompt):
+        try:
+            time.sleep(delay)
+            for chunk in chunks:
+                yield chunk
+        finally:
+            log.append(node.provider)
+    return stream
+
+def make_backend(delay, chunks, log):
+    return SimpleNamespace(stream=slow_stream(delay, chunks, log))
+
+def hedged(primary, secondary, delay=0.05):
+    return HedgedBackend(primary, secondary, "openai", "gpt-4o-mini", delay)
+
+def test_settings():
+    assert hedge_settings({}, "ollama", "llama3") is None
+    assert hedge_settings({"HEDGE_PROVIDER": "ollama"}, "ollama", "llama3") is None
+    assert hedge_settings({"HEDGE_PROVIDER": "openai", "HEDGE_MODEL": "gpt-4o", "HEDGE_DELAY_MS": "500"}, "ollama", "llama3") == ("openai", "gpt-4o", 0.5)
+
+def test_fast_primary_is_not_hedged():
+    finished = []
+    backend = hedged(make_backend(0, ["ls"], finished), make_backend(0, ["pwd"], finished), delay=1)
+    node = SimpleNamespace(provider="ollama", model_name="llama3")
+    assert backend.call(node, "list") == "ls"
+    assert finished == ["ollama"]
+
+def test_slow_primary_loses_to_secondary():
+    finished = []
+    backend = hedged(make_backend(0.5, ["ls", " -la"], finished), make_backend(0, ["ls", " -l"], finished))
+    node = SimpleNamespace(provider="ollama", model_name="llama3")
+    start = time.perf_counter()
+    assert list(backend.stream(node, "list")) == ["ls", " -l"]
+    assert time.perf_counter() - start < 0.4
+    time.sleep(0.6)
+    assert finished == ["openai", "ollama"]  # The primary stream was closed, not read to the end
+
+def test_failed_primary_hedges_immediately():
+    def failing(node, prompt):
+        raise ConnectionError("500 - busy")
+    for primary in (SimpleNamespace(call=failing), SimpleNamespace(call=lambda node, prompt: "  ")):
+        backend = hedged(primary, make_backend(0, ["pwd"], []), delay=5)
+        start = time.perf_counter()
+        assert backend.call(SimpleNamespace(provider="ollama", model_name="llama3"), "where") == "pwd"
+        assert time.perf_counter() - start < 1
+
+def test_answers_starting_with_error_are_kept():
+    answer = "Error: permission denied, run it with sudo"
+    backend = hedged(SimpleNamespace(call=lambda node, prompt: answer), make_backend(0, ["pwd"], []), delay=5)
+    node = SimpleNamespace(provider="ollama", model_name="llama3")
+    assert backend.call(node, "why") == answer
+    async def acall(node, prompt):
+        return answer
+    backend = hedged(SimpleNamespace(acall=acall), SimpleNamespace(acall=acall), delay=5)
+    assert asyncio.run(backend.acall(node, "why")) == answer
+
+def test_all_failures_raise_primary_error():
+    def broken(node, prompt):
+        raise ConnectionError(f"{node.provider} refused")
+    backend = hedged(SimpleNamespace(call=broken), SimpleNamespace(call=broken))
+    with pytest.raises(ConnectionError, match="ollama refused"):
+        backend.call(SimpleNamespace(provider="ollama", model_name="llama3"), "x")
+
+def test_acall_cancels_the_loser():
+    cancelled = []
+    async def slow(node, prompt):
+        try:
+            await asyncio.sleep(1)
+            return "slow"
+        except asyncio.CancelledError:
+            cancelled.append(node.provider)
+            raise
+    async def fast(node, prompt):
+        return "fast"
+    backend = hedged(SimpleNamespace(acall=slow), SimpleNamespace(acall=fast))
+    node = SimpleNamespace(provider="ollama", model_name="llama3")
+    assert asyncio.run(backend.acall(node, "x")) == "fast"
+    assert cancelled == ["ollama"]
+
+def test_node_hedges_between_real_servers(mocker):
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    with FakeLLMServer(response="ls -la", latency=1.0) as slow, FakeLLMServer(response="ls -l") as fast:
+        config = {
+            "OLLAMA_HOST": slow.url, "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": fast.url + "/v1",
+            "HEDGE_PROVIDER": "openai", "HEDGE_MODEL": "fake-model", "HEDGE_DELAY_MS": "100",
+        }
+        node = Node("llama3", "Command Executor", config=config)
+        start = time.perf_counter()
+        assert node("list files") == "ls -l"
+        assert "".join(node("list files", stream=True)) == "ls -l"
+        assert asyncio.run(node.acall("list files")) == "ls -l"
+        assert time.perf_counter() - start < 2.5
+    close_clients()
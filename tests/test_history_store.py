@@ -0,0 +1,71 @@
+import time
+
+from promptshell.history_store import HistoryStore, fts_query, handle_history_command
+
+def make_store(tmp_path, **kwargs):
+    return HistoryStore(path=str(tmp_path / "history.db"), **kwargs)
+
+def test_records_are_searchable_by_request_and_command(tmp_path):
+    store = make_store(tmp_path)
+    store.add("show running containers", "docker ps", "/srv", 0, 120.0)
+    store.add("list files", "ls -l", "/home", 0, 3.0)
+    store.add("!docker compose up", "docker compose up", "/srv/app", 1, 900.0)
+
+    assert [e["command"] for e in store.search("docker")] == ["docker compose up", "docker ps"]
+    assert [e["command"] for e in store.search("contain")] == ["docker ps"]  # Words match as prefixes
+    assert store.search("docker containers")[0] == {
+        "input": "show running containers", "command": "docker ps", "cwd": "/srv",
+        "exit_code": 0, "duration_ms": 120.0, "timestamp": store.search("docker containers")[0]["timestamp"],
+    }
+    assert [e["command"] for e in store.search("docker", successful_only=True)] == ["docker ps"]
+    assert store.search("") == [] and fts_query("what's up?") == '"what"* AND "s"* AND "up"*'
+
+def test_history_survives_restarts_and_is_pruned(tmp_path):
+    store = make_store(tmp_path, max_entries=3)
+    for i in range(5):
+        store.add(f"request {i}", f"echo {i}", "/tmp", 0, 1.0)
+    store = make_store(tmp_path, max_entries=3)
+    assert [e["command"] for e in store.recent()] == ["echo 4", "echo 3", "echo 2"]
+    # Pruned rows are removed from the search index too
+    assert len(store.search("request")) == 3
+    store.clear()
+    assert store.recent() == [] and store.search("request") == []
+
+def test_relevant_entries_are_distinct_commands(tmp_path):
+    store = make_store(tmp_path)
+    for _ in range(3):
+        store.add("deploy the site", "rsync -a site/ web:/var/www", "/proj", 0, 50.0)
+    store.add("git status", "git status", "/proj", 0, 10.0)
+    relevant = store.relevant("deploy the site again", limit=5)
+    assert [e["command"] for e in relevant] == ["rsync -a site/ web:/var/www"]
+
+def test_search_stays_fast_on_large_histories(tmp_path):
+    store = make_store(tmp_path)
+    rows = [(f"request number {i}", f"echo {i} tool{i % 1000}", "/tmp", 0, 1.0, float(i)) for i in range(100000)]
+    store._db.execute("BEGIN")
+    store._db.executemany(
+        "INSERT INTO history (input, command, cwd, exit_code, duration_ms, timestamp) VALUES (?, ?, ?, ?, ?, ?)", rows
+    )
+    store._db.execute("COMMIT")
+    start = time.perf_counter()
+    results = store.search("tool123")
+    assert len(results) == 20
+    assert time.perf_counter() - start < 0.1
+
+def test_history_command(tmp_path):
+    store = make_store(tmp_path)
+    store.add("show disk usage", "df -h", "/", 0, 5.0)
+    assert "show disk usage -> df -h" in handle_history_command("history search disk", store)
+    assert "No matching commands" in handle_history_command("history search kubectl", store)
+    assert "df -h" in handle_history_command("history list", store)
+    assert "disabled" in handle_history_command("history search disk", None)
+
+def test_prompts_use_relevant_history(make_assistant, tmp_path):
+    assistant = make_assistant(history=make_store(tmp_path))
+    assistant.history.add("start the database", "docker start pg", "/proj", 0, 300.0)
+    for i in range(20):
+        assistant.history.add(f"echo {i}", f"echo {i}", "/proj", 0, 1.0)
+
+    assert "start the database -> docker start pg" in assistant.question_prompt("why won't my database start?")
+    assert "docker start pg" in assistant.translation_prompt("start the database container")
+    assert "docker start pg" not in assistant.translation_prompt("list python files")
@@ -0,0 +1,64 @@
+import pytest
+
+from promptshell.intent_matcher import IntentMatcher, find_size
+
+@pytest.mark.parametrize("request_text, command", [
+    ("list files", "ls -l"),
+    ("Please list all the files here", "ls -l"),
+    ("show files in src", "ls -l src"),
+    ("show current directory", "pwd"),
+    ("disk usage", "df -h"),
+    ("show disk usage of /var/log", "du -sh /var/log"),
+    ("create directory build", "mkdir build"),
+    ("make a new folder called \"my project\"", "mkdir 'my project'"),
+    ("delete file notes.txt", "CONFIRM: rm notes.txt"),
+    ("copy a.txt to backup/a.txt", "cp a.txt backup/a.txt"),
+    ("search for TODO in src", "grep -rn TODO src"),
+    ("find files larger than 100MB", "find . -type f -size +100M"),
+    ("show the contents of README.md", "cat README.md"),
+])
+def test_common_requests_are_translated_locally(request_text, command):
+    assert IntentMatcher("linux").match(request_text) == command
+
+@pytest.mark.parametrize("request_text", [
+    "list files changed by bob last week",
+    "create directory for the new release",
+    "delete file -rf",
+    "list files in this",
+    "copy it to backup",
+])
+def test_anything_else_falls_through_to_the_llm(request_text):
+    assert IntentMatcher("linux").match(request_text) is None
+
+def test_templates_follow_the_operating_system():
+    windows = IntentMatcher("windows")
+    assert windows.match("list files") == "dir"
+    assert windows.match("create directory \"my project\"") == 'mkdir "my project"'
+    # Intents without a simple Windows equivalent are left to the LLM
+    assert windows.match("find files larger than 1GB") is None
+    assert IntentMatcher("macos").match("list files") == "ls -lG"
+
+def test_sizes_use_find_syntax():
+    assert find_size("2 GB") == "2G"
+    assert find_size("500kb") == "500k"
+    assert find_size("1t") == "1024G"
+    assert find_size("20") == "20c"
+
+def test_hit_rate_and_latency_are_reported():
+    matcher = IntentMatcher("linux")
+    for request_text in ("list files", "disk usage", "summarize my git history"):
+        matcher.match(request_text)
+    assert (matcher.lookups, matcher.hits) == (3, 2)
+    assert matcher.hit_seconds / matcher.hits < 0.01
+    assert "2/3 (67%)" in matcher.format_stats()
+
+def test_assistant_skips_the_llm_for_local_intents(mocker, make_assistant, confirm):
+    mocker.patch('promptshell.ai_terminal_assistant.get_current_os', return_value="linux")
+    confirm.return_value.ask.return_value = False
+    assistant = make_assistant()
+    executor = mocker.patch.object(assistant, 'command_executor')
+    gather = mocker.patch.object(assistant, 'gather_additional_data')
+    assistant.execute_command("disk usage")
+    confirm.assert_called_once_with("Do you want to run the command 'df -h'? (local)")
+    executor.assert_not_called()
+    gather.assert_not_called()
@@ -0,0 +1,85 @@
+import pytest
+
+from types import SimpleNamespace
+from promptshell.node import Node
+from promptshell.spinner_progress_utils import read_first_line, render_stream
+
+@pytest.fixture
+def fake_backend(mocker):
+    backend = SimpleNamespace(
+        call=lambda node, prompt: "ls -l",
+        stream=lambda node, prompt: iter(["```bash\n", "ls", " -l\n", "```\n", "ignored"]),
+    )
+    mocker.patch('promptshell.node.get_provider', return_value="fake")
+    mocker.patch('promptshell.node.get_backend', return_value=backend)
+    return backend
+
+def test_call_records_context(fake_backend):
+    node = Node("model", "Command Executor")
+    assert node("list files") == "ls -l"
+    assert node.context[-1] == {"role": "assistant", "content": "ls -l"}
+
+def test_stream_yields_chunks_and_records_context(fake_backend):
+    node = Node("model", "Question Answerer")
+    chunks = list(node("list files", stream=True))
+    assert chunks == ["```bash\n", "ls", " -l\n", "```\n", "ignored"]
+    assert node.context[-1]["content"] == "```bash\nls -l\n```\nignored"
+
+def test_stream_falls_back_to_call_without_stream_support(fake_backend, mocker):
+    mocker.patch('promptshell.node.get_backend', return_value=SimpleNamespace(call=lambda node, prompt: "pwd"))
+    node = Node("model", "Command Executor")
+    assert list(node("where am I", stream=True)) == ["pwd"]
+
+def test_read_first_line_stops_after_command(fake_backend):
+    node = Node("model", "Command Executor")
+    line, ttft = read_first_line(node("list files", stream=True))
+    assert line == "ls -l"
+    assert ttft is not None
+    # Only what was received before the stream was closed is remembered
+    assert "ignored" not in node.context[-1]["content"]
+
+def test_stream_helpers_accept_random_spinner(capsys):
+    # The assistant asks for a random spinner; Rich has no spinner of that name
+    line, _ = read_first_line(iter(["ls -l\n", "ignored"]), spinner_type="random")
+    text, _ = render_stream(iter(["chmod ", "is a command"]), spinner_type="random")
+    assert (line, text) == ("ls -l", "chmod is a command")
+    assert "chmod is a command" in capsys.readouterr().out
+
+def test_acall_runs_concurrently(mocker):
+    import asyncio
+    import time
+
+    async def acall(node, prompt):
+        await asyncio.sleep(0.2)
+        return f"answer from {node.name}"
+
+    mocker.patch('promptshell.node.get_provider', return_value="fake")
+    mocker.patch('promptshell.node.get_backend', return_value=SimpleNamespace(call=None, acall=acall))
+    nodes = [Node("model", f"role {i}") for i in range(4)]
+
+    async def run_all():
+        return await asyncio.gather(*(node.acall("question") for node in nodes))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    assert time.perf_counter() - start < 0.6
+    assert results == [f"answer from role {i}" for i in range(4)]
+    assert nodes[0].context[-1]["content"] == "answer from role 0"
+
+def test_prompt_carries_chat_messages(fake_backend):
+    node = Node("model", "Command Executor")
+    node.definition = """
+        [ROLE] Shell Command Interpreter
+        [TASK] Translate requests
+        """
+    node("list files")
+    prompt = node.build_prompt("show disk usage", {"target_file": "notes.txt"})
+    assert prompt.startswith(node.prompt_prefix())  # The flat text (and cassette keys) are unchanged
+    assert prompt.messages == [
+        {"role": "system", "content": "[ROLE] Shell Command Interpreter\n[TASK] Translate requests"},
+        {"role": "user", "content": "list files"},
+        {"role": "assistant", "content": "ls -l"},
+        {"role": "user", "content": "show disk usage\n\nAdditional data:\ntarget_file: notes.txt\n"},
+    ]
+    # The static system message is the same on every call, so providers can cache it
+    assert node.build_prompt("anything else").messages[0] == prompt.messages[0]
@@ -0,0 +1,29 @@
+import sys
+
+from promptshell.output_stream import TailBuffer, run_with_live_output
+
+def test_tail_buffer_keeps_only_the_end():
+    tail = TailBuffer(max_chars=10)
+    for i in range(100):
+        tail.write(f"{i:03d}\n")
+    assert tail.getvalue() == "097\n098\n099\n"[-10:]
+    assert tail.truncated
+    assert len(tail._chunks) <= 4
+
+def test_tail_buffer_small_output_is_complete():
+    tail = TailBuffer(max_chars=100)
+    tail.write("hello ")
+    tail.write("world")
+    assert tail.getvalue() == "hello world"
+    assert not tail.truncated
+
+def test_run_with_live_output_forwards_and_bounds(capfd):
+    code = "import sys\nfor i in range(5000): print(i)\nprint('oops', file=sys.stderr)\nsys.exit(3)"
+    stdout, stderr, exit_code = run_with_live_output([sys.executable, "-c", code], max_chars=100)
+    assert exit_code == 3
+    assert len(stdout) == 100
+    assert stdout.endswith("4999\n")
+    assert "oops" in stderr
+    captured = capfd.readouterr()
+    assert "0\n1\n2\n" in captured.out
+    assert "oops" in captured.err
@@ -0,0 +1,75 @@
+import pytest
+
+from unittest.mock import MagicMock
+from promptshell import providers
+
+@pytest.fixture(autouse=True)
+def clean_clients():
+    providers.close_clients()
+    yield
+    providers.close_clients()
+
+def test_client_is_shared_across_calls():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    first = providers.get_client("openai", None, "key-1", factory)
+    second = providers.get_client("openai", None, "key-1", factory)
+    assert first is second
+    assert factory.call_count == 1
+
+def test_client_is_rebuilt_when_credentials_change():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    first = providers.get_client("openai", None, "key-1", factory)
+    second = providers.get_client("openai", None, "key-2", factory)
+    assert first is not second
+    first.close.assert_called_once()
+
+def test_clients_are_kept_per_base_url():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    local = providers.get_client("ollama", "http://localhost:11434", None, factory)
+    remote = providers.get_client("ollama", "http://gpu-box:11434", None, factory)
+    assert local is not remote
+    assert factory.call_count == 2
+
+def test_async_clients_are_kept_per_loop_and_closed_with_it():
+    import asyncio
+
+    closed = []
+    class AsyncClient:
+        async def aclose(self):
+            closed.append(self)
+
+    async def session(close):
+        first = providers.get_async_client("ollama", "http://localhost:11434", None, AsyncClient)
+        assert providers.get_async_client("ollama", "http://localhost:11434", None, AsyncClient) is first
+        if close:
+            await providers.aclose_clients()
+        return first
+
+    first = asyncio.run(session(close=True))
+    assert closed == [first]
+    second = asyncio.run(session(close=False))
+    assert second is not first
+    asyncio.run(session(close=True))
+    # The loop that ended without closing its clients is not kept alive
+    assert len(providers._async_clients) == 0
+
+def test_chat_messages_of_plain_text():
+    assert providers.chat_messages("ls") == [{"role": "user", "content": "ls"}]
+
+def test_split_system_makes_conversation_alternate():
+    system, conversation = providers.split_system([
+        {"role": "system", "content": "rules"},
+        {"role": "assistant", "content": "orphan"},  # Its user turn was evicted from the history
+        {"role": "user", "content": "a"},
+        {"role": "user", "content": "b"},
+    ])
+    assert system == "rules"
+    assert conversation == [{"role": "user", "content": "a\n\nb"}]
+
+def test_anthropic_caches_the_system_definition():
+    from promptshell.providers import anthropic_provider
+    node = MagicMock(model_name="claude", max_tokens=100, config={})
+    prompt = providers.Prompt("flat", [{"role": "system", "content": "rules"}, {"role": "user", "content": "ls"}])
+    request = anthropic_provider._request(node, prompt)
+    assert request["system"] == [{"type": "text", "text": "rules", "cache_control": {"type": "ephemeral"}}]
+    assert request["messages"] == [{"role": "user", "content": "ls"}]
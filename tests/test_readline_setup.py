@@ -0,0 +1,39 @@
+import os
+
+from promptshell.readline_setup import Completer
+
+def test_path_completion(tmp_path):
+    (tmp_path / "report.txt").write_text("")
+    (tmp_path / "reports").mkdir()
+    (tmp_path / ".hidden").write_text("")
+    completer = Completer()
+    prefix = str(tmp_path) + os.sep
+    assert completer.candidates(prefix + "rep", "cat ") == [prefix + "report.txt", prefix + "reports" + os.sep]
+    assert completer.candidates(prefix + ".", "cat ") == [prefix + ".hidden"]
+
+def test_directory_listing_is_cached_until_mtime_changes(tmp_path, mocker):
+    (tmp_path / "a.txt").write_text("")
+    completer = Completer()
+    scandir = mocker.spy(os, "scandir")
+    completer.list_directory(str(tmp_path))
+    completer.list_directory(str(tmp_path))
+    assert scandir.call_count == 1
+
+    (tmp_path / "b.txt").write_text("")
+    os.utime(tmp_path, (0, 12345))
+    assert [name for name, _ in completer.list_directory(str(tmp_path))] == ["a.txt", "b.txt"]
+    assert scandir.call_count == 2
+
+def test_commands_and_aliases_at_command_position(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    completer = Completer(command_sources=[lambda: {"gst": {}}, lambda: ["git", "grep", "ls"]])
+    assert completer.candidates("g", "") == ["git", "grep", "gst"]
+    assert completer.candidates("!gi", "") == ["!git"]
+    # Arguments only complete paths
+    assert completer.candidates("g", "ls ") == []
+
+def test_complete_computes_candidates_once_per_prefix(mocker):
+    completer = Completer()
+    candidates = mocker.patch.object(completer, "candidates", return_value=["one", "two"])
+    assert [completer.complete("o", state) for state in range(3)] == ["one", "two", None]
+    assert candidates.call_count == 1
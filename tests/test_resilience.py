@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import pytest
+
+from types import SimpleNamespace
+
+from benchmarks.fake_server import FakeLLMServer
+from promptshell.node import Node
+from promptshell.providers import close_clients
+from promptshell.resilience import (
+    CircuitBreaker, ProviderError, ProviderHTTPError, backoff_delay, get_breaker, is_transient, reset_breakers,
+    role_timeout
+)
+
+FAST_RETRIES = {"RETRY_BACKOFF_MS": "0"}
+
+@pytest.fixture(autouse=True)
+def clean_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+def flaky(failures, response="ls -la"):
+    """Backend call failing with the given exceptions before answering."""
+
+    calls = []
+    def call(node, prompt):
+        calls.append(prompt)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return response
+    return call, calls
+
+def make_node(mocker, backend, config=None, name="Command Executor"):
+    mocker.patch('promptshell.node.get_provider', return_value="fake")
+    mocker.patch('promptshell.node.get_backend', return_value=backend)
+    return Node("model", name, config={**FAST_RETRIES, **(config or {})})
+
+def test_transient_errors():
+    assert is_transient(ProviderHTTPError(503, "busy"))
+    assert is_transient(ProviderHTTPError(429, "slow down"))
+    assert is_transient(ConnectionError("refused"))
+    assert not is_transient(ProviderHTTPError(401, "bad key"))
+    assert not is_transient(ValueError("bad JSON"))
+    assert not is_transient(LookupError("No recorded response"))
+
+def test_backoff_is_jittered_and_honours_retry_after():
+    delays = {backoff_delay(3, 0.5) for _ in range(20)}
+    assert len(delays) > 1 and all(0 <= d <= 2.0 for d in delays)
+    assert backoff_delay(1, 0.5, requested=3.0) == 3.0
+
+def test_role_timeout_is_configurable_per_role():
+    assert role_timeout({}, "Question Answerer") > role_timeout({}, "Command Executor")
+    assert role_timeout({"TIMEOUT_COMMAND_EXECUTOR": "5"}, "Command Executor") == 5.0
+
+def test_transient_failures_are_retried(mocker):
+    call, calls = flaky([ProviderHTTPError(503, "busy"), ConnectionError("reset")])
+    node = make_node(mocker, SimpleNamespace(call=call))
+    assert node("list files") == "ls -la"
+    assert len(calls) == 3
+
+def test_permanent_failures_are_not_retried(mocker):
+    call, calls = flaky([ProviderHTTPError(401, "invalid API key")])
+    node = make_node(mocker, SimpleNamespace(call=call))
+    with pytest.raises(ProviderError, match="invalid API key"):
+        node("list files")
+    assert len(calls) == 1
+    assert len(node.context) == 0
+
+def test_retries_are_limited(mocker):
+    call, calls = flaky([ProviderHTTPError(500, "down")] * 5)
+    node = make_node(mocker, SimpleNamespace(call=call), {"MAX_RETRIES": "1"})
+    with pytest.raises(ProviderError, match="after 2 attempts"):
+        node("list files")
+    assert len(calls) == 2
+
+def test_stream_is_retried_before_the_first_chunk(mocker):
+    attempts = []
+    def stream(node, prompt):
+        attempts.append(prompt)
+        if len(attempts) == 1:
+            raise ProviderHTTPError(502, "bad gateway")
+        yield from ["git ", "status"]
+    node = make_node(mocker, SimpleNamespace(call=None, stream=stream), name="Question Answerer")
+    assert list(node("what changed?", stream=True)) == ["git ", "status"]
+    assert len(attempts) == 2
+
+def test_acall_is_cancelled_at_the_role_time_limit(mocker):
+    cancelled = []
+    async def acall(node, prompt):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+    node = make_node(mocker, SimpleNamespace(call=None, acall=acall), {"TIMEOUT_COMMAND_EXECUTOR": "0.1"})
+    start = time.perf_counter()
+    with pytest.raises(ProviderError, match="did not answer within 0.1s"):
+        asyncio.run(node.acall("list files"))
+    assert time.perf_counter() - start < 1
+    assert cancelled == [True]
+
+def test_circuit_breaker_fails_fast_then_probes():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] = 31
+    assert breaker.allow()        # One probe request...
+    assert not breaker.allow()    # ...at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_open_breaker_skips_the_provider(mocker):
+    call, calls = flaky([ConnectionError("refused")] * 10)
+    node = make_node(mocker, SimpleNamespace(call=call), {"MAX_RETRIES": "0", "CIRCUIT_BREAKER_FAILURES": "2"})
+    for _ in range(2):
+        with pytest.raises(ProviderError, match="refused"):
+            node("list files")
+    with pytest.raises(ProviderError, match="unavailable"):
+        node("list files")
+    assert len(calls) == 2
+
+def test_interrupted_probe_releases_the_breaker(mocker):
+    call, calls = flaky([ConnectionError("refused"), KeyboardInterrupt()])
+    node = make_node(mocker, SimpleNamespace(call=call), {"MAX_RETRIES": "0", "CIRCUIT_BREAKER_FAILURES": "1"})
+    with pytest.raises(ProviderError):
+        node("list files")
+    breaker = get_breaker("fake", node.config)
+    breaker.opened_at -= breaker.cooldown
+    with pytest.raises(KeyboardInterrupt):
+        node("list files")
+    # The next request probes again instead of failing fast forever
+    assert node("list files") == "ls -la"
+    assert breaker.state == "closed" and len(calls) == 3
+
+@pytest.mark.parametrize("provider", ["ollama", "openai"])
+def test_fake_server_errors_are_retried(mocker, provider):
+    with FakeLLMServer(response="pwd") as server:
+        server.failures = [503, 429]
+        mocker.patch('promptshell.node.get_provider', return_value=provider)
+        config = {**FAST_RETRIES, "OLLAMA_HOST": server.url, "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": server.url + "/v1"}
+        assert Node("fake-model", "Command Executor", config=config)("where am I") == "pwd"
+        assert len(server.requests) == 3
+    close_clients()
+
+def test_read_timeout_bounds_a_wedged_server(mocker):
+    with FakeLLMServer(response="pwd", latency=2) as server:
+        mocker.patch('promptshell.node.get_provider', return_value="ollama")
+        config = {**FAST_RETRIES, "OLLAMA_HOST": server.url, "READ_TIMEOUT": "0.2", "MAX_RETRIES": "0"}
+        start = time.perf_counter()
+        with pytest.raises(ProviderError):
+            Node("fake-model", "Command Executor", config=config)("where am I")
+        assert time.perf_counter() - start < 1.5
+    close_clients()
+
+def test_provider_errors_are_never_offered_as_commands(mocker, make_assistant, confirm):
+    assistant = make_assistant({"LOCAL_INTENTS": "off"})
+    mocker.patch.object(assistant, 'command_executor', side_effect=ProviderError("ollama did not answer within 60s"))
+    result = assistant.execute_command("list files")
+    assert "AI request failed: ollama did not answer within 60s" in result
+    confirm.assert_not_called()
@@ -0,0 +1,57 @@
+import pytest
+
+from promptshell import setup
+
+@pytest.fixture
+def config_file(tmp_path, mocker):
+    path = tmp_path / "promptshell_config.conf"
+    path.write_text("MODE=api\nACTIVE_API_PROVIDER=openai\nAPI_MODEL=gpt-4o\n")
+    mocker.patch('promptshell.setup.CONFIG_FILE', str(path))
+    mocker.patch('promptshell.setup._config', setup.Config())
+    return path
+
+def test_config_is_parsed_once_while_unchanged(config_file, mocker):
+    read = mocker.spy(setup, "read_config_file")
+    assert setup.get_provider() == "openai"
+    assert setup.get_active_model() == "gpt-4o"
+    setup.load_config()
+    assert read.call_count == 1
+
+def test_config_reloads_after_edit(config_file):
+    import os
+
+    assert setup.get_active_model() == "gpt-4o"
+    assert not setup.config_changed()
+    config_file.write_text("MODE=local\nLOCAL_MODEL=llama3\n")
+    os.utime(config_file, ns=(0, 10**9))  # Guarantee a different mtime
+    assert setup.config_changed()
+    assert setup.get_active_model() == "llama3"
+    assert setup.get_provider() == "ollama"
+    assert not setup.config_changed()
+
+def test_load_config_returns_a_copy(config_file):
+    config = setup.load_config()
+    config["MODE"] = "local"
+    assert setup.load_config()["MODE"] == "api"
+
+def test_config_helpers():
+    config = {"FLAG": "on", "SIZE": "12", "BAD": "x"}
+    assert setup.config_flag(config, "FLAG")
+    assert setup.config_flag(config, "MISSING", default=True)
+    assert setup.config_number(config, "SIZE", 0) == 12
+    assert setup.config_number(config, "BAD", 5) == 5
+
+def test_reload_keeps_the_assistant_and_closes_old_stores(config_file, make_assistant):
+    assistant = make_assistant({"TRANSLATION_CACHE": "on"})
+    aliases = assistant.alias_manager
+    cache = assistant.translation_cache
+    assistant.command_executor.context.append("user", "list files")
+    config_file.write_text("MODE=local\nLOCAL_MODEL=llama3\n")
+
+    assistant.reload_config({"TRANSLATION_CACHE": "off", "HISTORY": "on", "WARM_UP": "off"}, setup.get_active_model())
+    assert cache._db is None and assistant.translation_cache is None
+    assert assistant.history is not None
+    assert assistant.alias_manager is aliases
+    assert len(assistant.command_executor.context) == 1
+    assert (assistant.debugger.model_name, assistant.debugger.provider) == ("llama3", "ollama")
+    assistant.close()
@@ -0,0 +1,106 @@
+from promptshell.history_store import HistoryStore
+from promptshell.similarity_index import SimilarityIndex, char_ngrams, content_words
+
+PAIRS = [
+    ("list all python files here", "find . -name '*.py'"),
+    ("show running containers", "docker ps"),
+    ("compress the logs folder", "tar czf logs.tgz logs"),
+    ("what is my ip address", "curl ifconfig.me"),
+]
+
+def test_char_ngrams_stay_within_words():
+    assert char_ngrams("ls  A") == [" ls", "ls ", " a "]
+
+def test_paraphrases_match_past_requests():
+    index = SimilarityIndex(lambda: PAIRS)
+    match = index.match("list python files in here")
+    assert match.command == "find . -name '*.py'"
+    assert match.input == "list all python files here"
+    assert 0.8 <= match.score < 1.0
+    assert index.match("show the running containers").command == "docker ps"
+    assert index.match("Show running containers").score > 0.99
+
+def test_unrelated_requests_fall_below_the_threshold():
+    index = SimilarityIndex(lambda: PAIRS)
+    assert index.match("delete old kubernetes pods") is None
+    assert index.match("???") is None
+    assert index.match("please show the running containers", threshold=0.0) is not None
+    assert SimilarityIndex(lambda: []).match("list files") is None
+
+def test_matches_must_name_the_same_numbers_and_paths():
+    index = SimilarityIndex(lambda: [
+        ("kill the process on port 8081", "fuser -k 8081/tcp"),
+        ("delete the old_builds folder", "rm -r old_builds"),
+    ])
+    assert index.match("kill the process on port 8080", threshold=0.5) is None
+    assert index.match("delete the old_build folder", threshold=0.5) is None
+    assert index.match("kill the process on port 8081.").command == "fuser -k 8081/tcp"
+    assert content_words("List all *.py files in ~/src, then stop.") == {"list", "*.py", "files", "~/src", "then", "stop"}
+
+def test_matches_must_use_the_same_verbs():
+    index = SimilarityIndex(lambda: [
+        ("start the docker containers", "docker start web db"),
+        ("enable the nginx service", "sudo systemctl enable nginx"),
+    ])
+    assert index.match("restart the docker containers", threshold=0.5) is None
+    assert index.match("stop the docker containers", threshold=0.5) is None
+    assert index.match("disable the nginx service", threshold=0.5) is None
+    assert index.match("start all the docker containers").command == "docker start web db"
+
+def test_commands_needing_confirmation_are_never_indexed():
+    index = SimilarityIndex(lambda: [("wipe the build folder", "CONFIRM: rm -rf build")])
+    assert index.match("wipe the build folder") is None
+    index.add("clean the build folder", "CONFIRM: rm -rf build")
+    assert index.match("clean the build folder") is None
+
+def test_new_successes_are_indexed_without_reloading():
+    loads = []
+    def load_pairs():
+        loads.append(True)
+        return PAIRS
+    index = SimilarityIndex(load_pairs)
+    assert index.match("count lines of code") is None
+    index.add("count lines of code", "cloc .")
+    # A newer command for the same request replaces the older one
+    index.add("Count lines of code.", "tokei")
+    assert index.match("count the lines of code").command == "tokei"
+    assert len(loads) == 1
+
+def test_rejected_near_match_falls_back_to_the_llm(mocker, make_assistant, confirm, tmp_path):
+    history = HistoryStore(path=str(tmp_path / "history.db"))
+    history.add("show running containers", "docker ps", "/srv", 0, 80.0)
+    history.add("show stopped containers", "docker ps -f status=exited", "/srv", 1, 80.0)
+    confirm.return_value.ask.return_value = False
+    assistant = make_assistant(history=history)
+    translate = mocker.patch.object(assistant, 'translate_command', return_value="docker ps --all")
+
+    assistant.execute_command("show the running containers")
+    prompts = [call.args[0] for call in confirm.call_args_list]
+    assert prompts[0].startswith("Do you want to run the command 'docker ps'? (worked for 'show running containers'")
+    assert prompts[1] == "Do you want to run the command 'docker ps --all'?"
+    translate.assert_called_once()
+
+    # Failed commands are never offered
+    confirm.reset_mock()
+    translate.reset_mock()
+    assistant.execute_command("show stopped containers")
+    assert len(confirm.call_args_list) == 1
+    translate.assert_called_once()
+
+def test_destructive_commands_are_recorded_as_such_and_not_offered_again(mocker, make_assistant, confirm, tmp_path):
+    history = HistoryStore(path=str(tmp_path / "history.db"))
+    confirm.return_value.ask.return_value = True
+    mocker.patch('builtins.input', return_value="rm -rf old_build")
+    assistant = make_assistant(history=history)
+    translate = mocker.patch.object(assistant, 'translate_command', return_value="CONFIRM: rm -rf old_build")
+    run = mocker.patch.object(assistant, 'execute_command_with_live_output', return_value=("", "", 0))
+
+    assistant.execute_command("remove the old_build directory")
+    run.assert_called_once_with("rm -rf old_build")
+    assert history.recent()[0]["command"] == "CONFIRM: rm -rf old_build"
+    assert history.successful_translations() == []
+
+    confirm.reset_mock()
+    assistant.execute_command("remove the old_build directory now")
+    assert translate.call_count == 2
+    assert confirm.call_args_list[0].args[0] == "Do you want to run the command 'CONFIRM: rm -rf old_build'?"
@@ -0,0 +1,47 @@
+import os
+import sys
+import subprocess
+
+# Cold-start budget for `python -m promptshell --version`, in seconds.
+# Override with PROMPTSHELL_STARTUP_BUDGET on slow CI machines.
+STARTUP_BUDGET = float(os.environ.get("PROMPTSHELL_STARTUP_BUDGET", "1.5"))
+
+HEAVY_MODULES = ["openai", "anthropic", "google.generativeai", "groq", "requests"]
+
+def test_main_does_not_import_provider_sdks():
+    """Importing the CLI must not pull in any provider SDK."""
+    code = (
+        "import sys, promptshell.main;"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", f"Provider SDKs imported at startup: {result.stdout.strip()}"
+
+def test_backend_is_imported_only_when_selected():
+    code = (
+        "import sys; from promptshell.providers import get_backend;"
+        "get_backend('ollama');"
+        "print('requests' in sys.modules, 'openai' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True False"
+
+def test_unsupported_provider_has_no_backend():
+    from promptshell.providers import get_backend
+    assert get_backend("unknown") is None
+
+def test_version_startup_within_budget():
+    """Fails if cold startup of `promptshell --version` regresses past the budget."""
+    import time
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "promptshell", "--version"],
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+    assert elapsed < STARTUP_BUDGET, f"Startup took {elapsed:.2f}s (budget {STARTUP_BUDGET:.2f}s)"
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import pytest
+
+from types import SimpleNamespace
+
+from promptshell import tracing
+from promptshell.node import Node
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    tracing.configure()
+
+def read_trace(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_disabled_tracing_is_a_shared_noop():
+    assert tracing.span("a") is tracing.span("b", role="x")
+    with tracing.span("a") as s:
+        s.set(hit=True)
+
+def test_root_span_is_written_with_its_children(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    tracing.configure(trace_file=str(trace_file))
+    with tracing.span("request", input="list files"):
+        with tracing.span("translate") as s:
+            s.set(cached=False)
+        tracing.record_span("stream", start=0.0)
+    [record] = read_trace(trace_file)
+    assert record["name"] == "request"
+    assert record["attrs"] == {"input": "list files"}
+    assert [(s["name"], s["depth"]) for s in record["spans"]] == [("stream", 1), ("translate", 1)]
+
+def test_errors_are_recorded(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    tracing.configure(trace_file=str(trace_file))
+    with pytest.raises(ValueError):
+        with tracing.span("request"):
+            raise ValueError("boom")
+    assert read_trace(trace_file)[0]["attrs"] == {"error": "ValueError"}
+
+def test_node_stages_and_profile_breakdown(mocker, capsys, tmp_path):
+    backend = SimpleNamespace(call=lambda node, prompt: "ls", stream=lambda node, prompt: iter(["l", "s"]))
+    mocker.patch('promptshell.node.get_provider', return_value="fake")
+    mocker.patch('promptshell.node.get_backend', return_value=backend)
+    trace_file = tmp_path / "trace.jsonl"
+    tracing.configure(profile=True, trace_file=str(trace_file))
+    node = Node("model", "Command Executor")
+    with tracing.span("request", input="list files"):
+        node("list files")
+        list(node("list files", stream=True))
+        asyncio.run(node.acall("list files"))
+    names = [(s["name"], s["depth"]) for s in read_trace(trace_file)[0]["spans"]]
+    assert names.count(("node", 1)) == 3
+    assert names.count(("provider_call", 2)) == 2
+    assert "Profile:" in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import time
+
+from promptshell.translation_cache import TranslationCache, normalize_input, cwd_context
+
+def make_cache(tmp_path, **kwargs):
+    return TranslationCache(path=str(tmp_path / "cache.db"), **kwargs)
+
+def test_normalize_input():
+    assert normalize_input("  Show   Disk Usage. ") == "show disk usage"
+
+def test_cwd_only_matters_for_location_dependent_requests():
+    assert cwd_context("show disk usage", "/tmp") == ""
+    assert cwd_context("list files here", "/tmp") == "/tmp"
+    assert cwd_context("count lines in ./src", "/tmp") == "/tmp"
+
+def test_key_ignores_trivial_variations():
+    first = TranslationCache.make_key("Show disk usage", "linux", "llama3", "ollama", "/a")
+    second = TranslationCache.make_key("show  disk usage.", "linux", "llama3", "ollama", "/b")
+    other_model = TranslationCache.make_key("show disk usage", "linux", "gpt-4o", "openai", "/a")
+    assert first == second
+    assert first != other_model
+
+def test_put_get_and_invalidate(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("k", "df -h")
+    assert cache.get("k") == "df -h"
+    cache.invalidate("k")
+    assert cache.get("k") is None
+
+def test_shared_between_instances(tmp_path):
+    make_cache(tmp_path).put("k", "docker ps")
+    assert make_cache(tmp_path).get("k") == "docker ps"
+
+def test_lru_eviction(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", "cmd a")
+    cache.put("b", "cmd b")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", "cmd c")
+    assert cache.get("a") == "cmd a"
+    assert cache.get("b") is None
+    assert cache.get("c") == "cmd c"
+
+def test_ttl_expiry(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=0.05)
+    cache.put("k", "uptime")
+    time.sleep(0.1)
+    assert cache.get("k") is None
@@ -1,9 +1,18 @@
 from unittest.mock import patch, MagicMock
 from io import StringIO
 from promptshell.main import main
+from promptshell.setup import Config
 
-def test_tutorial_command():
+def test_tutorial_command(mocker, mock_config_dir):
     """Test that entering --tutorial in the REPL launches the tutorial and prints the welcome message."""
+    # Run against a config of our own: no warm-up request to a local Ollama, no history or cache files
+    config_file = f"{mock_config_dir}/promptshell_config.conf"
+    with open(config_file, "w") as f:
+        f.write("WARM_UP=off\nHISTORY=off\nTRANSLATION_CACHE=off\n")
+    mocker.patch('promptshell.setup.CONFIG_FILE', config_file)
+    mocker.patch('promptshell.setup._config', Config())
+    mocker.patch('promptshell.ai_terminal_assistant.get_executable_index')
+
     def input_side_effect(*args, **kwargs):
         responses = iter(['--tutorial', 'exit'])
         def inner(*args, **kwargs):
@@ -0,0 +1,78 @@
+import pytest
+
+from types import SimpleNamespace
+
+from benchmarks.fake_server import FakeLLMServer
+from promptshell.node import Node
+from promptshell.providers import close_clients
+from promptshell.usage import UsageStats, format_stats, price_for, report_usage, session_stats
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    session_stats.reset()
+    yield
+    session_stats.reset()
+
+@pytest.mark.parametrize("provider", ["ollama", "openai"])
+def test_reported_usage_is_recorded_per_role(mocker, provider):
+    mocker.patch('promptshell.node.get_provider', return_value=provider)
+    with FakeLLMServer(response="ls -la /tmp") as server:
+        config = {"OLLAMA_HOST": server.url, "OPENAI_API_KEY": "test", "OPENAI_BASE_URL": server.url + "/v1"}
+        Node("fake-model", "Command Executor", config=config)("list files")
+        "".join(Node("fake-model", "Debugger Expert", config=config)("why?", stream=True))
+    close_clients()
+    by_role = session_stats.by("role")
+    assert by_role["Command Executor"].calls == 1
+    assert by_role["Command Executor"].estimated_calls == 0
+    assert by_role["Command Executor"].completion_tokens > 0
+    assert by_role["Debugger Expert"].calls == 1
+    assert session_stats.by("session")["Session total"].calls == 2
+
+def test_usage_is_estimated_when_not_reported(mocker):
+    mocker.patch('promptshell.node.get_provider', return_value="openai")
+    mocker.patch('promptshell.node.get_backend', return_value=SimpleNamespace(call=lambda node, prompt: "x" * 40))
+    Node("gpt-4o", "Question Answerer")("what is ls?")
+    totals = session_stats.by("role")["Question Answerer"]
+    assert totals.estimated_calls == 1
+    assert totals.completion_tokens == 10
+    assert totals.cost > 0
+
+def test_backend_reports_override_estimates(mocker):
+    def call(node, prompt):
+        report_usage(prompt_tokens=123, completion_tokens=7, generation_seconds=0.5)
+        return "pwd"
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    mocker.patch('promptshell.node.get_backend', return_value=SimpleNamespace(call=call))
+    Node("llama3", "Command Executor")("where am I")
+    totals = session_stats.by("provider")["ollama (llama3)"]
+    assert (totals.prompt_tokens, totals.completion_tokens) == (123, 7)
+    assert totals.tokens_per_second == 14.0
+    assert totals.cost == 0.0
+
+def test_cached_prompt_tokens_are_recorded(mocker):
+    from promptshell.providers import report_chat_usage
+    usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=5, prompt_tokens_details=SimpleNamespace(cached_tokens=1536))
+    def call(node, prompt):
+        report_chat_usage(SimpleNamespace(usage=usage))
+        return "pwd"
+    mocker.patch('promptshell.node.get_provider', return_value="openai")
+    mocker.patch('promptshell.node.get_backend', return_value=SimpleNamespace(call=call))
+    Node("gpt-4o", "Command Executor")("where am I")
+    totals = session_stats.by("role")["Command Executor"]
+    assert (totals.prompt_tokens, totals.cached_tokens) == (2000, 1536)
+    assert "77%" in format_stats()
+
+def test_prices():
+    assert price_for("gpt-4o-mini-2024-07-18", "openai") == (0.15, 0.60)
+    assert price_for("gpt-4o", "openai") == (2.50, 10.00)
+    assert price_for("llama3", "ollama") == (0.0, 0.0)
+    assert price_for("unknown-model", "openrouter") is None
+    assert price_for("x", "openai", {"PRICE_INPUT_PER_MTOK": "1", "PRICE_OUTPUT_PER_MTOK": "2"}) == (1.0, 2.0)
+
+def test_format_stats():
+    stats = UsageStats()
+    assert "No AI calls" in format_stats(stats)
+    stats.record("Command Executor", "openai", "gpt-4o", 1000, 10, 0.5)
+    report = format_stats(stats, definitions={"Command Executor": "x" * 400})
+    assert "Command Executor (system ~100)" in report
+    assert "Session total" in report
@@ -0,0 +1,57 @@
+import pytest
+
+from benchmarks.fake_server import FakeLLMServer
+from promptshell.ai_terminal_assistant import AITerminalAssistant
+from promptshell.node import Node
+from promptshell.providers import close_clients, ollama_provider
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(response="ls") as server:
+        yield server
+    close_clients()
+
+def make_node(mocker, name, config):
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    node = Node("fake-model", name, config=config)
+    node.definition = f"[ROLE] {name}"
+    return node
+
+def test_keep_alive_is_sent_with_every_request(mocker, server):
+    node = make_node(mocker, "Command Executor", {"OLLAMA_HOST": server.url, "OLLAMA_KEEP_ALIVE": "-1"})
+    node("list files")
+    assert server.requests[-1][1]["keep_alive"] == -1
+    assert ollama_provider.keep_alive({}) == "30m"
+    assert ollama_provider.keep_alive({"OLLAMA_KEEP_ALIVE": "2h"}) == "2h"
+
+def test_warm_up_loads_model_then_primes_role_prefixes(mocker, server):
+    config = {"OLLAMA_HOST": server.url}
+    nodes = [make_node(mocker, name, config) for name in ("Command Executor", "Debugger Expert")]
+    ollama_provider.warm_up(nodes)
+    paths = [path for path, _ in server.requests]
+    bodies = [body for _, body in server.requests]
+    assert paths == ["/api/generate", "/api/chat", "/api/chat"]
+    assert bodies[0]["prompt"] == "" and bodies[0]["keep_alive"] == "30m"
+    assert [body["messages"] for body in bodies[1:]] == [node.system_messages() for node in nodes]
+    assert all(body["options"]["num_predict"] == 1 for body in bodies[1:])
+    # Real chats start with the primed system message, so Ollama can reuse its evaluation
+    assert nodes[0].build_prompt("list files").messages[0] == bodies[1]["messages"][0]
+
+def test_warm_up_ignores_unreachable_server(mocker):
+    node = make_node(mocker, "Command Executor", {"OLLAMA_HOST": "http://127.0.0.1:9", "CONNECT_TIMEOUT": "0.5"})
+    ollama_provider.warm_up([node])
+    close_clients()
+
+def test_assistant_warms_up_in_background(mocker, server, mock_config_dir):
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    assistant = AITerminalAssistant("fake-model", config={"OLLAMA_HOST": server.url, "HISTORY": "off", "TRANSLATION_CACHE": "off"})
+    assistant.warm_up_thread.join(timeout=5)
+    bodies = [body for _, body in server.requests]
+    assert bodies[0]["prompt"] == ""
+    assert bodies[1]["messages"] == assistant.command_executor.system_messages()
+    assert len(bodies) == 5
+
+def test_warm_up_can_be_disabled(mocker, mock_config_dir):
+    mocker.patch('promptshell.node.get_provider', return_value="ollama")
+    config = {"WARM_UP": "off", "HISTORY": "off", "TRANSLATION_CACHE": "off"}
+    assert AITerminalAssistant("fake-model", config=config).warm_up_thread is None